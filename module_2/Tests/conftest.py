@@ -0,0 +1,18 @@
+"""
+This module contains the fixtures shared by the cleaner test modules.
+"""
+
+import pytest # type: ignore
+from bs4 import BeautifulSoup # type: ignore
+from Tests.fixture_server import FIXTURES_DIR # type: ignore
+
+# Root URL prepended to the entry links of the recorded pages
+BASE_URL = 'https://www.thegradcafe.com'
+
+# --- Fixtures ---
+
+@pytest.fixture
+def fixture_pages():
+    """Fixture that parses the table rows of every recorded page, one list per page"""
+    return [BeautifulSoup((FIXTURES_DIR / f'survey_page_{num}.html').read_text(encoding='utf-8'),
+                          "html.parser").find_all('tr') for num in (1, 2, 3)]
@@ -0,0 +1,129 @@
+"""
+A local stand-in for TheGradCafe used by the scraper tests.
+
+The server answers ``/robots.txt`` and ``/survey/index.php?q=&page=N`` from the
+files in ``Tests/fixtures``. Survey pages are served round-robin, so page N is
+``survey_page_{(N - 1) % k + 1}.html`` for the k recorded fixture pages.
+
+Every response carries an ETag and a Last-Modified header, and conditional requests
+for unchanged content are answered with 304 Not Modified.
+"""
+
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+
+
+class FixtureServer:
+    """
+    Serves recorded GradCafe pages from a background thread.
+
+    Attributes:
+        latency (float):    Seconds to sleep before answering each request.
+        requests (list):    Paths requested so far, in arrival order.
+        not_modified (int): Number of requests answered with 304 Not Modified.
+        failures (int):     Number of upcoming survey page requests to answer with 503.
+        fail_pages (set):   Survey page numbers always answered with 503.
+        base_url (str):     Root URL of the running server.
+    """
+
+    def __init__(self, fixtures_dir=FIXTURES_DIR, latency=0.0, failures=0):
+        """
+        Loads the fixture pages and prepares the HTTP server.
+
+        Args:
+            fixtures_dir (Path): Directory containing robots.txt and survey_page_*.html.
+            latency (float):     Artificial delay, in seconds, added to every response.
+            failures (int):      Number of survey page requests to fail before serving pages.
+        """
+
+        fixtures_dir = Path(fixtures_dir)
+        self.latency      = latency
+        self.requests     = []
+        self.not_modified = 0
+        self.failures     = failures
+        self.fail_pages   = set()
+        self.robots       = (fixtures_dir / 'robots.txt').read_bytes()
+        self.pages        = [path.read_bytes() for path in
+                             sorted(fixtures_dir.glob('survey_page_*.html'),
+                                    key=lambda path: int(path.stem.rsplit('_', 1)[1]))]
+        self._lock        = threading.Lock()
+        self._server      = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._thread      = None
+
+    @property
+    def base_url(self):
+        """Root URL of the running server, e.g. ``http://127.0.0.1:54321``."""
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def _make_handler(self):
+        """Builds a request handler class bound to this server instance."""
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Answers robots.txt and survey page requests from the fixtures."""
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """Serves a single GET request."""
+                with fixture._lock:
+                    fixture.requests.append(self.path)
+
+                if fixture.latency:
+                    time.sleep(fixture.latency)
+
+                url = urlparse(self.path)
+                if url.path == '/robots.txt':
+                    self._send(fixture.robots, 'text/plain')
+                elif url.path.endswith('/index.php'):
+                    with fixture._lock:
+                        fail = fixture.failures > 0
+                        fixture.failures -= fail
+                    page = int(parse_qs(url.query).get('page', ['1'])[0])
+                    if fail or page in fixture.fail_pages:
+                        self.send_error(503)
+                        return
+
+                    self._send(fixture.pages[(page - 1) % len(fixture.pages)], 'text/html')
+                else:
+                    self.send_error(404)
+
+            def _send(self, body, content_type):
+                """Writes a 200 response with the given body, or 304 if the client's copy is current."""
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+
+                if self.headers.get('If-None-Match') == etag:
+                    with fixture._lock:
+                        fixture.not_modified += 1
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', 'Mon, 31 Mar 2025 12:00:00 GMT')
+                self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                """Keeps the test output quiet."""
+
+        return Handler
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
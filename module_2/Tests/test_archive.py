@@ -0,0 +1,55 @@
+"""
+This module contains unit tests for the PageArchive class.
+"""
+
+import time
+import pytest # type: ignore
+from scrape import GradCafeScraper # type: ignore
+from clean import clean_data # type: ignore
+from archive import PageArchive # type: ignore
+from Tests.fixture_server import FixtureServer # type: ignore
+
+# --- Fixtures ---
+
+@pytest.fixture
+def archive(tmp_path):
+    """Fixture that provides an empty page archive for each test"""
+    store = PageArchive(tmp_path / 'pages_archive.db')
+    yield store
+    store.close()
+
+
+# ----- Test: Archiving and replay -----
+
+@pytest.mark.archive
+def test_replay_matches_crawl(archive):
+    """Replaying the archive offline should reproduce the records of the crawl"""
+    with FixtureServer() as server:
+        base_url = server.base_url
+        scraper  = GradCafeScraper(base_url=base_url, concurrency=4, archive=archive)
+        crawled  = clean_data(scraper.iter_rows(8), base_url)
+
+    # The server is gone - replay only reads the archive
+    assert len(archive) == 7
+    assert clean_data(archive.iter_rows(), base_url) == crawled
+
+
+@pytest.mark.archive
+def test_identical_pages_are_stored_once(archive):
+    """Pages are content-addressed, so repeated bodies share storage"""
+    with FixtureServer() as server:
+        GradCafeScraper(base_url=server.base_url, archive=archive).scrape_data(8)
+
+    bodies = archive.connection.execute("SELECT COUNT(*) FROM bodies").fetchone()[0]
+    assert bodies == 3, "The server only has 3 distinct fixture pages"
+
+
+@pytest.mark.archive
+def test_replay_since(archive):
+    """Replay can be limited to pages fetched after a point in time"""
+    archive.add('old', 1, '<table><tr><td>old</td></tr></table>')
+    time.sleep(0.01)
+    cutoff = time.time()
+    archive.add('new', 1, '<table><tr><td>new</td></tr></table>')
+
+    assert [row.text for row in archive.iter_rows(since=cutoff)] == ['new']
@@ -0,0 +1,95 @@
+"""
+This module contains unit tests for the Canonicalizer class and its use by the cleaner.
+"""
+
+import pickle
+import pytest # type: ignore
+from canonical import Canonicalizer, normalize_name # type: ignore
+from clean import clean_data, clean_pages # type: ignore
+from columnar import save_columnar, load_columnar # type: ignore
+from Tests.conftest import BASE_URL # type: ignore
+
+# --- Fixtures ---
+
+@pytest.fixture
+def canonical():
+    """Fixture that loads the shipped alias table"""
+    return Canonicalizer()
+
+
+# ----- Test: Lookups -----
+
+@pytest.mark.canonical
+@pytest.mark.parametrize("raw, expected", [
+    ("Johns Hopkins University", "jhu"),
+    ("JHU", "jhu"),
+    ("  johns   hopkins ", "jhu"),
+    ("Massachusetts Institute of Technology (MIT)", "mit"),
+    ("University of California, Berkeley (UCB)", "berkeley"),
+    ("University of Oxford", "university-of-oxford"),
+])
+def test_university_ids(canonical, raw, expected):
+    """Aliases should map to one ID and unknown names to a slug of their normalized text"""
+    assert canonical.university(raw) == expected
+
+
+@pytest.mark.canonical
+def test_program_ids(canonical):
+    """Program aliases should map to one ID, independently of universities"""
+    assert canonical.program("CS") == canonical.program("Computer Science") == "computer-science"
+    assert canonical.program("Applied Math") == "applied-mathematics"
+    assert canonical.program("Math") == "mathematics"
+    assert normalize_name("R&D, Eng.") == "r and d eng"
+
+
+@pytest.mark.canonical
+def test_lookups_are_cached(canonical):
+    """Repeated names should be served from the LRU cache"""
+    for _ in range(3):
+        canonical.university("JHU")
+    info = canonical.university.cache_info()
+    assert (info.hits, info.misses) == (2, 1)
+
+
+@pytest.mark.canonical
+def test_custom_alias_table_and_pickling():
+    """An alias table can be passed as a dict, and the canonicalizer survives pickling"""
+    canonical = Canonicalizer({"universities": {"ox": {"name": "University of Oxford",
+                                                        "aliases": ["Oxford"]}}})
+    copy = pickle.loads(pickle.dumps(canonical))
+
+    assert copy.university("oxford") == "ox"
+    assert copy.names["ox"] == "University of Oxford"
+    assert copy.program("CS") == "cs"
+
+
+# ----- Test: Cleaning -----
+
+@pytest.mark.canonical
+@pytest.mark.parametrize("workers", [0, 2])
+def test_cleaning_assigns_ids(canonical, fixture_pages, workers):
+    """JHU written two ways should get the same ID, in clean_data and clean_pages alike"""
+    rows    = [row for page in fixture_pages for row in page]
+    records = clean_data(rows, BASE_URL, canonical=canonical)
+
+    assert clean_pages(fixture_pages, BASE_URL, workers=workers, canonical=canonical) == records
+
+    jhu_cs = [record.program for record in records
+              if (record.university_id, record.program_id) == ("jhu", "computer-science")]
+    assert jhu_cs == ["Computer Science, Johns Hopkins University", "Computer Science, JHU"]
+
+    # Without a canonicalizer the output is unchanged
+    assert all(record.university_id is None for record in clean_data(rows, BASE_URL))
+
+
+@pytest.mark.canonical
+def test_ids_are_serialized(canonical, fixture_pages, tmp_path):
+    """The IDs should be written after the original JSON keys and dictionary-encoded in columns"""
+    records = clean_data([row for page in fixture_pages for row in page], BASE_URL, canonical=canonical)
+
+    assert list(records[0].to_dict())[-2:] == ["university_id", "program_id"]
+
+    save_columnar(records, tmp_path / 'data.columns')
+    with load_columnar(tmp_path / 'data.columns') as dataset:
+        assert list(dataset) == records
+        assert dataset.categories["university_id"].count("jhu") == 1
@@ -0,0 +1,167 @@
+"""
+This module contains unit tests for the clean module.
+"""
+
+import json
+import pytest # type: ignore
+from bs4 import BeautifulSoup # type: ignore
+from clean import (clean_data, clean_pages, clean_html, compact_row, parse_single_column, # type: ignore
+                   save_data, load_data, iter_ndjson, NDJSONWriter, RowData)
+from records import ApplicantRecord # type: ignore
+from Tests.conftest import BASE_URL # type: ignore
+from Tests.fixture_server import FIXTURES_DIR # type: ignore
+
+# --- Fixtures ---
+
+@pytest.fixture
+def fixture_rows():
+    """Fixture that parses the table rows of every recorded page"""
+    rows = []
+    for num in (1, 2, 3):
+        html = (FIXTURES_DIR / f'survey_page_{num}.html').read_text(encoding='utf-8')
+        rows.extend(BeautifulSoup(html, "html.parser").find_all('tr'))
+    return rows
+
+# --- Test Cases ---
+
+detail_cases = [
+    # All fields, in page order
+    ('<td><div>Fall 2025</div><div>International</div><div>GPA 3.85</div><div>GRE 325</div>'
+     '<div>GRE V 160</div><div>GRE AW 4.5</div></td>',
+     {"term": "Fall 2025", "us_or_international": "International", "GPA": "3.85",
+      "GRE": "325", "GRE_V": "160", "GRE_AW": "4.5"}),
+    # Verbal score before the total must not be mistaken for it
+    ('<div>GRE V 150</div><div>GRE AW 3</div><div>GRE 310</div>',
+     {"GRE": "310", "GRE_V": "150", "GRE_AW": "3"}),
+    # Only the first occurrence of a field counts
+    ('<div>spring 2024</div><div>american</div><p>Deferred to Fall 2025, still American</p>',
+     {"term": "spring 2024", "us_or_international": "american",
+      "comment": "Deferred to Fall 2025, still American"}),
+    # Fields mentioned only in the comment are still picked up
+    ('<td><p class="tw-text-gray-500">My GPA 3.2 was low\n   but   it /"worked"/</p></td>',
+     {"GPA": "3.2", "comment": "My GPA 3.2 was low but it 'worked'"}),
+    # Partial words and malformed values are ignored
+    ('<div>Americans</div><div>GRE V</div><div>GPA 4</div><div>Fall 20255</div>', {}),
+]
+
+
+# ----- Test: parse_single_column -----
+
+@pytest.mark.clean
+@pytest.mark.parametrize("column_data, expected", detail_cases)
+def test_parse_single_column(column_data, expected):
+    """Each detail field should be extracted, in the canonical key order"""
+    applicant = parse_single_column(column_data, {"program": "CS, JHU"})
+
+    assert applicant == {"program": "CS, JHU", **expected}
+    assert list(applicant) == ["program", *expected], "Keys should keep the original order"
+
+
+# ----- Test: clean_html -----
+
+@pytest.mark.clean
+def test_clean_html():
+    """Quoted words are normalized and all whitespace collapses to single spaces"""
+    assert clean_html('  So /"happy"/\r\n  right\tnow\n\n ') == "So 'happy' right now"
+
+
+# ----- Test: clean_data -----
+
+@pytest.mark.clean
+def test_clean_data_matches_recorded_output(fixture_rows):
+    """The recorded pages should clean to exactly the recorded records"""
+    recorded = json.loads((FIXTURES_DIR / 'expected_records.json').read_text(encoding='utf-8'))
+    records  = clean_data(fixture_rows, 'https://www.thegradcafe.com')
+
+    # The recorded output predates typed records, so compare after the same conversion
+    assert records == [ApplicantRecord.from_dict(record) for record in recorded]
+
+    # ... and it predates term ordinals, which follow the original keys
+    assert [list(record.to_dict()) for record in records] == \
+           [list(record) + ["term_ordinal"] * ("term" in record) for record in recorded]
+
+
+@pytest.mark.clean
+def test_compact_row_reads_attributes(fixture_rows):
+    """The entry comes from the result link and detail rows keep their comment markup"""
+    main_row, detail_row, comment_row = (compact_row(row) for row in fixture_rows[1:4])
+
+    assert main_row.entry == '/result/986101'
+    assert len(main_row.cells) == 5 and main_row.comment is None
+
+    assert detail_row.entry is None
+    assert 'GRE V 160' in detail_row.cells[0] and detail_row.comment is None
+
+    assert comment_row.comment.startswith('Got the email at 2am.')
+
+
+# ----- Test: clean_pages -----
+
+@pytest.mark.clean
+@pytest.mark.parametrize("workers", [0, 2])
+def test_clean_pages_matches_clean_data(fixture_pages, workers):
+    """Cleaning pages separately, in-process or in a pool, should give the sequential records"""
+    expected = clean_data([row for rows in fixture_pages for row in rows], BASE_URL)
+
+    assert clean_pages(iter(fixture_pages), BASE_URL, workers=workers) == expected
+
+
+@pytest.mark.clean
+@pytest.mark.parametrize("workers", [0, 2])
+def test_clean_pages_merges_duplicates_in_order(workers):
+    """An entry on several pages keeps its first position and its last values"""
+    def entry(num, status, term):
+        return [RowData(f'/result/{num}', ("MIT", "CS", "March 31, 2025", status), None),
+                RowData(None, (term,), None)]
+
+    pages = [entry(1, "Wait listed", "Fall 2025") + entry(2, "Accepted", "Fall 2025"),
+             entry(3, "Rejected", "Spring 2026"),
+             entry(1, "Accepted", "Fall 2026")]
+
+    records  = clean_pages(pages, 'https://example.com', workers=workers)
+    expected = clean_data([row for rows in pages for row in rows], 'https://example.com')
+
+    assert records == expected
+    assert [record.url for record in records] == [f'https://example.com/result/{num}' for num in (1, 2, 3)]
+    assert (records[0].status, records[0].term) == ("Accepted", "Fall 2026")
+
+
+# ----- Test: NDJSON persistence -----
+
+@pytest.mark.clean
+@pytest.mark.parametrize("filename", ["applicants.ndjson", "applicants.jsonl.gz"])
+def test_ndjson_round_trip(tmp_path, fixture_rows, filename):
+    """Records saved as NDJSON should load back as the same JSON dictionaries"""
+    path    = tmp_path / filename
+    records = clean_data(fixture_rows, 'https://www.thegradcafe.com')
+
+    save_data(iter(records), path)
+
+    assert load_data(path) == [record.to_dict() for record in records]
+    assert [ApplicantRecord.from_dict(data) for data in iter_ndjson(path)] == records
+
+
+@pytest.mark.clean
+@pytest.mark.parametrize("filename", ["applicants.ndjson", "applicants.ndjson.gz"])
+def test_ndjson_writer_appends(tmp_path, fixture_rows, filename):
+    """Successive writers should append to the same file"""
+    path    = tmp_path / filename
+    records = clean_data(fixture_rows, 'https://www.thegradcafe.com')
+
+    with NDJSONWriter(path) as writer:
+        writer.write_all(records[:3])
+    with NDJSONWriter(path) as writer:
+        writer.write_all(records[3:])
+
+    assert writer.count == len(records) - 3
+    assert list(iter_ndjson(path)) == [record.to_dict() for record in records]
+
+
+@pytest.mark.clean
+def test_ndjson_is_smaller_than_indented_json(tmp_path, fixture_rows):
+    """One compact record per line should take less space than the indented array"""
+    records = clean_data(fixture_rows, 'https://www.thegradcafe.com')
+    save_data(records, tmp_path / 'applicants.json')
+    save_data(records, tmp_path / 'applicants.ndjson')
+
+    assert (tmp_path / 'applicants.ndjson').stat().st_size < (tmp_path / 'applicants.json').stat().st_size
@@ -0,0 +1,105 @@
+"""
+This module contains unit tests for the columnar export.
+"""
+
+import ast
+import json
+import math
+from datetime import date
+import pytest # type: ignore
+from clean import save_data, load_data # type: ignore
+from columnar import save_columnar, load_columnar, NPY_MAGIC # type: ignore
+from records import ApplicantRecord # type: ignore
+from Tests.fixture_server import FIXTURES_DIR # type: ignore
+
+# --- Fixtures ---
+
+@pytest.fixture
+def records():
+    """Fixture that loads the golden records of the recorded pages"""
+    with open(FIXTURES_DIR / 'expected_records.json', 'r', encoding='utf-8') as f:
+        return [ApplicantRecord.from_dict(entry) for entry in json.load(f)]
+
+
+# ----- Test: Round trip -----
+
+@pytest.mark.columnar
+def test_round_trip(records, tmp_path):
+    """Records loaded from the columns should equal the saved ones, missing values included"""
+    assert save_columnar(records, tmp_path / 'data.columns') == len(records)
+
+    with load_columnar(tmp_path / 'data.columns') as dataset:
+        assert len(dataset) == len(records)
+        assert list(dataset) == records
+        assert dataset[-1] == records[-1]
+
+        with pytest.raises(IndexError):
+            dataset[len(records)] # pylint: disable=pointless-statement
+
+
+@pytest.mark.columnar
+def test_accepts_dicts_and_generators(records, tmp_path):
+    """Plain JSON dictionaries from a generator should be saved like records"""
+    save_columnar((record.to_dict() for record in records), tmp_path / 'data.columns')
+
+    with load_columnar(tmp_path / 'data.columns') as dataset:
+        assert [record.to_dict() for record in dataset] == [record.to_dict() for record in records]
+
+
+@pytest.mark.columnar
+def test_save_and_load_data_dispatch(records, tmp_path):
+    """save_data and load_data should use the columnar format for '.columns' paths"""
+    filename = str(tmp_path / 'applicant_data.columns')
+    save_data(records, filename)
+
+    dataset = load_data(filename)
+    assert list(dataset) == records
+    dataset.close()
+
+
+# ----- Test: Layout -----
+
+@pytest.mark.columnar
+def test_typed_and_dictionary_encoded_columns(tmp_path):
+    """Scores should be typed columns and repeated strings should be stored once"""
+    rows = [ApplicantRecord(program="CS, JHU", date_added=date(2025, 3, 31), url="u1",
+                            status="Accepted", degree="Masters", gpa=3.9, gre=330),
+            ApplicantRecord(program="CS, MIT", date_added=None, url="u2",
+                            status="Rejected", degree="Masters", comment="Oh well")]
+    save_columnar(rows, tmp_path / 'data.columns')
+
+    with load_columnar(tmp_path / 'data.columns') as dataset:
+        assert dataset.column('gpa').format == 'd'
+        assert dataset.column('gpa')[0] == 3.9 and math.isnan(dataset.column('gpa')[1])
+        assert dataset.column('gre').tolist() == [330, -1]
+        assert dataset.column('date_added')[0] == (date(2025, 3, 31) - date(1970, 1, 1)).days
+
+        assert dataset.categories['degree'] == ["Masters"]
+        assert dataset.column('degree').tolist() == [0, 0]
+        assert dataset.column('term').tolist() == [-1, -1]
+        assert dataset.value('comment', 0) is None and dataset.value('comment', 1) == "Oh well"
+
+
+@pytest.mark.columnar
+def test_npy_files_are_aligned(records, tmp_path):
+    """Every column file should be a .npy array whose data starts on a 64-byte boundary"""
+    save_columnar(records, tmp_path / 'data.columns')
+
+    for path in (tmp_path / 'data.columns').glob('*.npy'):
+        raw    = path.read_bytes()
+        length = int.from_bytes(raw[8:10], 'little')
+        header = ast.literal_eval(raw[10:10 + length].decode('latin1'))
+
+        assert raw.startswith(NPY_MAGIC)
+        assert (10 + length) % 64 == 0
+        assert len(header['shape']) == 1
+
+
+@pytest.mark.columnar
+def test_empty_dataset(tmp_path):
+    """An empty export should load as an empty dataset"""
+    assert save_columnar([], tmp_path / 'data.columns') == 0
+
+    with load_columnar(tmp_path / 'data.columns') as dataset:
+        assert len(dataset) == 0
+        assert not list(dataset)
@@ -0,0 +1,77 @@
+"""
+This module contains unit tests for the EntryIndex class and its use by the cleaner.
+"""
+
+import pytest # type: ignore
+from clean import clean_data, clean_pages # type: ignore
+from entry_index import EntryIndex, entry_id # type: ignore
+from Tests.conftest import BASE_URL # type: ignore
+
+
+# ----- Test: Index -----
+
+@pytest.mark.index
+def test_index_persists_per_stage(tmp_path):
+    """IDs should survive reopening the file and be kept apart per stage"""
+    index = EntryIndex(tmp_path / 'index.db', stage='clean')
+    assert index.add_many(['986101', 986102]) == 2
+    assert index.add_many(['986101', '986103']) == 1
+    index.close()
+
+    index = EntryIndex(tmp_path / 'index.db', stage='clean')
+    assert len(index) == 3
+    assert '986102' in index and 986103 in index and '1' not in index
+    index.close()
+
+    other = EntryIndex(tmp_path / 'index.db', stage='load')
+    assert len(other) == 0 and '986101' not in other
+    other.close()
+
+
+# ----- Test: Cleaner -----
+
+@pytest.mark.index
+def test_repeated_clean_only_returns_new_entries(tmp_path, fixture_pages):
+    """A second run over the same and one more page should only return the new page's entries"""
+    everything = clean_data([row for rows in fixture_pages for row in rows], BASE_URL)
+    index      = EntryIndex(tmp_path / 'index.db')
+
+    first  = clean_data([row for rows in fixture_pages[:2] for row in rows], BASE_URL, index)
+    index.add_records(first)
+    second = clean_data([row for rows in fixture_pages for row in rows], BASE_URL, index)
+    index.add_records(second)
+    third  = clean_data([row for rows in fixture_pages for row in rows], BASE_URL, index)
+    index.close()
+
+    assert first + second == everything
+    assert second and not third
+
+
+@pytest.mark.index
+@pytest.mark.parametrize("workers", [0, 2])
+def test_clean_pages_consults_index(tmp_path, fixture_pages, workers):
+    """clean_pages should skip and record entries like clean_data"""
+    index = EntryIndex(tmp_path / 'index.db')
+    index.add_records(clean_data(fixture_pages[0], BASE_URL))
+
+    expected = clean_data([row for rows in fixture_pages[1:] for row in rows], BASE_URL)
+    records  = clean_pages(iter(fixture_pages), BASE_URL, workers=workers, index=index)
+    assert records == expected
+    index.add_records(records)
+    assert not clean_pages(iter(fixture_pages), BASE_URL, workers=workers, index=index)
+    index.close()
+
+
+@pytest.mark.index
+def test_cleaning_leaves_the_index_to_the_caller(tmp_path, fixture_pages):
+    """Entries should only count as processed once the caller records the saved records"""
+    index   = EntryIndex(tmp_path / 'index.db')
+    records = clean_data(fixture_pages[0], BASE_URL, index)
+    clean_pages(iter(fixture_pages), BASE_URL, index=index)
+    assert len(index) == 0
+
+    assert index.add_records(records) == len(records)
+    assert index.add_records(record.to_dict() for record in records) == 0
+    assert all(entry_id(record) in index for record in records)
+    assert entry_id({"url": None}) is None
+    index.close()
@@ -0,0 +1,250 @@
+"""
+This module contains unit tests for the Pipeline class.
+"""
+
+import pytest # type: ignore
+from checkpoint import ScrapeCheckpoint # type: ignore
+from clean import clean_data, load_data # type: ignore
+from entry_index import EntryIndex # type: ignore
+from main import main as pipeline_main # type: ignore
+from pipeline import Pipeline # type: ignore
+from scrape import GradCafeScraper # type: ignore
+from synthetic import SyntheticSurvey # type: ignore
+from Tests.fixture_server import FixtureServer # type: ignore
+
+# --- Fixtures ---
+
+@pytest.fixture
+def synthetic_server(tmp_path):
+    """Fixture that serves 12 distinct synthetic pages"""
+    survey = SyntheticSurvey(seed=3, rows_per_page=10)
+    with FixtureServer(fixtures_dir=survey.write_pages(tmp_path / 'pages', 12)) as fixture_server:
+        yield fixture_server
+
+
+# ----- Test: Output -----
+
+@pytest.mark.pipeline
+@pytest.mark.parametrize("options", [{}, {"concurrency": 4}, {"parse_workers": 2}])
+def test_pipeline_matches_sequential_run(synthetic_server, tmp_path, options):
+    """The pipeline should write the records of a sequential scrape and clean, in order"""
+    expected = clean_data(GradCafeScraper(base_url=synthetic_server.base_url).iter_rows(13),
+                          synthetic_server.base_url)
+
+    scraper  = GradCafeScraper(base_url=synthetic_server.base_url, **options)
+    pipeline = Pipeline(scraper, str(tmp_path / 'out.ndjson'), queue_size=2)
+    pipeline.run(13)
+
+    assert [record.to_dict() for record in expected] == load_data(str(tmp_path / 'out.ndjson'))
+
+
+@pytest.mark.pipeline
+def test_duplicates_and_index_are_skipped(tmp_path):
+    """Repeated pages should be written once, and indexed entries not at all"""
+    with FixtureServer() as server:
+        index = EntryIndex(tmp_path / 'index.db')
+        Pipeline(GradCafeScraper(base_url=server.base_url), str(tmp_path / 'first.json'), index=index).run(7)
+        Pipeline(GradCafeScraper(base_url=server.base_url), str(tmp_path / 'second.json'), index=index).run(7)
+        index.close()
+
+        expected = clean_data(GradCafeScraper(base_url=server.base_url).iter_rows(4), server.base_url)
+
+    assert load_data(str(tmp_path / 'first.json')) == [record.to_dict() for record in expected]
+    assert load_data(str(tmp_path / 'second.json')) == []
+
+
+@pytest.mark.pipeline
+def test_incremental_run_stops_at_indexed_entries(synthetic_server, tmp_path):
+    """A second incremental run should stop fetching at the first page of the first run"""
+    index = EntryIndex(tmp_path / 'index.db')
+    Pipeline(GradCafeScraper(base_url=synthetic_server.base_url), str(tmp_path / 'first.ndjson'),
+             index=index, incremental=True).run(6)
+
+    pipeline = Pipeline(GradCafeScraper(base_url=synthetic_server.base_url), str(tmp_path / 'second.ndjson'),
+                        queue_size=1, index=index, incremental=True)
+    pipeline.run(13)
+    index.close()
+
+    assert len(load_data(str(tmp_path / 'first.ndjson'))) == 50
+    assert load_data(str(tmp_path / 'second.ndjson')) == []
+    assert pipeline.caught_up
+    assert pipeline.stats[0].items < 12
+
+
+@pytest.mark.pipeline
+def test_incremental_run_requests_no_page_after_catching_up(synthetic_server, tmp_path):
+    """Only the pages requested or queued before the first known page was cleaned are fetched"""
+    index = EntryIndex(tmp_path / 'index.db')
+    Pipeline(GradCafeScraper(base_url=synthetic_server.base_url), str(tmp_path / 'first.ndjson'),
+             index=index, incremental=True).run(6)
+
+    scraper = GradCafeScraper(base_url=synthetic_server.base_url, concurrency=4)
+    Pipeline(scraper, str(tmp_path / 'second.ndjson'), queue_size=1, index=index, incremental=True).run(13)
+    index.close()
+
+    # robots.txt, the page being cleaned, one page each in and around the two queues,
+    # and the pages still in flight in the fetch window
+    assert scraper.metrics_summary()['requests'] <= 1 + 5 + 3
+
+
+@pytest.mark.pipeline
+def test_appending_runs_add_to_the_same_file(synthetic_server, tmp_path):
+    """Runs with append should add their new entries to the end of one (gzip) NDJSON file"""
+    output = str(tmp_path / 'out.ndjson.gz')
+    index  = EntryIndex(tmp_path / 'index.db')
+    Pipeline(GradCafeScraper(base_url=synthetic_server.base_url), output, index=index, append=True).run(3)
+    Pipeline(GradCafeScraper(base_url=synthetic_server.base_url), output, index=index, append=True).run(5)
+    index.close()
+
+    expected = clean_data(GradCafeScraper(base_url=synthetic_server.base_url).iter_rows(5),
+                          synthetic_server.base_url)
+    assert load_data(output) == [record.to_dict() for record in expected]
+    assert [path.name for path in tmp_path.iterdir() if path.name.startswith('.part.')] == []
+
+    with pytest.raises(ValueError):
+        Pipeline(GradCafeScraper(), str(tmp_path / 'out.json'), append=True)
+
+
+@pytest.mark.pipeline
+def test_dry_run_writes_nothing(synthetic_server, tmp_path):
+    """A dry run should clean every page without touching the output or the index"""
+    index    = EntryIndex(tmp_path / 'index.db')
+    pipeline = Pipeline(GradCafeScraper(base_url=synthetic_server.base_url), str(tmp_path / 'out.ndjson'),
+                        index=index, dry_run=True)
+    pipeline.run(13)
+
+    assert pipeline.stats[-1].items == 120
+    assert not (tmp_path / 'out.ndjson').exists()
+    assert len(index) == 0
+    index.close()
+
+
+@pytest.mark.pipeline
+def test_incremental_requires_index():
+    """Without an index there is nothing to catch up with"""
+    with pytest.raises(ValueError):
+        Pipeline(GradCafeScraper(), incremental=True)
+
+
+@pytest.mark.pipeline
+def test_cli_run_and_summary(synthetic_server, tmp_path, monkeypatch, capsys):
+    """main.py should crawl the requested pages to the chosen format and print a summary"""
+    output = str(tmp_path / 'out.ndjson.gz')
+    monkeypatch.setattr('sys.argv', ['main.py', '--pages', '4', '--concurrency', '2', '--format', 'ndjson.gz',
+                                     '--output', output, '--since', str(tmp_path / 'index.db'),
+                                     '--base-url', synthetic_server.base_url])
+    pipeline_main()
+
+    summary = capsys.readouterr().out
+    assert len(load_data(output)) == 40
+    assert 'Pages:    4' in summary and 'Records:  40' in summary
+    assert 'Caught up with earlier runs: no' in summary
+
+    # A later run appends to the file, so catching up at once keeps the first run's records
+    monkeypatch.setattr('sys.argv', ['main.py', '--pages', '4', '--output', output, '--since', str(tmp_path / 'index.db'),
+                                     '--base-url', synthetic_server.base_url])
+    pipeline_main()
+    assert len(load_data(output)) == 40
+
+
+@pytest.mark.pipeline
+@pytest.mark.parametrize("options", [['--format', 'ndjson', '--output', 'out.json'], ['--output', 'out.csv'],
+                                     ['--since', 'index.db', '--output', 'out.json']])
+def test_cli_rejects_output_of_another_format(options, monkeypatch, capsys):
+    """main.py should refuse an output that doesn't match its format, or that --since can't append to"""
+    monkeypatch.setattr('sys.argv', ['main.py', *options])
+
+    with pytest.raises(SystemExit) as exit_info:
+        pipeline_main()
+    assert exit_info.value.code == 2
+    assert '--output' in capsys.readouterr().err
+
+
+@pytest.mark.pipeline
+def test_cli_reports_a_failed_save(synthetic_server, tmp_path, monkeypatch, capsys):
+    """main.py should exit with an error instead of a summary when the output can't be written"""
+    monkeypatch.setattr('sys.argv', ['main.py', '--pages', '2', '--output', str(tmp_path / 'missing' / 'out.json'),
+                                     '--base-url', synthetic_server.base_url])
+
+    with pytest.raises(SystemExit) as exit_info:
+        pipeline_main()
+    assert 'Run failed' in str(exit_info.value.code)
+    assert 'Records:' not in capsys.readouterr().out
+
+
+# ----- Test: Measurements -----
+
+@pytest.mark.pipeline
+def test_stage_stats_and_progress(synthetic_server, tmp_path):
+    """Every stage should report its items, and queues should never exceed their bound"""
+    calls    = []
+    pipeline = Pipeline(GradCafeScraper(base_url=synthetic_server.base_url), str(tmp_path / 'out.ndjson'),
+                        queue_size=1)
+    stats    = pipeline.run(13, progress=lambda p: calls.append(p.queue_depths()), interval=0.001)
+
+    assert [s.name for s in stats] == ['fetch', 'parse', 'clean', 'write']
+    assert [s.items for s in stats] == [12, 12, 12, 120]
+    assert all(s.max_depth <= 1 for s in stats)
+    assert all(s.seconds >= s.busy >= 0 for s in stats)
+    assert all(len(depths) == 3 for depths in calls)
+    assert 'write' in pipeline.report()
+
+
+# ----- Test: Failures -----
+
+@pytest.mark.pipeline
+def test_fetch_failure_stops_the_pipeline(tmp_path):
+    """A page that keeps failing should raise instead of leaving the stages waiting"""
+    with FixtureServer(failures=100) as server:
+        scraper = GradCafeScraper(base_url=server.base_url, retries=0)
+
+        with pytest.raises(ConnectionError):
+            Pipeline(scraper, str(tmp_path / 'out.ndjson')).run(5)
+
+
+@pytest.mark.pipeline
+@pytest.mark.parametrize("name", ['out.json', 'out.ndjson.gz', 'out.columns'])
+def test_failed_run_keeps_the_previous_output(tmp_path, name):
+    """A run whose pages fail to load should leave the previous output file in place"""
+    def snapshot(path):
+        """Reads a file, or every file of a directory, as bytes"""
+        return {p.name: p.read_bytes() for p in path.iterdir()} if path.is_dir() else path.read_bytes()
+
+    output = tmp_path / name
+    with FixtureServer() as server:
+        Pipeline(GradCafeScraper(base_url=server.base_url), str(output)).run(3)
+    previous = snapshot(output)
+
+    with FixtureServer(failures=100) as server:
+        with pytest.raises(ConnectionError):
+            Pipeline(GradCafeScraper(base_url=server.base_url, retries=0), str(output)).run(3)
+
+    assert snapshot(output) == previous
+    assert [path.name for path in tmp_path.iterdir()] == [name]
+
+
+@pytest.mark.pipeline
+def test_write_failure_leaves_the_index_unchanged(synthetic_server, tmp_path):
+    """Entries should only be indexed once their records are written, and write errors raised"""
+    index    = EntryIndex(tmp_path / 'index.db')
+    pipeline = Pipeline(GradCafeScraper(base_url=synthetic_server.base_url),
+                        str(tmp_path / 'missing' / 'out.ndjson'), index=index)
+
+    with pytest.raises(OSError):
+        pipeline.run(4)
+    assert len(index) == 0
+
+    Pipeline(GradCafeScraper(base_url=synthetic_server.base_url), str(tmp_path / 'out.ndjson'),
+             index=index).run(4)
+    assert len(load_data(str(tmp_path / 'out.ndjson'))) == len(index) == 30
+    index.close()
+
+
+@pytest.mark.pipeline
+def test_checkpoint_is_rejected(tmp_path):
+    """Checkpoints need lockstep paging, so the pipeline asks for an index instead"""
+    checkpoint = ScrapeCheckpoint(tmp_path / 'checkpoint.db')
+
+    with pytest.raises(ValueError):
+        Pipeline(GradCafeScraper(checkpoint=checkpoint))
+    checkpoint.close()
@@ -0,0 +1,119 @@
+"""
+This module contains unit tests for the ApplicantRecord class.
+"""
+
+import json
+from datetime import date
+import pytest # type: ignore
+from records import ApplicantRecord, parse_date_added, parse_term, term_ordinal # type: ignore
+
+# --- Fixtures ---
+
+@pytest.fixture
+def record():
+    """Fixture that builds a fully populated record"""
+    return ApplicantRecord(program="Computer Science, Johns Hopkins University",
+                           date_added=date(2025, 3, 31),
+                           url="https://www.thegradcafe.com/result/986101",
+                           status="Accepted on 28 Mar",
+                           degree="Masters")
+
+
+# ----- Test: Conversion -----
+
+@pytest.mark.records
+def test_update_converts_scores(record):
+    """Scores found by the cleaner as strings should be stored as numbers"""
+    record.update({"term": "Fall 2025", "GPA": "3.85", "GRE": "325", "GRE_V": "160", "GRE_AW": "4"})
+
+    assert record.gpa == 3.85 and isinstance(record.gpa, float)
+    assert record.gre == 325 and isinstance(record.gre, int)
+    assert record.gre_v == 160
+    assert record.gre_aw == 4.0 and isinstance(record.gre_aw, float)
+    assert record.term == "Fall 2025"
+
+
+@pytest.mark.records
+@pytest.mark.parametrize("text, expected", [
+    ("March 31, 2025", date(2025, 3, 31)),
+    (" January 5, 2024 ", date(2024, 1, 5)),
+    ("yesterday", None),
+])
+def test_parse_date_added(text, expected):
+    """The site's display dates should become real dates"""
+    assert parse_date_added(text) == expected
+
+
+@pytest.mark.records
+def test_records_use_slots(record):
+    """Records should not carry a per-instance __dict__"""
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.unknown_field = 1
+
+
+# ----- Test: JSON shape -----
+
+@pytest.mark.records
+def test_to_dict_keeps_json_shape(record):
+    """Serialization should use the original keys and order, leaving out missing fields"""
+    record.update({"us_or_international": "International", "GPA": "3.85", "comment": "Yay"})
+
+    data = record.to_dict()
+    assert list(data) == ["program", "date_added", "url", "status", "degree",
+                          "us_or_international", "GPA", "comment"]
+    assert data["date_added"] == "2025-03-31"
+    assert data["GPA"] == 3.85
+    json.dumps(data)
+
+
+@pytest.mark.records
+def test_from_dict_round_trip(record):
+    """Records should survive a JSON round trip, including older string-valued files"""
+    record.update({"GRE": "320"})
+    assert ApplicantRecord.from_dict(json.loads(json.dumps(record.to_dict()))) == record
+
+    legacy = {**record.to_dict(), "date_added": "March 31, 2025", "GRE": "320"}
+    assert ApplicantRecord.from_dict(legacy) == record
+
+
+# ----- Test: Terms -----
+
+@pytest.mark.records
+@pytest.mark.parametrize("text, expected", [
+    ("Fall 2025", (2025, 4)),
+    ("spring 2024", (2024, 2)),
+    ("Winter 2026", (2026, 1)),
+    ("Summer  2025", (2025, 3)),
+    ("Fall", None),
+])
+def test_parse_term(text, expected):
+    """Terms should parse to (year, season) with seasons in calendar order"""
+    assert parse_term(text) == expected
+
+
+@pytest.mark.records
+def test_term_ordinal_sorts_terms(record):
+    """The ordinal should follow the term and order terms chronologically"""
+    record.update({"term": "Fall 2025"})
+    assert record.term_ordinal == 20254
+    assert term_ordinal("Spring 2025") < term_ordinal("Fall 2025") < term_ordinal("Winter 2026")
+
+    record.update({"term": None})
+    assert record.term_ordinal is None
+
+    # Records saved before ordinals existed get one when loaded
+    assert ApplicantRecord.from_dict({**record.to_dict(), "term": "Spring 2026"}).term_ordinal == 20262
+
+
+@pytest.mark.records
+def test_parsers_are_cached():
+    """Repeated dates and terms should be served from the cache"""
+    parse_date_added.cache_clear()
+    parse_term.cache_clear()
+    for _ in range(3):
+        parse_date_added("March 31, 2025")
+        parse_term("Fall 2025")
+
+    assert parse_date_added.cache_info().hits == 2
+    assert parse_term.cache_info().hits == 2
@@ -0,0 +1,357 @@
+"""
+This module contains unit tests for the GradCafeScraper class.
+"""
+
+import pickle
+import random
+import time
+import pytest # type: ignore
+from scrape import GradCafeScraper # type: ignore
+from clean import clean_data, RowData # type: ignore
+from checkpoint import ScrapeCheckpoint # type: ignore
+from cache import ResponseCache # type: ignore
+from Tests.fixture_server import FixtureServer, FIXTURES_DIR # type: ignore
+
+# --- Fixtures ---
+
+@pytest.fixture
+def server():
+    """Fixture that runs the local GradCafe stand-in for the duration of a test"""
+    with FixtureServer() as fixture_server:
+        yield fixture_server
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    """Fixture that provides an empty checkpoint file for each test"""
+    store = ScrapeCheckpoint(tmp_path / 'checkpoint.db')
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Fixture that provides an empty response cache for each test"""
+    store = ResponseCache(tmp_path / 'http_cache.db')
+    yield store
+    store.close()
+
+
+# ----- Test: Concurrent fetching -----
+
+@pytest.mark.scrape
+@pytest.mark.parametrize("concurrency", [2, 4, 16])
+def test_concurrent_scrape_matches_sequential(server, concurrency):
+    """Concurrent fetching should return the same rows, in the same page order"""
+    sequential = GradCafeScraper(base_url=server.base_url).scrape_data(8)
+    concurrent = GradCafeScraper(base_url=server.base_url, concurrency=concurrency).scrape_data(8)
+
+    assert len(sequential) > 0, "The fixture pages should contain table rows"
+    assert [str(row) for row in concurrent] == [str(row) for row in sequential]
+
+
+@pytest.mark.scrape
+def test_concurrent_scrape_overlaps_requests():
+    """Pages should be requested in parallel rather than one round trip at a time"""
+    with FixtureServer(latency=0.2) as slow_server:
+        scraper = GradCafeScraper(base_url=slow_server.base_url, concurrency=8)
+
+        start = time.perf_counter()
+        scraper.scrape_data(9)
+        elapsed = time.perf_counter() - start
+
+    # 8 pages at 0.2s each would take 1.6s if fetched sequentially
+    assert elapsed < 1.0, f"Concurrent scrape took {elapsed:.2f}s"
+
+
+@pytest.mark.scrape
+def test_invalid_concurrency():
+    """A concurrency below 1 should be rejected"""
+    with pytest.raises(ValueError):
+        GradCafeScraper(concurrency=0)
+
+
+# ----- Test: Streaming rows -----
+
+@pytest.mark.scrape
+def test_iter_rows_matches_scrape_data(server):
+    """Streaming rows should produce the same rows and cleaned records as scrape_data"""
+    scraper = GradCafeScraper(base_url=server.base_url)
+
+    expected = scraper.scrape_data(5)
+    streamed = [str(row) for row in scraper.iter_rows(5)]
+    assert streamed == [str(row) for row in expected]
+
+    assert clean_data(scraper.iter_rows(5), scraper.base_url) == clean_data(expected, scraper.base_url)
+
+
+@pytest.mark.scrape
+def test_iter_pages_frees_previous_page(server):
+    """Each page's tree should be released once the next page is requested"""
+    pages = GradCafeScraper(base_url=server.base_url).iter_pages(4)
+
+    first = next(pages)
+    assert not first[0].decomposed, "Rows of the current page should be usable"
+
+    next(pages)
+    assert first[0].decomposed, "Rows of the previous page should have been released"
+
+
+# ----- Test: Incremental scraping -----
+
+@pytest.mark.scrape
+def test_since_last_run_stops_at_known_page(server, checkpoint):
+    """The crawl should stop at the first page whose entries were all seen before"""
+    scraper = GradCafeScraper(base_url=server.base_url, checkpoint=checkpoint)
+
+    # The server repeats its 3 fixture pages, so page 4 only holds entries from page 1
+    pages = list(scraper.iter_pages(20))
+    assert len(pages) == 3
+    assert checkpoint.commit() == 9
+    assert len(checkpoint) == 9
+    assert checkpoint.next_page == 1, "A completed crawl should restart from page 1"
+
+    # Nothing is new on the next run
+    assert list(scraper.iter_pages(20)) == []
+    assert clean_data(scraper.iter_rows(20), scraper.base_url) == []
+
+
+@pytest.mark.scrape
+def test_interrupted_crawl_resumes(server, checkpoint):
+    """An interrupted crawl should pick up after the last saved and committed page"""
+    scraper = GradCafeScraper(base_url=server.base_url, checkpoint=checkpoint)
+
+    pages = scraper.iter_pages(20)
+    next(pages)
+    checkpoint.commit()  # page 1 was saved
+    next(pages)
+    pages.close()  # interrupted while page 2 was being processed
+
+    assert checkpoint.next_page == 2
+
+    server.requests.clear()
+    resumed = list(scraper.iter_pages(20))
+
+    assert len(resumed) == 2, "Pages 2 and 3 are new, page 4 repeats page 1"
+    assert server.requests[0] == '/survey/index.php?q=&page=2'
+
+
+@pytest.mark.scrape
+def test_failed_crawl_loses_no_entries(server, checkpoint):
+    """A crawl that fails partway should leave the checkpoint as it was until a commit"""
+    scraper = GradCafeScraper(base_url=server.base_url, checkpoint=checkpoint, retries=0)
+    server.fail_pages = {3}
+
+    with pytest.raises(ConnectionError):
+        scraper.scrape_data(20)
+    assert checkpoint.next_page == 1
+    assert len(checkpoint) == 0
+
+    # The retried crawl returns every entry a fresh one would
+    server.fail_pages = set()
+    expected = clean_data(GradCafeScraper(base_url=server.base_url).scrape_data(4), server.base_url)
+    assert clean_data(scraper.scrape_data(20), server.base_url) == expected
+
+    # Data that was never saved is not committed, so the next crawl returns it again
+    assert clean_data(scraper.scrape_data(20), server.base_url) == expected
+    checkpoint.commit()
+    assert scraper.scrape_data(20) == []
+
+
+# ----- Test: Response cache -----
+
+@pytest.mark.scrape
+def test_recrawl_sends_conditional_requests(server, cache):
+    """A re-crawl should revalidate cached pages instead of downloading them again"""
+    scraper = GradCafeScraper(base_url=server.base_url, cache=cache)
+
+    first = [str(row) for row in scraper.iter_rows(5)]
+    assert len(cache) == 5, "robots.txt and 4 survey pages should be cached"
+    assert server.not_modified == 0
+
+    second = [str(row) for row in scraper.iter_rows(5)]
+    assert second == first
+    assert server.not_modified == 4, "Every page of the re-crawl should be a 304"
+
+
+@pytest.mark.scrape
+def test_offline_crawl_uses_cache_only(cache):
+    """An offline scraper should reproduce a previous crawl without the network"""
+    with FixtureServer() as fixture_server:
+        base_url = fixture_server.base_url
+        online   = clean_data(GradCafeScraper(base_url=base_url, cache=cache).iter_rows(5), base_url)
+
+    offline = GradCafeScraper(base_url=base_url, cache=cache, offline=True)
+    assert clean_data(offline.iter_rows(5), base_url) == online
+
+    # Pages that were never fetched are not available offline
+    with pytest.raises(ConnectionError):
+        offline.scrape_data(6)
+
+
+@pytest.mark.scrape
+def test_cache_is_size_bounded(tmp_path):
+    """The cache should evict the least recently used responses beyond its size limit"""
+    store = ResponseCache(tmp_path / 'small_cache.db', max_bytes=5000)
+
+    for num in range(10):
+        store.put(f'page-{num}', random.Random(num).randbytes(2000))  # incompressible
+
+    assert store.size <= 5000
+    assert store.get('page-9') is not None, "The most recent response should be kept"
+    assert store.get('page-0') is None, "The oldest response should be evicted"
+    store.close()
+
+
+@pytest.mark.scrape
+def test_cache_size_is_tracked(tmp_path):
+    """The running size should match the stored bodies across replacements and reopening"""
+    store = ResponseCache(tmp_path / 'cache.db')
+    store.put('page-1', b'a' * 1000, etag='"v1"')
+    store.put('page-1', random.Random(1).randbytes(500), etag='"v2"')
+    store.put('page-2', b'b' * 1000)
+
+    cached = store.get('page-1')
+    assert cached.etag == '"v2"' and cached.body == random.Random(1).randbytes(500)
+
+    size = store.connection.execute("SELECT SUM(size) FROM responses").fetchone()[0]
+    assert store.size == size
+    store.close()
+
+    assert ResponseCache(tmp_path / 'cache.db').size == size
+
+
+@pytest.mark.scrape
+def test_offline_requires_cache():
+    """Offline mode without a cache should be rejected"""
+    with pytest.raises(ValueError):
+        GradCafeScraper(offline=True)
+
+
+# ----- Test: Parser backends -----
+
+@pytest.mark.scrape
+@pytest.mark.parametrize("parser", ["strainer", "lxml", "lxml-strainer"])
+def test_parser_backends_yield_same_records(server, parser):
+    """Every parser backend should produce the same cleaned records as html.parser"""
+    if parser.startswith("lxml"):
+        pytest.importorskip("lxml")
+
+    base_url = server.base_url
+    expected = clean_data(GradCafeScraper(base_url=base_url).iter_rows(5), base_url)
+    records  = clean_data(GradCafeScraper(base_url=base_url, parser=parser).iter_rows(5), base_url)
+
+    assert len(expected) > 0
+    assert records == expected
+
+
+@pytest.mark.scrape
+def test_unknown_parser():
+    """An unknown parser backend should be rejected"""
+    with pytest.raises(ValueError):
+        GradCafeScraper(parser="regex")
+
+
+# ----- Test: Process-pool parsing -----
+
+@pytest.mark.scrape
+def test_parse_workers_yield_same_records(server):
+    """Parsing in worker processes should produce the same records, from picklable rows"""
+    base_url = server.base_url
+    expected = clean_data(GradCafeScraper(base_url=base_url).iter_rows(8), base_url)
+
+    scraper = GradCafeScraper(base_url=base_url, concurrency=4, parse_workers=2)
+    rows    = scraper.scrape_data(8)
+
+    assert all(isinstance(row, RowData) for row in rows)
+    assert pickle.loads(pickle.dumps(rows)) == rows
+    assert clean_data(rows, base_url) == expected
+
+
+@pytest.mark.scrape
+def test_parse_workers_with_checkpoint(server, checkpoint):
+    """The since-last-run mode should work the same with worker processes"""
+    scraper = GradCafeScraper(base_url=server.base_url, checkpoint=checkpoint, parse_workers=2)
+
+    assert len(list(scraper.iter_pages(20))) == 3
+    checkpoint.commit()
+    assert list(scraper.iter_pages(20)) == []
+
+
+# ----- Test: Robots policy and rate limiting -----
+
+@pytest.fixture
+def polite_server(tmp_path):
+    """Fixture that runs the stand-in with a robots.txt asking for a 1 second crawl delay"""
+    for fixture in FIXTURES_DIR.glob('survey_page_*.html'):
+        (tmp_path / fixture.name).write_bytes(fixture.read_bytes())
+    (tmp_path / 'robots.txt').write_text("User-agent: *\nCrawl-delay: 1\n")
+
+    with FixtureServer(fixtures_dir=tmp_path) as fixture_server:
+        yield fixture_server
+
+
+@pytest.mark.scrape
+def test_robots_txt_is_cached(server):
+    """robots.txt should only be downloaded again once its TTL has expired"""
+    scraper = GradCafeScraper(base_url=server.base_url)
+    scraper.scrape_data(2)
+    scraper.scrape_data(2)
+    assert server.requests.count('/robots.txt') == 1
+
+    expired = GradCafeScraper(base_url=server.base_url, robots_ttl=0)
+    expired.scrape_data(2)
+    expired.scrape_data(2)
+    assert server.requests.count('/robots.txt') == 3
+
+
+@pytest.mark.scrape
+def test_crawl_delay_is_honoured(polite_server):
+    """Requests should be spaced by the Crawl-delay even when fetching concurrently"""
+    scraper = GradCafeScraper(base_url=polite_server.base_url, concurrency=4)
+
+    start = time.perf_counter()
+    scraper.scrape_data(3)
+    elapsed = time.perf_counter() - start
+
+    assert scraper.limiter.rate == 1
+    assert elapsed >= 1.0, "Two pages one second apart should take at least a second"
+
+
+@pytest.mark.scrape
+def test_requests_per_second_budget(server):
+    """The configured budget should cap the request rate"""
+    scraper = GradCafeScraper(base_url=server.base_url, concurrency=4, requests_per_second=20)
+
+    start = time.perf_counter()
+    scraper.scrape_data(6)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed >= 0.2, "5 pages at 20 requests per second should take at least 0.2s"
+
+
+# ----- Test: Retries and metrics -----
+
+@pytest.mark.scrape
+def test_transient_errors_are_retried(server):
+    """A few 503 responses should be retried instead of aborting the crawl"""
+    expected = GradCafeScraper(base_url=server.base_url).scrape_data(4)
+
+    server.failures = 2
+    scraper = GradCafeScraper(base_url=server.base_url, retries=3, backoff_factor=0.01)
+    assert [str(row) for row in scraper.scrape_data(4)] == [str(row) for row in expected]
+
+    summary = scraper.metrics_summary()
+    assert summary["requests"] == 4, "robots.txt and 3 pages"
+    assert summary["retries"] == 2
+    assert summary["bytes"] == sum(m.bytes for m in scraper.metrics) > 0
+
+
+@pytest.mark.scrape
+def test_persistent_errors_raise(server):
+    """Once retries are exhausted the failure should surface as a ConnectionError"""
+    server.failures = 10
+    scraper = GradCafeScraper(base_url=server.base_url, retries=1, backoff_factor=0)
+
+    with pytest.raises(ConnectionError):
+        scraper.scrape_data(3)
@@ -0,0 +1,68 @@
+"""
+This module contains unit tests for the synthetic survey generator.
+"""
+
+import itertools
+import pytest # type: ignore
+from clean import clean_data, load_data # type: ignore
+from scrape import GradCafeScraper, parse_page # type: ignore
+from synthetic import SyntheticSurvey, main as synthetic_main # type: ignore
+from Tests.fixture_server import FixtureServer # type: ignore
+
+# --- Fixtures ---
+
+@pytest.fixture
+def survey():
+    """Fixture that builds a small generator"""
+    return SyntheticSurvey(seed=7, rows_per_page=25, rows_per_day=30)
+
+
+# ----- Test: Pages -----
+
+@pytest.mark.synthetic
+def test_pages_clean_to_generated_records(survey):
+    """clean_data on the rendered pages should give exactly the generated records"""
+    rows = [row for html in survey.iter_pages(4) for row in parse_page(html).find_all('tr')]
+
+    assert clean_data(rows, survey.base_url) == list(survey.iter_records(100))
+
+
+@pytest.mark.synthetic
+def test_pages_are_deterministic(survey):
+    """A page should only depend on the seed and its number"""
+    assert survey.page_html(3) == SyntheticSurvey(seed=7, rows_per_page=25, rows_per_day=30).page_html(3)
+    assert survey.page_html(3) != SyntheticSurvey(seed=8, rows_per_page=25, rows_per_day=30).page_html(3)
+
+
+@pytest.mark.synthetic
+def test_records_are_unique_and_newest_first(survey):
+    """Entry IDs should never repeat and dates should only go back in time"""
+    records = list(survey.iter_records(1000))
+    dates   = [record.date_added for record in records]
+
+    assert len(records) == 1000
+    assert len({record.url for record in records}) == 1000
+    assert dates == sorted(dates, reverse=True) and dates[0] != dates[-1]
+    assert len(list(itertools.islice(survey.iter_records(10), 100))) == 10
+
+
+@pytest.mark.synthetic
+def test_written_pages_can_be_crawled(survey, tmp_path):
+    """Pages written to a directory should be served and scraped like the recorded ones"""
+    survey.write_pages(tmp_path / 'pages', 3)
+
+    with FixtureServer(fixtures_dir=tmp_path / 'pages') as server:
+        scraper = GradCafeScraper(base_url=server.base_url)
+        records = clean_data(scraper.iter_rows(4), survey.base_url)
+
+    assert records == list(survey.iter_records(75))
+
+
+@pytest.mark.synthetic
+def test_cli_writes_records(tmp_path, monkeypatch):
+    """The records command should stream records to any save_data format"""
+    output = str(tmp_path / 'synthetic.ndjson.gz')
+    monkeypatch.setattr('sys.argv', ['synthetic.py', 'records', '--rows', '50', '--output', output])
+    synthetic_main()
+
+    assert len(load_data(output)) == 50
@@ -0,0 +1,121 @@
+import hashlib
+import sqlite3
+import time
+import zlib
+from scrape import parse_page
+
+class PageArchive:
+    """
+    An append-only archive of raw survey pages, replayable without network access.
+
+    Page bodies are stored zlib-compressed and content-addressed by their SHA-256 hash, so a
+    page that did not change between crawls is only stored once. Every fetch is logged in
+    order with its URL, page number and time, which lets `iter_rows` feed `clean_data` the
+    exact rows a crawl saw.
+
+    Attributes:
+        filename (str): Path of the SQLite archive file.
+        connection (sqlite3.Connection): Open connection to the archive file.
+    """
+
+    def __init__(self, filename='pages_archive.db'):
+        """
+        Opens (or creates) the archive file.
+
+        Args:
+            filename (str): Path of the SQLite archive file.
+        """
+
+        self.filename   = filename
+        # The pipeline appends pages from its fetch thread, never from two threads at once
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+
+        with self.connection:
+            self.connection.execute("""
+                                    CREATE TABLE IF NOT EXISTS bodies (
+                                        hash TEXT PRIMARY KEY,
+                                        body BLOB
+                                    ) WITHOUT ROWID
+                                    """)
+            self.connection.execute("""
+                                    CREATE TABLE IF NOT EXISTS fetches (
+                                        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                                        url TEXT,
+                                        page INTEGER,
+                                        hash TEXT REFERENCES bodies (hash),
+                                        fetched_at REAL
+                                    )
+                                    """)
+
+    def add(self, url, page, html):
+        """
+        Appends a fetched page to the archive.
+
+        Args:
+            url (str):  The URL the page was fetched from.
+            page (int): The survey page number.
+            html (str): The HTML content of the page.
+
+        Returns:
+            str: The SHA-256 hash the body is stored under.
+        """
+
+        body   = html.encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()
+
+        with self.connection:
+            # Identical pages share one stored body
+            self.connection.execute("INSERT OR IGNORE INTO bodies (hash, body) VALUES (?, ?)",
+                                    (digest, zlib.compress(body)))
+            self.connection.execute("INSERT INTO fetches (url, page, hash, fetched_at) VALUES (?, ?, ?, ?)",
+                                    (url, page, digest, time.time()))
+        return digest
+
+    def __len__(self):
+        """Number of archived fetches."""
+        return self.connection.execute("SELECT COUNT(*) FROM fetches").fetchone()[0]
+
+    def iter_html(self, since=None):
+        """
+        Yields archived pages in the order they were fetched.
+
+        Args:
+            since (float): Only replay pages fetched at or after this Unix time, if given.
+
+        Yields:
+            str: The HTML content of each archived fetch.
+        """
+
+        query = """
+                SELECT bodies.body FROM fetches JOIN bodies ON bodies.hash = fetches.hash
+                WHERE fetches.fetched_at >= ? ORDER BY fetches.seq
+                """
+
+        for (body,) in self.connection.execute(query, (since or 0,)):
+            yield zlib.decompress(body).decode('utf-8')
+
+    def iter_rows(self, since=None, parser='html.parser'):
+        """
+        Replays the archive as table rows, ready to be passed to `clean_data`.
+
+        Like `GradCafeScraper.iter_rows`, only one page tree is alive at a time: a page's rows
+        are released once the rows of the next page are requested.
+
+        Args:
+            since (float): Only replay pages fetched at or after this Unix time, if given.
+            parser (str):  The parser backend to use (a key of scrape.PARSERS).
+
+        Yields:
+            bs4.element.Tag: BeautifulSoup 'tr' (table row) elements, in fetch order.
+        """
+
+        for html in self.iter_html(since):
+            soup = parse_page(html, parser)
+            yield from soup.find_all('tr')
+
+            for element in list(soup.contents):
+                element.decompose()
+
+    def close(self):
+        """Closes the archive file."""
+        self.connection.close()
@@ -0,0 +1,255 @@
+"""
+Throughput benchmarks for the GradCafe scraping pipeline.
+
+The crawl suite starts the local stand-in server from ``Tests/fixture_server.py``. That server
+serves the recorded pages with a configurable latency. Each scraper mode runs against it in a
+fresh process, and the benchmark reports pages/sec, rows/sec, peak RSS and CPU time. Results are
+printed as a table and written to a JSON file so runs can be compared over time. With
+``--synthetic`` the server instead serves distinct pages from `synthetic.SyntheticSurvey`.
+
+The clean suite is a micro-benchmark of `parse_single_column`, the per-applicant hot loop of
+cleaning. It compares the current single-pass extractor with the original seven-search version
+on the detail rows of the recorded pages.
+
+Usage::
+
+    python benchmark.py crawl --pages 200 --latency 0.05 --output bench_results.json
+    python benchmark.py crawl --pages 2000 --latency 0 --synthetic
+    python benchmark.py clean --rows 200000
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import re
+import resource
+import tempfile
+import time
+from bs4.builder import builder_registry
+from scrape import GradCafeScraper, PARSERS, parse_page
+from clean import clean_data, parse_single_column
+from synthetic import SyntheticSurvey
+from Tests.fixture_server import FixtureServer, FIXTURES_DIR
+
+# Scraper configurations compared by the crawl suite, as (mode name, scraper options, method)
+CRAWL_MODES = [
+    ('sequential',            {},                                          'scrape_data'),
+    ('streaming',             {},                                          'iter_rows'),
+    ('concurrent',            {'concurrency': 8},                          'iter_rows'),
+    ('concurrent-strainer',   {'concurrency': 8, 'parser': 'strainer'},    'iter_rows'),
+    ('concurrent-lxml',       {'concurrency': 8, 'parser': 'lxml'},        'iter_rows'),
+    ('concurrent-workers',    {'concurrency': 8, 'parse_workers': 2},      'iter_rows'),
+]
+
+def _run_crawl(base_url, pages, options, method, results):
+    """
+    Runs one crawl in the current (child) process and reports its measurements.
+
+    Args:
+        base_url (str):  Root URL of the fixture server.
+        pages (int):     Number of survey pages to crawl.
+        options (dict):  Keyword arguments for GradCafeScraper.
+        method (str):    'scrape_data' or 'iter_rows'.
+        results (multiprocessing.Queue): Where the measurements are sent.
+    """
+
+    scraper   = GradCafeScraper(base_url=base_url, **options)
+    row_count = 0
+
+    def counted(rows):
+        """Passes rows through while counting them."""
+        nonlocal row_count
+        for row in rows:
+            row_count += 1
+            yield row
+
+    start_cpu  = time.process_time()
+    start_wall = time.perf_counter()
+
+    records = clean_data(counted(getattr(scraper, method)(pages + 1)), base_url)
+
+    seconds  = time.perf_counter() - start_wall
+    self_cpu = time.process_time() - start_cpu
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    results.put({"pages":         pages,
+                 "rows":          row_count,
+                 "records":       len(records),
+                 "seconds":       seconds,
+                 "pages_per_sec": pages / seconds,
+                 "rows_per_sec":  row_count / seconds,
+                 # ru_maxrss is reported in kilobytes on Linux
+                 "peak_rss_kb":   resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                 "cpu_seconds":   self_cpu + children.ru_utime + children.ru_stime,
+                 "requests":      scraper.metrics_summary()["requests"],
+                 })
+
+def crawl_suite(pages, latency, modes=None, fixtures_dir=FIXTURES_DIR):
+    """
+    Benchmarks every scraper mode against the local fixture server.
+
+    Args:
+        pages (int):      Number of survey pages each mode crawls.
+        latency (float):  Artificial server latency per request, in seconds.
+        modes (list[str]): Names of the modes to run (all of CRAWL_MODES by default).
+        fixtures_dir (Path): Directory of the pages to serve (the recorded pages by default).
+
+    Returns:
+        list[dict]: One result per mode, including its name and options.
+    """
+
+    # A fresh interpreter per mode keeps peak RSS and CPU time independent between modes
+    context = multiprocessing.get_context('spawn')
+    results = []
+
+    with FixtureServer(fixtures_dir, latency=latency) as server:
+        for name, options, method in CRAWL_MODES:
+            if modes and name not in modes:
+                continue
+            if builder_registry.lookup(PARSERS[options.get('parser', 'html.parser')][0]) is None:
+                print(f"Skipping {name}: parser not installed")
+                continue
+
+            queue   = context.Queue()
+            process = context.Process(target=_run_crawl, args=(server.base_url, pages, options, method, queue))
+            process.start()
+            result = queue.get()
+            process.join()
+
+            result.update({"mode": name, "options": options, "method": method})
+            results.append(result)
+
+    return results
+
+def legacy_clean_html(text):
+    """The original three-pass clean_html, kept as the clean suite's baseline."""
+    text = re.sub(r'/\"(.*?)\"/', r"'\1'", text)
+    text = re.sub(r'\s*\r?\n\s*', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+def legacy_parse_single_column(column_data, applicant):
+    """The original one-search-per-field parse_single_column, kept as the clean suite's baseline."""
+    updates = {}
+    term = re.search(r'\b(Fall\s+\d{4}|Spring\s+\d{4})\b', column_data, flags=re.IGNORECASE)
+    if term:
+        updates["term"] = term.group(1)
+    us_intl = re.search(r'\b(international|american)\b', column_data, flags=re.IGNORECASE)
+    if us_intl:
+        updates["us_or_international"] = us_intl.group(1)
+    gpa = re.search(r'\bGPA\s+(\d\.\d{1,2})', column_data, re.IGNORECASE)
+    if gpa:
+        updates["GPA"] = gpa.group(1)
+    gre = re.search(r'\bGRE\s+(\d+)', column_data, re.IGNORECASE)
+    if gre:
+        updates["GRE"] = gre.group(1)
+    gre_v = re.search(r'\bGRE\s+V\s+(\d+)', column_data, re.IGNORECASE)
+    if gre_v:
+        updates["GRE_V"] = gre_v.group(1)
+    gre_aw = re.search(r'\bGRE\s+AW\s+(\d(?:\.\d)?)', column_data, re.IGNORECASE)
+    if gre_aw:
+        updates["GRE_AW"] = gre_aw.group(1)
+    comment = re.search(r'<p[^>]*>(.*?)</p>', column_data, flags=re.DOTALL | re.IGNORECASE)
+    if comment:
+        updates["comment"] = legacy_clean_html(comment.group(1))
+    applicant.update(updates)
+    return applicant
+
+def clean_suite(rows, repeat=3):
+    """
+    Benchmarks parse_single_column against its original implementation.
+
+    Args:
+        rows (int):   Number of detail rows parsed per timing run.
+        repeat (int): Timing runs per implementation; the fastest one is reported.
+
+    Returns:
+        list[dict]: One result per implementation.
+
+    Raises:
+        AssertionError: If the two implementations disagree on any detail row.
+    """
+
+    # Detail rows of the recorded pages, repeated up to the requested count
+    details = [str(row.find_all('td')) for path in sorted(FIXTURES_DIR.glob('survey_page_*.html'))
+               for row in parse_page(path.read_text(encoding='utf-8')).find_all('tr')
+               if len(row.find_all('td')) == 1]
+    details = (details * (rows // len(details) + 1))[:rows]
+
+    for detail in set(details):
+        assert parse_single_column(detail, {}) == legacy_parse_single_column(detail, {}), detail
+
+    results = []
+    for name, function in (('legacy', legacy_parse_single_column), ('single-pass', parse_single_column)):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for detail in details:
+                function(detail, {})
+            best = min(best, time.perf_counter() - start)
+
+        results.append({"mode": name, "rows": rows, "seconds": best, "rows_per_sec": rows / best})
+
+    results[1]["speedup"] = results[0]["seconds"] / results[1]["seconds"]
+    return results
+
+def print_results(results):
+    """Prints benchmark results as an aligned table."""
+    if "pages" not in results[0]:
+        for r in results:
+            speedup = f"  ({r['speedup']:.2f}x)" if "speedup" in r else ""
+            print(f"{r['mode']:<14}{r['rows_per_sec']:>14,.0f} rows/s{speedup}")
+        return
+
+    header = f"{'mode':<22}{'pages/s':>10}{'rows/s':>11}{'records':>9}{'peak RSS MB':>13}{'CPU s':>8}{'wall s':>8}"
+    print(header)
+    print("-" * len(header))
+
+    for r in results:
+        print(f"{r['mode']:<22}{r['pages_per_sec']:>10.1f}{r['rows_per_sec']:>11.1f}{r['records']:>9}"
+              f"{r['peak_rss_kb'] / 1024:>13.1f}{r['cpu_seconds']:>8.2f}{r['seconds']:>8.2f}")
+
+def main():
+    """Parses command-line arguments, runs the requested suite and saves its results."""
+    parser = argparse.ArgumentParser(description="Benchmark the GradCafe scraping pipeline.")
+    suites = parser.add_subparsers(dest='suite', required=True)
+
+    crawl = suites.add_parser('crawl', help="Crawl throughput against a local fixture server")
+    crawl.add_argument('--pages', type=int, default=100, help="Survey pages crawled per mode")
+    crawl.add_argument('--latency', type=float, default=0.02, help="Server latency per request, in seconds")
+    crawl.add_argument('--modes', nargs='*', choices=[name for name, _, _ in CRAWL_MODES],
+                       help="Only run these modes")
+    crawl.add_argument('--synthetic', action='store_true',
+                       help="Serve distinct synthetic pages instead of the recorded ones")
+    crawl.add_argument('--output', default='bench_results.json', help="Where to write the JSON results")
+
+    clean = suites.add_parser('clean', help="parse_single_column rows/sec, before and after")
+    clean.add_argument('--rows', type=int, default=100000, help="Detail rows parsed per timing run")
+    clean.add_argument('--output', default='bench_results.json', help="Where to write the JSON results")
+
+    args = parser.parse_args()
+
+    if args.suite == 'crawl':
+        with tempfile.TemporaryDirectory() as directory:
+            fixtures_dir = SyntheticSurvey().write_pages(directory, args.pages) if args.synthetic else FIXTURES_DIR
+            results      = crawl_suite(args.pages, args.latency, args.modes, fixtures_dir)
+        params = {"pages": args.pages, "latency": args.latency, "synthetic": args.synthetic}
+    else:
+        results = clean_suite(args.rows)
+        params  = {"rows": args.rows}
+
+    print_results(results)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({"suite":     args.suite,
+                   "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+                   "python":    platform.python_version(),
+                   "machine":   platform.machine(),
+                   "cpus":      multiprocessing.cpu_count(),
+                   "params":    params,
+                   "results":   results}, f, indent=4)
+    print(f"Results were saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
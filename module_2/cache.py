@@ -0,0 +1,130 @@
+import sqlite3
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+class CachedResponse(namedtuple('CachedResponse', ['compressed', 'etag', 'last_modified'])):
+    """A cached response body, still compressed, with the validators used for conditional requests."""
+
+    __slots__ = ()
+
+    @property
+    def body(self):
+        """The decompressed body. Only inflated when used, i.e. not when the server sends a new one."""
+        return zlib.decompress(self.compressed)
+
+class ResponseCache:
+    """
+    A persistent, size-bounded HTTP response cache backed by a SQLite file.
+
+    Bodies are stored zlib-compressed along with their ETag and Last-Modified validators.
+    When the compressed bodies grow past `max_bytes`, the least recently used responses
+    are evicted. Their total size is kept as a running count, so storing a response does not
+    scan the table. The cache is safe to share between the scraper's fetch threads.
+
+    Attributes:
+        filename (str):  Path of the SQLite cache file.
+        max_bytes (int): Upper bound on the total size of the stored (compressed) bodies.
+    """
+
+    def __init__(self, filename='http_cache.db', max_bytes=256 * 1024 * 1024):
+        """
+        Opens (or creates) the cache file.
+
+        Args:
+            filename (str):  Path of the SQLite cache file.
+            max_bytes (int): Upper bound on the total size of the stored (compressed) bodies.
+        """
+
+        self.filename   = filename
+        self.max_bytes  = max_bytes
+        self._lock      = threading.Lock()
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+
+        with self.connection:
+            self.connection.execute("""
+                                    CREATE TABLE IF NOT EXISTS responses (
+                                        url TEXT PRIMARY KEY,
+                                        etag TEXT,
+                                        last_modified TEXT,
+                                        body BLOB,
+                                        size INTEGER,
+                                        accessed REAL
+                                    )
+                                    """)
+            self.connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+        self._total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, url):
+        """
+        Looks up a cached response and marks it as recently used.
+
+        Args:
+            url (str): The requested URL.
+
+        Returns:
+            CachedResponse: The compressed body and its validators, or None if not cached.
+        """
+
+        with self._lock, self.connection:
+            row = self.connection.execute("SELECT body, etag, last_modified FROM responses WHERE url = ?",
+                                          (url,)).fetchone()
+            if row is None:
+                return None
+
+            self.connection.execute("UPDATE responses SET accessed = ? WHERE url = ?", (time.time(), url))
+
+        return CachedResponse(*row)
+
+    def put(self, url, body, etag=None, last_modified=None):
+        """
+        Stores a response, then evicts least recently used entries beyond the size bound.
+
+        Args:
+            url (str):           The requested URL.
+            body (bytes):        The raw response body.
+            etag (str):          The response's ETag header, if any.
+            last_modified (str): The response's Last-Modified header, if any.
+        """
+
+        compressed = zlib.compress(body)
+
+        with self._lock, self.connection:
+            previous = self.connection.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            self.connection.execute("""
+                                    INSERT OR REPLACE INTO responses
+                                        (url, etag, last_modified, body, size, accessed)
+                                    VALUES (?, ?, ?, ?, ?, ?)
+                                    """, (url, etag, last_modified, compressed, len(compressed), time.time()))
+            self._total += len(compressed) - (previous[0] if previous else 0)
+
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Deletes the least recently used responses until the cache fits in max_bytes."""
+        evicted = []
+        for url, size in self.connection.execute("SELECT url, size FROM responses ORDER BY accessed"):
+            if self._total <= self.max_bytes:
+                break
+            evicted.append((url,))
+            self._total -= size
+
+        self.connection.executemany("DELETE FROM responses WHERE url = ?", evicted)
+
+    @property
+    def size(self):
+        """Total size, in bytes, of the compressed bodies currently cached."""
+        with self._lock:
+            return self._total
+
+    def __len__(self):
+        """Number of cached responses."""
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        """Closes the cache file."""
+        self.connection.close()
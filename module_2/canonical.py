@@ -0,0 +1,104 @@
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+# The alias table shipped with the scraper
+ALIASES_FILE = Path(__file__).parent / 'aliases.json'
+
+# Anything but letters and digits separates words when comparing names
+NON_ALPHANUMERIC = re.compile(r'[^0-9a-z]+')
+
+def normalize_name(text):
+    """
+    Reduce a university or program name to the form aliases are compared in.
+
+    Case, punctuation and spacing are ignored and '&' reads as 'and', so that
+    'Univ. of California,  Berkeley' and 'univ of california berkeley' compare equal.
+    """
+    return NON_ALPHANUMERIC.sub(' ', text.casefold().replace('&', ' and ')).strip()
+
+class Canonicalizer:
+    """
+    Maps raw university and program names to canonical IDs using an alias table.
+
+    The table (see aliases.json) lists, for each kind, canonical IDs with their display
+    name and known aliases. A name matching none of them gets an ID derived from its
+    normalized text, so every entry is assigned an ID and spelling variants of unknown
+    names still collapse together. The same names recur on every page, so lookups are
+    memoized with an LRU cache per kind.
+
+    Attributes:
+        universities (dict): Normalized alias -> university ID.
+        programs (dict):     Normalized alias -> program ID.
+        names (dict):        Canonical ID -> display name, for both kinds.
+    """
+
+    def __init__(self, aliases=ALIASES_FILE, cache_size=4096):
+        """
+        Loads the alias table.
+
+        Args:
+            aliases (str | dict): Path of the JSON alias table, or its already loaded content.
+            cache_size (int):     Number of distinct raw names remembered per kind.
+        """
+
+        if not isinstance(aliases, dict):
+            with open(aliases, 'r', encoding='utf-8') as f:
+                aliases = json.load(f)
+
+        self.names        = {}
+        self.universities = self._alias_map(aliases.get("universities", {}))
+        self.programs     = self._alias_map(aliases.get("programs", {}))
+        self.cache_size   = cache_size
+        self._make_caches()
+
+    def _alias_map(self, table):
+        """Builds the normalized alias -> ID map of one kind, recording the display names."""
+        mapping = {}
+        for canonical_id, entry in table.items():
+            self.names[canonical_id] = entry["name"]
+            for alias in [entry["name"], *entry.get("aliases", [])]:
+                mapping[normalize_name(alias)] = canonical_id
+        return mapping
+
+    def _make_caches(self):
+        """Wraps the lookups in fresh LRU caches."""
+        self.university = lru_cache(maxsize=self.cache_size)(self._university)
+        self.program    = lru_cache(maxsize=self.cache_size)(self._program)
+
+    def _university(self, raw):
+        """
+        Looks up the canonical ID of a university name (cached as `university`).
+
+        Args:
+            raw (str): The university name as shown on the page.
+
+        Returns:
+            str: The ID from the alias table, or a slug of the name if it is not listed.
+        """
+        key = normalize_name(raw)
+        return self.universities.get(key) or key.replace(' ', '-')
+
+    def _program(self, raw):
+        """
+        Looks up the canonical ID of a program name (cached as `program`).
+
+        Args:
+            raw (str): The program name as shown on the page.
+
+        Returns:
+            str: The ID from the alias table, or a slug of the name if it is not listed.
+        """
+        key = normalize_name(raw)
+        return self.programs.get(key) or key.replace(' ', '-')
+
+    def __getstate__(self):
+        """Leaves the caches out when the canonicalizer is sent to a worker process."""
+        state = self.__dict__.copy()
+        del state["university"], state["program"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._make_caches()
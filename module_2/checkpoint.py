@@ -0,0 +1,120 @@
+import sqlite3
+
+class ScrapeCheckpoint:
+    """
+    A persistent record of the GradCafe entries already scraped and of the crawl in progress.
+
+    The checkpoint is stored in a small SQLite file. Pages handed out by a crawl are only
+    staged in memory: the caller writes them with `commit` once their data has been saved, so
+    a crawl or save that fails leaves the file as it was and loses no entries. A caller saving
+    page by page (e.g. appending to NDJSON) can commit after each save, so an interrupted crawl
+    resumes after the last saved page.
+
+    Attributes:
+        filename (str):         Path of the SQLite checkpoint file.
+        connection (sqlite3.Connection): Open connection to the checkpoint file.
+    """
+
+    def __init__(self, filename='scrape_checkpoint.db'):
+        """
+        Opens (or creates) the checkpoint file.
+
+        Args:
+            filename (str): Path of the SQLite checkpoint file.
+        """
+
+        self.filename     = filename
+        self.connection   = sqlite3.connect(filename)
+        self._staged_ids  = set()   # Entry IDs of the pages handed out since the last commit
+        self._staged_next = None    # The page to resume from once they are committed
+
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS seen_ids (id TEXT PRIMARY KEY) WITHOUT ROWID")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value INTEGER)")
+
+    @property
+    def next_page(self):
+        """The page an interrupted crawl should resume from (1 when the last crawl completed)."""
+        row = self.connection.execute("SELECT value FROM state WHERE key = 'next_page'").fetchone()
+        return row[0] if row else 1
+
+    def _set_next_page(self, num):
+        """Stores the page the next crawl should start from."""
+        self.connection.execute("INSERT OR REPLACE INTO state (key, value) VALUES ('next_page', ?)", (num,))
+
+    def __len__(self):
+        """Number of entry IDs seen so far."""
+        return self.connection.execute("SELECT COUNT(*) FROM seen_ids").fetchone()[0]
+
+    def __contains__(self, entry_id):
+        """Checks whether a single entry ID has been seen."""
+        query = "SELECT 1 FROM seen_ids WHERE id = ?"
+        return self.connection.execute(query, (str(entry_id),)).fetchone() is not None
+
+    def all_known(self, entry_ids):
+        """
+        Checks whether every one of the given entry IDs has been seen before, by an earlier
+        crawl or on a page staged by the current one.
+
+        Args:
+            entry_ids (set[str]): Entry IDs found on a page.
+
+        Returns:
+            bool: True if the set is non-empty and all of its IDs are known.
+        """
+
+        if not entry_ids:
+            return False
+
+        unstaged = {str(i) for i in entry_ids} - self._staged_ids
+        if not unstaged:
+            return True
+
+        placeholders = ", ".join("?" * len(unstaged))
+        query        = f"SELECT COUNT(*) FROM seen_ids WHERE id IN ({placeholders})"
+        known        = self.connection.execute(query, list(unstaged)).fetchone()[0]
+        return known == len(unstaged)
+
+    def stage_page(self, num, entry_ids):
+        """
+        Stages a page handed out to the caller: once committed, its entry IDs become known
+        and the crawl resumes after it.
+
+        Args:
+            num (int):            The page number that was handed out.
+            entry_ids (set[str]): Entry IDs found on that page.
+        """
+
+        self._staged_ids.update(str(i) for i in entry_ids)
+        self._staged_next = num + 1
+
+    def finish(self):
+        """Stages the end of the current crawl, so once committed the next one starts from page 1."""
+        self._staged_next = 1
+
+    def commit(self):
+        """
+        Writes the staged pages to the checkpoint file. Call it once their data has been saved.
+
+        Returns:
+            int: The number of entry IDs that were staged.
+        """
+
+        with self.connection:
+            self.connection.executemany("INSERT OR IGNORE INTO seen_ids (id) VALUES (?)",
+                                        ((i,) for i in self._staged_ids))
+            if self._staged_next is not None:
+                self._set_next_page(self._staged_next)
+
+        count = len(self._staged_ids)
+        self.rollback()
+        return count
+
+    def rollback(self):
+        """Drops the pages staged since the last commit, e.g. when their data was not saved."""
+        self._staged_ids  = set()
+        self._staged_next = None
+
+    def close(self):
+        """Closes the checkpoint file."""
+        self.connection.close()
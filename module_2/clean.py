@@ -1,10 +1,55 @@
 import re
 import json
+import gzip
+import os
+import shutil
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from records import ApplicantRecord, parse_date_added
+from columnar import COLUMNAR_SUFFIX, save_columnar, load_columnar
+from parallel import ordered_map
+
+# A table row reduced to the parts clean_data reads. Unlike a BeautifulSoup Tag it holds
+# no reference to its page tree and can be pickled between processes.
+#   entry:   the first '/result/<id>' link of the row, or None
+#   cells:   the text of each <td> cell. A single-column (detail) row keeps the strings of its
+#            cell separated by spaces, so neighbouring tags don't run together
+#   comment: the inner markup of a detail row's <p> comment, otherwise None
+RowData = namedtuple('RowData', ['entry', 'cells', 'comment'])
+
+# Links to individual results, used to detect a new entry
+RESULT_LINK = re.compile(r'/result/\d+')
+
+# Any digit, used to reject invalid university names
+DIGIT = re.compile(r'\d')
+
+# Helpers of clean_html
+QUOTED_WORD = re.compile(r'/\"(.*?)\"/')
+WHITESPACE  = re.compile(r'\s+')
+
+# Every field of a detail row, found in a single scan of the text. The alternatives never
+# overlap, so the first match of each named group is the one a separate search would find.
+DETAIL_FIELDS = re.compile(r"""
+      \b(?P<term>Fall\s+\d{4}|Spring\s+\d{4})\b                # 'Fall 2024' or 'Spring 2023'
+    | \b(?P<us_or_international>international|american)\b      # applicant origin
+    | \bGPA\s+(?P<GPA>\d\.\d{1,2})                              # 'GPA 3.75'
+    | \bGRE\s+(?: V\s+(?P<GRE_V>\d+)                             # 'GRE V 160'
+              | AW\s+(?P<GRE_AW>\d(?:\.\d)?)                    # 'GRE AW 4' or 'GRE AW 4.5'
+              | (?P<GRE>\d+) )                                  # 'GRE 320'
+    """, re.IGNORECASE | re.VERBOSE)
+
+# The order in which detail fields are added to an applicant's record
+DETAIL_KEYS = ("term", "us_or_international", "GPA", "GRE", "GRE_V", "GRE_AW")
+
+# Comments are wrapped in <p> HTML tags
+COMMENT = re.compile(r'<p[^>]*>(.*?)</p>', re.DOTALL | re.IGNORECASE)
 
 def contains_digit(text):
     """Check if the input text contains any digit."""
      # Use regex search to detect any digit in the string
-    return bool(re.search(r'\d', text))
+    return bool(DIGIT.search(text))
 
 def clean_html(text):
     """ 
@@ -16,130 +61,381 @@ def clean_html(text):
     """
 
     # Replace /"word/" pattern with 'word'
-    text = re.sub(r'/\"(.*?)\"/', r"'\1'", text)
+    text = QUOTED_WORD.sub(r"'\1'", text)
 
-    # Replace line breaks (with optional surrounding whitespace) by a single space to flatten lines
-    text = re.sub(r'\s*\r?\n\s*', ' ', text)
-
-    # Collapse multiple consecutive spaces into a single space
-    text = re.sub(r'\s+', ' ', text)
+    # Flatten line breaks and collapse consecutive whitespace into a single space
+    text = WHITESPACE.sub(' ', text)
 
     # Remove leading/trailing whitespace
     return text.strip()
 
-def parse_single_column(column_data, applicant):
+def parse_detail(text, comment, applicant):
     """
-    Parse a single-column HTML content to extract additional applicant information,
-    
-     Returns updated applicant dictionary.
+    Extract additional applicant information from the text of a detail row.
+
+    Arguments:
+        text (str):       The text of the detail cell (comment included).
+        comment (str):    The markup inside the row's <p> comment, or None.
+        applicant (ApplicantRecord or dict): The applicant record to update. Records convert
+                                             the scores to numbers, dicts keep them as strings.
+
+    Returns updated applicant record.
     """
-    updates = {}
-    
-    # Extract term like 'Fall 2024' or 'Spring 2023'
-    term = re.search(r'\b(Fall\s+\d{4}|Spring\s+\d{4})\b', column_data, flags=re.IGNORECASE)
-    if term:
-        updates["term"] = term.group(1)
-
-    # Extract applicant origin (either 'international' or 'american')
-    us_intl = re.search(r'\b(international|american)\b', column_data, flags=re.IGNORECASE)
-    if us_intl:
-        updates["us_or_international"] = us_intl.group(1)
-
-    # Extract GPA value (format: 'GPA 3.75')
-    gpa = re.search(r'\bGPA\s+(\d\.\d{1,2})', column_data, re.IGNORECASE)
-    if gpa:
-        updates["GPA"] = gpa.group(1)
-    
-    # Extract GRE total score (format: 'GRE 320')
-    gre = re.search(r'\bGRE\s+(\d+)', column_data, re.IGNORECASE)
-    if gre:
-        updates["GRE"] = gre.group(1)
-
-    # Extract GRE verbal score (format: 'GRE V 160')
-    gre_v = re.search(r'\bGRE\s+V\s+(\d+)', column_data, re.IGNORECASE)
-    if gre_v:
-        updates["GRE_V"] = gre_v.group(1)
-
-    # Extract GRE analytical writing score (format: 'GRE AW 4')
-    gre_aw = re.search(r'\bGRE\s+AW\s+(\d+)', column_data, re.IGNORECASE)
-    if gre_aw:
-        updates["GRE_AW"] = gre_aw.group(1)
-
-    # Extract any comments wrapped in <p> HTML tags, then clean the comment text
-    comment = re.search(r'<p[^>]*>(.*?)</p>', column_data, flags=re.DOTALL | re.IGNORECASE)
-    if comment:
-        updates["comment"] = clean_html(comment.group(1))
+    found = {}
+
+    # Extract term, origin, GPA and GRE scores in one pass, keeping the first match of each
+    for match in DETAIL_FIELDS.finditer(text):
+        field = match.lastgroup
+        if field not in found:
+            found[field] = match.group(field)
+            if len(found) == len(DETAIL_KEYS):
+                break
+
+    updates = {key: found[key] for key in DETAIL_KEYS if key in found}
+
+    # Clean the comment text
+    if comment is not None:
+        updates["comment"] = clean_html(comment)
     
     # Update the applicant dictionary with all found information
     applicant.update(updates)
     return applicant
 
-def clean_data(rows, base_url):
+def parse_single_column(column_data, applicant):
+    """
+    Parse a single-column HTML content to extract additional applicant information,
+    
+     Returns updated applicant dictionary.
     """
-    Parse rows of HTML table data and extract structured information into a dictionary.
 
-    Each entry may span multiple rows, so entry identification persists across iterations.
+    # Extract any comments wrapped in <p> HTML tags
+    comment = COMMENT.search(column_data)
+
+    return parse_detail(column_data, comment.group(1) if comment else None, applicant)
+
+def compact_row(row):
+    """
+    Reduce a BeautifulSoup 'tr' element to a RowData tuple.
+
+    The entry link is read from the anchors' href attributes and the detail fields from the
+    cell's text, so the row is never serialized back to HTML. Only a comment's own markup is.
     """
+    cols = row.find_all("td")
+
+    # Attempt to detect new entry from the row's result link
+    link  = row.find("a", href=RESULT_LINK)
+    entry = RESULT_LINK.search(link["href"]).group(0) if link else None
+
+    if len(cols) != 1:
+        return RowData(entry, tuple(col.text for col in cols), None)
+
+    comment = cols[0].find("p")
+    return RowData(entry   = entry,
+                   cells   = (cols[0].get_text(" "),),
+                   comment = comment.decode_contents() if comment else None)
 
-    # Create a dictionary to store data
+def clean_entries(rows, base_url, index=None, canonical=None):
+    """
+    Clean rows into a dictionary of ApplicantRecord keyed by entry_num.
+
+    An entry scraped more than once keeps the position of its first occurrence and the
+    values of its last one, as dictionary assignment does. Entries found in the index are
+    skipped along with their detail rows, and a Canonicalizer adds university and program IDs.
+    """
+
+    # Create a dictionary to store the records, keyed by entry_num
     applicants_data = {}
     entry_num       = None # Tracks current applicant entry being parsed
 
     # Scrape data
     for row in rows:
+        if not isinstance(row, RowData):
+            row = compact_row(row)
+
         # Store columns data
-        cols = row.find_all("td")
+        cols = row.cells
         
         # Attempt to detect new entry and extract entry_num
-        match = re.findall(r'/result/\d+', str(row))
-        if match:
-            entry     = match[0]
+        if row.entry:
+            entry     = row.entry
             entry_num = entry.replace("/result/", "")
 
         if len(cols) >= 4:
-            university = cols[0].text.strip()
+            university = cols[0].strip()
 
-            # Skip entries with invalid university names
-            if contains_digit(university):
+            # Skip entries with invalid university names, or processed by an earlier run
+            if contains_digit(university) or (index is not None and entry_num in index):
                 entry_num = None
                 continue
             
             # Split program info, where first part is program name, second is degree
-            full_program = cols[1].text.strip().split('\n\n\n\n')
+            full_program = cols[1].strip().split('\n\n\n\n')
+
+            # Build the record for this entry
+            data = ApplicantRecord(program    = f"{full_program[0]}, {university}",
+                                   date_added = parse_date_added(cols[2]),
+                                   url        = base_url + entry,
+                                   status     = cols[3].strip(),
+                                   degree     = full_program[1] if len(full_program) > 1 else None)
 
-            # Build dictionary for this entry
-            data = {"program": f"{full_program[0]}, {cols[0].text.strip()}",
-                    "date_added": cols[2].text.strip(),
-                    "url": base_url + entry,
-                    "status": cols[3].text.strip(),
-                                                    }
-            if len(full_program) > 1:
-                data["degree"] = full_program[1]
+            # Map the raw names to their canonical IDs
+            if canonical is not None:
+                data.university_id = canonical.university(university)
+                data.program_id    = canonical.program(full_program[0])
 
             # Store this applicant's data keyed by entry_num
             applicants_data[entry_num] = data
                           
         elif (len(cols) == 1) and entry_num:
             # Parse additional info in single column rows
-            parse_single_column(str(cols), applicants_data[entry_num])
+            parse_detail(cols[0], row.comment, applicants_data[entry_num])
+
+    return applicants_data
+
+def clean_data(rows, base_url, index=None, canonical=None):
+    """
+    Parse rows of HTML table data and extract structured information into a dictionary.
+
+    Each entry may span multiple rows, so entry identification persists across iterations.
+    Rows may be any iterable, including the generator returned by `GradCafeScraper.iter_rows`,
+    in which case every row is processed as soon as it is scraped. Each row is either a
+    BeautifulSoup 'tr' element or the equivalent RowData tuple.
+
+    With an EntryIndex (see entry_index.py), entries cleaned by earlier runs are skipped, so
+    the result only holds entries not returned before. The index itself is left unchanged:
+    once the records are saved (appended to earlier output, e.g. with NDJSONWriter), the
+    caller records them with `index.add_records(records)`, so a failed save loses nothing.
+    With a Canonicalizer (see canonical.py), records also get canonical university and
+    program IDs, so that queries can match them exactly instead of by substring.
+
+    Returns a list of ApplicantRecord, with scores and dates already converted.
+    """
+
+    return list(clean_entries(rows, base_url, index, canonical).values())
+
+def _iter_cleaned_pages(pages, base_url, workers, canonical):
+    """
+    Clean every page on its own and yield the entry dictionaries in page order.
+
+    With workers, pages are compacted to RowData tuples and cleaned in a process pool, at most
+    twice as many pages as there are workers ahead of the consumer.
+    """
+
+    if not workers:
+        for rows in pages:
+            yield clean_entries(rows, base_url, canonical=canonical)
+        return
+
+    # Page trees can't be pickled and may be decomposed once the next page is requested,
+    # so each page is compacted to RowData tuples as it is read and only those are sent
+    compacted = ([row if isinstance(row, RowData) else compact_row(row) for row in rows] for rows in pages)
+
+    # Keep the workers busy, but don't let cleaned pages pile up unconsumed
+    yield from ordered_map(ProcessPoolExecutor(max_workers=workers),
+                           partial(clean_entries, base_url=base_url, canonical=canonical),
+                           compacted, 2 * workers)
+
+def clean_pages(pages, base_url, workers=0, index=None, canonical=None):
+    """
+    Clean survey pages in parallel, giving the same records as `clean_data` on their rows.
+
+    An entry's rows never straddle a page, so every page can be cleaned on its own, in a
+    pool of worker processes. The per-page results are merged in page order into one
+    dictionary, so an entry found on several pages keeps the position of its first occurrence
+    and the values of its last, exactly like `clean_data`. An index is consulted while
+    merging and, as in `clean_data`, left for the caller to update once the records are saved.
+
+    Args:
+        pages (iterable[list]): Rows of each page, e.g. from `GradCafeScraper.iter_pages`.
+        base_url (str):         Root URL prepended to each entry's result link.
+        workers (int):          Number of cleaning processes (0 cleans in the calling process).
+        index (EntryIndex):     Entries processed by earlier runs, to skip (optional).
+        canonical (Canonicalizer): Assigns university and program IDs (optional).
+
+    Returns:
+        list[ApplicantRecord]: The cleaned records, in the order of their first occurrence.
+    """
+
+    applicants_data = {}
+
+    for page_data in _iter_cleaned_pages(pages, base_url, workers, canonical):
+        for entry_num, data in page_data.items():
+            # Leave out entries processed by earlier runs
+            if index is None or entry_num not in index:
+                applicants_data[entry_num] = data
 
     return list(applicants_data.values())
 
+def to_json(record):
+    """Convert an ApplicantRecord (or an already plain dict) to its JSON dictionary."""
+    return record.to_dict() if isinstance(record, ApplicantRecord) else record
+
+# File name endings of the NDJSON format (one JSON record per line), optionally gzip-compressed
+NDJSON_SUFFIXES = ('.ndjson', '.jsonl', '.ndjson.gz', '.jsonl.gz')
+
+def is_ndjson(filename):
+    """Check whether a file name denotes the NDJSON format."""
+    return str(filename).endswith(NDJSON_SUFFIXES)
+
+def _open_text(filename, mode):
+    """Open a text file, transparently gzip-compressed when its name ends with '.gz'."""
+    if str(filename).endswith('.gz'):
+        return gzip.open(filename, mode + 't', encoding='utf-8')
+    return open(filename, mode, encoding='utf-8')
+
+class NDJSONWriter:
+    """
+    Incrementally writes applicant records to an NDJSON file, one compact JSON object per line.
+
+    Records are written as they arrive, so nothing has to be kept in memory. In append mode
+    every run adds to the end of the file; a gzip file then simply gains another member,
+    which gzip readers handle transparently.
+
+    Attributes:
+        filename (str): Path of the NDJSON file ('.gz' suffix for gzip compression).
+        count (int):    Number of records written so far.
+    """
+
+    def __init__(self, filename='applicant_data.ndjson', append=True):
+        """
+        Opens the file for writing.
+
+        Args:
+            filename (str): Path of the NDJSON file ('.gz' suffix for gzip compression).
+            append (bool):  Add to an existing file instead of replacing it.
+        """
+        self.filename = filename
+        self.count    = 0
+        self._file    = _open_text(filename, 'a' if append else 'w')
+
+    def write(self, record):
+        """Write a single record (ApplicantRecord or dict)."""
+        self._file.write(json.dumps(to_json(record), ensure_ascii=False, separators=(',', ':')))
+        self._file.write('\n')
+        self.count += 1
+
+    def write_all(self, records):
+        """Write every record of an iterable, consuming it lazily."""
+        for record in records:
+            self.write(record)
+
+    def close(self):
+        """Flush and close the file."""
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def iter_ndjson(filename='applicant_data.ndjson'):
+    """
+    Stream records from an NDJSON file (gzip-compressed if its name ends with '.gz').
+
+    Yields one dictionary per non-empty line, without reading the whole file into memory.
+    """
+    with _open_text(filename, 'r') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def _write_new(data, filename):
+    """Write parsed data to a new file, or '.columns' directory, in the format its name selects."""
+    if str(filename).endswith(COLUMNAR_SUFFIX):
+        return save_columnar(data, filename)
+    if is_ndjson(filename):
+        with NDJSONWriter(filename, append=False) as writer:
+            writer.write_all(data)
+        return writer.count
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump([to_json(record) for record in data], f, ensure_ascii=False, indent=4)
+    return len(data)
+
+def _remove(path):
+    """Delete a file or directory, if it exists."""
+    if path.is_dir():
+        shutil.rmtree(path)
+    else:
+        path.unlink(missing_ok=True)
+
+def _replace(source, target):
+    """Move a finished file or directory over the target, which may already exist."""
+    if not (source.is_dir() and target.exists()):
+        os.replace(source, target)
+        return
+
+    # A directory can't be renamed over a non-empty one, so the old columns are moved aside
+    old = target.with_name('.old.' + target.name)
+    _remove(old)
+    os.replace(target, old)
+    os.replace(source, target)
+    _remove(old)
+
+def write_data(data, filename='applicant_data.json', append=False):
+    """
+    Write parsed data to a file in the format its name selects, as described in save_data.
+
+    Unlike save_data, failures are raised to the caller, e.g. so that entries are only indexed
+    once their records are actually written. The records are first written to a '.part.' file
+    (or directory) next to the output, which then replaces it, or with append is added to the
+    end of an NDJSON file, in one go. A failure partway therefore leaves an existing output
+    as it was.
+
+    Returns the number of records written.
+
+    Raises:
+        ValueError: If append is requested for a format other than NDJSON.
+    """
+
+    if append and not is_ndjson(filename):
+        raise ValueError(f"only NDJSON files can be appended to, not {filename}")
+
+    # Keep the suffix, so that the side file is written in the same format
+    filename = Path(filename)
+    part     = filename.with_name('.part.' + filename.name)
+    _remove(part)  # left over from a run that was killed
+    try:
+        count = _write_new(data, part)
+        if append:
+            with open(part, 'rb') as src, open(filename, 'ab') as dst:
+                shutil.copyfileobj(src, dst)
+        else:
+            _replace(part, filename)
+    finally:
+        _remove(part)
+    return count
+
 def save_data(data, filename='applicant_data.json'):
-    """Save parsed data as a formatted JSON file."""
+    """
+    Save parsed data as a formatted JSON file.
+
+    If the file name ends with '.ndjson' or '.jsonl' (optionally followed by '.gz'), the records
+    are streamed to it one per line instead, so data may also be a generator. A name ending with
+    '.columns' saves a directory of memory-mappable columns (see columnar.save_columnar).
+    Errors are printed rather than raised; use write_data to handle them.
+    """
 
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
-        print(f"{len(data)} entries were saved to {filename}")
+        count = write_data(data, filename)
+        print(f"{count} entries were saved to {filename}")
     except Exception as e:
         print(f"Error saving data: {e}")
 
 def load_data(filename='applicant_data.json'):
-    """Load parsed data from a JSON file."""
+    """
+    Load parsed data from a JSON file, or from an NDJSON file (see iter_ndjson).
+
+    A '.columns' directory is opened as a memory-mapped ColumnarDataset, which yields
+    ApplicantRecord objects instead of dictionaries.
+    """
     try:
+        if str(filename).endswith(COLUMNAR_SUFFIX):
+            return load_columnar(filename)
+        if is_ndjson(filename):
+            return list(iter_ndjson(filename))
         with open(filename, 'r', encoding='utf-8') as f:
             return json.load(f)
     except Exception as e:
         print(f"Error loading data: {e}")
-        return None
\ No newline at end of file
+        return None
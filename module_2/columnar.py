@@ -0,0 +1,299 @@
+import ast
+import json
+import mmap
+import sys
+from array import array
+from datetime import date
+from pathlib import Path
+from records import ApplicantRecord
+
+# Directory name ending that selects the columnar format in save_data / load_data
+COLUMNAR_SUFFIX = '.columns'
+
+# Magic string and version of the NumPy .npy file format (version 1.0)
+NPY_MAGIC = b'\x93NUMPY\x01\x00'
+
+# .npy dtype of each storage type, with the matching array / memoryview type code
+DTYPES = {'float': ('<f8', 'd'), 'int': ('<i4', 'i'), 'date': ('<M8[D]', 'q'),
+          'code': ('<i4', 'i'), 'offset': ('<i8', 'q'), 'byte': ('|u1', 'B')}
+
+# Storage kind of every record field:
+#   float / int  typed scores, missing values stored as NaN / -1
+#   date         days since 1970-01-01 (numpy datetime64[D]), missing values stored as NaT
+#   category     int32 codes into a list of distinct strings kept in meta.json, -1 if missing
+#   text         UTF-8 bytes of every row concatenated, sliced by an offsets column
+COLUMN_KINDS = {"program": "text", "date_added": "date", "url": "text", "status": "category",
+                "degree": "category", "term": "category", "us_or_international": "category",
+                "gpa": "float", "gre": "int", "gre_v": "int", "gre_aw": "float", "comment": "text",
+                "term_ordinal": "int", "university_id": "category", "program_id": "category"}
+
+# Sentinels for missing values
+MISSING_INT  = -1
+MISSING_DATE = -2 ** 63
+EPOCH        = date(1970, 1, 1).toordinal()
+
+def _write_npy(path, kind, values):
+    """
+    Writes a one-dimensional array in the NumPy .npy format.
+
+    The header is padded so the data starts on a 64-byte boundary, which lets the file be
+    memory-mapped by `load_columnar` as well as by `numpy.load(path, mmap_mode='r')`.
+
+    Args:
+        path (Path):    Destination file.
+        kind (str):     Storage type, a key of DTYPES.
+        values (array): The values, with the type code of DTYPES[kind].
+    """
+
+    descr, _ = DTYPES[kind]
+    header   = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': ({len(values)},), }}"
+    header  += ' ' * (-(len(NPY_MAGIC) + 2 + len(header) + 1) % 64) + '\n'
+
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+
+    with open(path, 'wb') as f:
+        f.write(NPY_MAGIC + len(header).to_bytes(2, 'little') + header.encode('latin1'))
+        f.write(values.tobytes())
+
+def _map_npy(path):
+    """
+    Memory-maps a .npy file written by `_write_npy`.
+
+    Args:
+        path (Path): The .npy file.
+
+    Returns:
+        tuple: The mmap object and a typed memoryview over its data (no copy is made).
+
+    Raises:
+        ValueError: If the file is not a one-dimensional .npy array of a known type.
+    """
+
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if mapped[:len(NPY_MAGIC)] != NPY_MAGIC:
+        mapped.close()
+        raise ValueError(f"{path} is not a .npy version 1.0 file")
+
+    start  = len(NPY_MAGIC) + 2
+    end    = start + int.from_bytes(mapped[start - 2:start], 'little')
+    header = ast.literal_eval(mapped[start:end].decode('latin1'))
+    codes  = {descr: code for descr, code in DTYPES.values()}
+
+    if header['descr'] not in codes or header['fortran_order'] or len(header['shape']) != 1:
+        mapped.close()
+        raise ValueError(f"{path} has an unsupported array layout: {header}")
+
+    view = memoryview(mapped)[end:].cast(codes[header['descr']])
+    if sys.byteorder != 'little':
+        # Big-endian hosts get a byte-swapped copy instead of a view
+        values = array(view.format, view)
+        values.byteswap()
+        view.release()
+        view = memoryview(values)
+    return mapped, view
+
+def save_columnar(records, dirname='applicant_data' + COLUMNAR_SUFFIX):
+    """
+    Saves applicant records as a directory of columnar .npy files.
+
+    Every field is stored in its own file (see COLUMN_KINDS), and `meta.json` holds the row
+    count and the distinct values of the dictionary-encoded columns. Records are consumed
+    lazily, so `records` may be a generator.
+
+    Args:
+        records (iterable): ApplicantRecord objects or dictionaries in the JSON shape.
+        dirname (str):      Directory to write the columns to; it is created if needed.
+
+    Returns:
+        int: The number of records saved.
+    """
+
+    columns    = {}
+    categories = {}
+    for name, kind in COLUMN_KINDS.items():
+        if kind == 'text':
+            columns[name] = (array('q', [0]), bytearray(), array('B'))
+        elif kind == 'category':
+            columns[name] = array('i')
+            categories[name] = {}
+        else:
+            columns[name] = array(DTYPES[kind][1])
+
+    count = 0
+    for record in records:
+        if not isinstance(record, ApplicantRecord):
+            record = ApplicantRecord.from_dict(record)
+        count += 1
+
+        for name, kind in COLUMN_KINDS.items():
+            value = getattr(record, name)
+            if kind == 'text':
+                offsets, data, valid = columns[name]
+                data += (value or '').encode('utf-8')
+                offsets.append(len(data))
+                valid.append(value is not None)
+            elif kind == 'category':
+                # New strings get the next code, in order of first appearance
+                codes = categories[name]
+                columns[name].append(MISSING_INT if value is None else codes.setdefault(value, len(codes)))
+            elif kind == 'date':
+                columns[name].append(MISSING_DATE if value is None else value.toordinal() - EPOCH)
+            elif kind == 'int':
+                columns[name].append(MISSING_INT if value is None else value)
+            else:
+                columns[name].append(float('nan') if value is None else value)
+
+    directory = Path(dirname)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    meta = {"version": 1, "rows": count, "columns": {}}
+    for name, kind in COLUMN_KINDS.items():
+        if kind == 'text':
+            offsets, data, valid = columns[name]
+            _write_npy(directory / f'{name}.offsets.npy', 'offset', offsets)
+            _write_npy(directory / f'{name}.data.npy', 'byte', array('B', data))
+            _write_npy(directory / f'{name}.valid.npy', 'byte', valid)
+            meta["columns"][name] = {"kind": kind}
+        elif kind == 'category':
+            _write_npy(directory / f'{name}.npy', 'code', columns[name])
+            meta["columns"][name] = {"kind": kind, "categories": list(categories[name])}
+        else:
+            _write_npy(directory / f'{name}.npy', kind, columns[name])
+            meta["columns"][name] = {"kind": kind}
+
+    # meta.json is written last, so a directory with it is always complete
+    with open(directory / 'meta.json', 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=4)
+
+    return count
+
+class ColumnarDataset:
+    """
+    A read-only, memory-mapped view of applicant records saved by `save_columnar`.
+
+    Opening the dataset only maps its files; values are read from the page cache when they
+    are accessed. Whole columns are available as typed memoryviews (`column`), which analysis
+    code can use directly or hand to `numpy.frombuffer` without copying.
+
+    Attributes:
+        dirname (Path):    Directory holding the column files.
+        categories (dict): Distinct values of each dictionary-encoded column, indexed by code.
+    """
+
+    def __init__(self, dirname='applicant_data' + COLUMNAR_SUFFIX):
+        """
+        Maps every column file of the dataset.
+
+        Args:
+            dirname (str): Directory written by `save_columnar`.
+
+        Raises:
+            FileNotFoundError: If the directory has no meta.json.
+            ValueError: If a column file is not a valid .npy array.
+        """
+
+        self.dirname = Path(dirname)
+        with open(self.dirname / 'meta.json', 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        self._rows      = meta["rows"]
+        self._maps      = []
+        self._views     = {}
+        self.categories = {name: column["categories"] for name, column in meta["columns"].items()
+                           if column["kind"] == 'category'}
+
+        for name, column in meta["columns"].items():
+            parts = ('offsets', 'data', 'valid') if column["kind"] == 'text' else (None,)
+            for part in parts:
+                key = f'{name}.{part}' if part else name
+                mapped, view = _map_npy(self.dirname / f'{key}.npy')
+                self._maps.append(mapped)
+                self._views[key] = view
+
+    def __len__(self):
+        """Number of records in the dataset."""
+        return self._rows
+
+    def column(self, name):
+        """
+        Returns the raw values of a non-text column.
+
+        Args:
+            name (str): Record field name, e.g. 'gpa' or 'status'.
+
+        Returns:
+            memoryview: Floats (NaN if missing), ints (-1 if missing), dates as days since
+                        1970-01-01, or category codes (-1 if missing, see `categories`).
+        """
+        return self._views[name]
+
+    def value(self, name, index):
+        """
+        Decodes a single value of a column.
+
+        Args:
+            name (str):  Record field name.
+            index (int): Row number.
+
+        Returns:
+            The value as stored in an ApplicantRecord, or None if it is missing.
+        """
+
+        kind = COLUMN_KINDS[name]
+        if kind == 'text':
+            if not self._views[f'{name}.valid'][index]:
+                return None
+            offsets = self._views[f'{name}.offsets']
+            return bytes(self._views[f'{name}.data'][offsets[index]:offsets[index + 1]]).decode('utf-8')
+
+        value = self._views[name][index]
+        if kind == 'category':
+            return None if value == MISSING_INT else self.categories[name][value]
+        if kind == 'date':
+            return None if value == MISSING_DATE else date.fromordinal(value + EPOCH)
+        if kind == 'int':
+            return None if value == MISSING_INT else value
+        return None if value != value else value
+
+    def __getitem__(self, index):
+        """Rebuilds the ApplicantRecord stored at a row number."""
+        if not -self._rows <= index < self._rows:
+            raise IndexError("dataset index out of range")
+        index %= self._rows
+        return ApplicantRecord(**{name: self.value(name, index) for name in COLUMN_KINDS})
+
+    def __iter__(self):
+        """Yields every record, in the order they were saved."""
+        for index in range(self._rows):
+            yield self[index]
+
+    def close(self):
+        """Releases the column views and unmaps the files."""
+        for view in self._views.values():
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
+        self._views = {}
+        self._maps  = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def load_columnar(dirname='applicant_data' + COLUMNAR_SUFFIX):
+    """
+    Opens a dataset saved by `save_columnar`.
+
+    Args:
+        dirname (str): Directory written by `save_columnar`.
+
+    Returns:
+        ColumnarDataset: The memory-mapped dataset.
+    """
+    return ColumnarDataset(dirname)
@@ -0,0 +1,102 @@
+import re
+import sqlite3
+
+# The entry number at the end of a GradCafe result URL
+RESULT_ID = re.compile(r'/result/(\d+)')
+
+def entry_id(record):
+    """Returns the entry ID of an ApplicantRecord or record dictionary, from its URL, or None."""
+    url   = record.get('url') if isinstance(record, dict) else record.url
+    match = RESULT_ID.search(url or '')
+    return int(match.group(1)) if match else None
+
+class EntryIndex:
+    """
+    A persistent set of GradCafe entry IDs already processed by a pipeline stage.
+
+    The IDs live in a small SQLite file, so repeated runs of the cleaner (or of the database
+    loaders, which share the file format) only process entries they have not seen before.
+    Each stage has its own namespace: an entry cleaned by one run is not thereby loaded.
+    The stage's IDs are read into memory when the index is opened, so membership tests are
+    set lookups rather than queries.
+
+    Readers of the index only skip entries; they never add to it. The entries of a run are
+    recorded with `add_records` once its output has been saved, so a failed save never marks
+    entries as processed.
+
+    Attributes:
+        filename (str): Path of the SQLite index file.
+        stage (str):    Namespace of the IDs, e.g. 'clean' or 'load'.
+        connection (sqlite3.Connection): Open connection to the index file.
+    """
+
+    def __init__(self, filename='entry_index.db', stage='clean'):
+        """
+        Opens (or creates) the index file and loads the stage's IDs.
+
+        Args:
+            filename (str): Path of the SQLite index file.
+            stage (str):    Namespace of the IDs, e.g. 'clean' or 'load'.
+        """
+
+        self.filename   = filename
+        self.stage      = stage
+        # The pipeline reads the index from its clean thread and updates it from its write
+        # thread once the clean thread is done, never from two threads at once
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+
+        with self.connection:
+            self.connection.execute("""
+                                    CREATE TABLE IF NOT EXISTS entries (
+                                        stage TEXT,
+                                        id INTEGER,
+                                        PRIMARY KEY (stage, id)
+                                    ) WITHOUT ROWID
+                                    """)
+
+        query     = "SELECT id FROM entries WHERE stage = ?"
+        self._ids = {entry_id for (entry_id,) in self.connection.execute(query, (stage,))}
+
+    def __len__(self):
+        """Number of entry IDs processed by this stage."""
+        return len(self._ids)
+
+    def __contains__(self, entry_id):
+        """Checks whether an entry ID (e.g. '986101' or 986101) was processed by this stage."""
+        return int(entry_id) in self._ids
+
+    def add_many(self, entry_ids):
+        """
+        Records entry IDs as processed and commits them.
+
+        Args:
+            entry_ids (iterable): Entry IDs as digit strings or integers.
+
+        Returns:
+            int: The number of IDs that were not in the index yet.
+        """
+
+        new = {int(entry_id) for entry_id in entry_ids} - self._ids
+
+        with self.connection:
+            self.connection.executemany("INSERT OR IGNORE INTO entries (stage, id) VALUES (?, ?)",
+                                        ((self.stage, entry_id) for entry_id in new))
+        self._ids |= new
+        return len(new)
+
+    def add_records(self, records):
+        """
+        Records the entries of saved records as processed and commits them.
+
+        Args:
+            records (iterable): ApplicantRecord objects or record dictionaries.
+
+        Returns:
+            int: The number of entries that were not in the index yet.
+        """
+
+        return self.add_many(entry for entry in map(entry_id, records) if entry is not None)
+
+    def close(self):
+        """Closes the index file."""
+        self.connection.close()
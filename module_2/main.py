@@ -1,17 +1,113 @@
-from scrape import GradCafeScraper
-from clean import clean_data, save_data, load_data
+import argparse
+import sys
+import time
+from scrape import GradCafeScraper, PARSERS
+from canonical import Canonicalizer
+from entry_index import EntryIndex
+from pipeline import Pipeline
 
-# Initialize the scraper object for GradCafe
-scraper  = GradCafeScraper()
+# File name suffix of each --format choice
+FORMATS = {'json': '.json', 'ndjson': '.ndjson', 'ndjson.gz': '.ndjson.gz', 'columns': '.columns'}
 
-# Scrape raw data
-raw_rows = scraper.scrape_data(600)
+def format_bytes(count):
+    """Formats a byte count with a binary unit, e.g. 1536 -> '1.5 KiB'."""
+    for unit in ('B', 'KiB', 'MiB'):
+        if count < 1024:
+            return f"{count:.0f} {unit}" if unit == 'B' else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GiB"
 
-# Clean and structure the raw data
-structured_data = clean_data(raw_rows, scraper.base_url)
+def parse_args():
+    """Parses the command-line options of a crawl."""
+    parser = argparse.ArgumentParser(description="Scrape, clean and save GradCafe survey pages.")
+    parser.add_argument('--pages', type=int, default=600, help="Number of survey pages to crawl")
+    parser.add_argument('--concurrency', type=int, default=1, help="Pages requested in parallel")
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help="Processes parsing pages (0 parses them in the pipeline's parse thread)")
+    parser.add_argument('--parser', choices=sorted(PARSERS), default='html.parser', help="Parser backend")
+    parser.add_argument('--rate', type=float, default=None,
+                        help="Upper bound on requests per second (robots.txt may set a lower one)")
+    parser.add_argument('--queue-size', type=int, default=8, help="Capacity of the queues between stages")
+    parser.add_argument('--format', choices=list(FORMATS), default=None,
+                        help="Output format (defaults to the one --output's suffix names, or json)")
+    parser.add_argument('--output', default=None,
+                        help="Output file, with the suffix of --format (defaults to applicant_data)")
+    parser.add_argument('--since', metavar='INDEX', default=None,
+                        help="Entry index file of earlier runs: skip their entries, stop at the first "
+                             "page holding only those, and append to the (NDJSON) output")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Crawl and clean, but write no output and leave the index unchanged")
+    parser.add_argument('--base-url', default='https://www.thegradcafe.com', help="Site to crawl")
+    args = parser.parse_args()
 
-# Save the cleaned and structured data to a file or database
-save_data(structured_data)
+    # The writer is chosen by the file name, so the name must agree with the format
+    if args.output is None:
+        args.format = args.format or ('ndjson' if args.since else 'json')
+        args.output = 'applicant_data' + FORMATS[args.format]
+    else:
+        named = next((name for name, suffix in FORMATS.items() if args.output.endswith(suffix)), None)
+        if named is None:
+            parser.error(f"--output must end with one of {', '.join(FORMATS.values())}")
+        if args.format not in (None, named):
+            parser.error(f"--output {args.output} does not end with {FORMATS[args.format]}, "
+                         f"the suffix of --format {args.format}")
+        args.format = named
 
-# Load the cleaned and saved GradCafe data for further analysis or processing
-gradcafe_data = load_data()
\ No newline at end of file
+    # Incremental runs append to the output of earlier ones, which only NDJSON allows
+    if args.since and args.format not in ('ndjson', 'ndjson.gz'):
+        parser.error(f"--since appends to the output, so it needs an NDJSON format, not {args.format}")
+    return args
+
+def main():
+    """Runs the crawl pipeline as configured on the command line and prints its summary."""
+    args     = parse_args()
+    output   = args.output
+    index    = EntryIndex(args.since) if args.since else None
+    scraper  = GradCafeScraper(base_url=args.base_url, concurrency=args.concurrency, parser=args.parser,
+                               parse_workers=args.parse_workers, requests_per_second=args.rate)
+
+    # Fetch, parse, clean and save pages in overlapping stages joined by bounded queues,
+    # mapping universities and programs to canonical IDs along the way
+    pipeline = Pipeline(scraper, output, queue_size=args.queue_size, index=index, canonical=Canonicalizer(),
+                        incremental=index is not None, append=index is not None, dry_run=args.dry_run)
+    start    = time.perf_counter()
+
+    def show_progress(p):
+        """Rewrites the progress line on stderr with the throughput so far."""
+        elapsed = time.perf_counter() - start
+        pages   = p.stats[0].items
+        rows    = p.stats[-1].items
+        sys.stderr.write(f"\r{pages}/{args.pages} pages  {pages / elapsed:7.1f} pages/s  "
+                         f"{rows / elapsed:8.1f} rows/s  {format_bytes(scraper.metrics_summary()['bytes']):>10}")
+        sys.stderr.flush()
+
+    try:
+        pipeline.run(args.pages + 1, progress=show_progress, interval=0.5)
+    except OSError as e:
+        # After a failed fetch or write neither the output nor the index was changed
+        sys.exit(f"Run failed, {output} was left unchanged: {e}")
+    finally:
+        sys.stderr.write("\n")
+        if index is not None:
+            index.close()
+
+    elapsed = time.perf_counter() - start
+    pages   = pipeline.stats[0].items
+    rows    = pipeline.stats[-1].items
+    metrics = scraper.metrics_summary()
+    target  = ("dry run, nothing was written" if args.dry_run else
+               f"appended to {output}" if index is not None else f"saved to {output}")
+
+    print(f"Pages:    {pages} ({pages / elapsed:.1f} pages/s)")
+    print(f"Records:  {rows} ({rows / elapsed:.1f} rows/s), {target}")
+    print(f"Received: {format_bytes(metrics['bytes'])} in {metrics['requests']} requests "
+          f"({metrics['retries']} retries)")
+    print(f"Elapsed:  {elapsed:.2f} s")
+    if index is not None:
+        print(f"Caught up with earlier runs: {'yes' if pipeline.caught_up else 'no'}")
+
+    # Show where the time went: per-stage work, waiting for input, and backpressure
+    print(pipeline.report())
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,35 @@
+from collections import deque
+
+def ordered_map(executor, function, items, window):
+    """
+    Runs a function on every item in an executor and yields the results in item order.
+
+    Items are submitted as they are read, but at most `window` of them ahead of the consumer,
+    so the workers stay busy without letting unconsumed results pile up. The executor is shut
+    down when the generator finishes, fails or is closed, cancelling the calls not yet started.
+
+    Args:
+        executor (concurrent.futures.Executor): The thread or process pool to run the calls in.
+        function (callable): Called with one item at a time (picklable for a process pool).
+        items (iterable):    The inputs, read lazily.
+        window (int):        Largest number of calls submitted but not yet yielded.
+
+    Yields:
+        The result of each call, in the order of the items.
+    """
+
+    pending = deque()
+
+    try:
+        for item in items:
+            pending.append(executor.submit(function, item))
+
+            # Once the window is full, wait for the oldest result before submitting more
+            if len(pending) >= window:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+    finally:
+        executor.shutdown(cancel_futures=True)
@@ -0,0 +1,328 @@
+import queue
+import threading
+import time
+from clean import clean_entries, compact_row, is_ndjson, write_data
+from entry_index import entry_id
+
+# Marks the end of a stage's output
+DONE = object()
+
+class StageStats:
+    """
+    Timing and queue measurements of one pipeline stage.
+
+    Attributes:
+        name (str):         Stage name.
+        items (int):        Items the stage put on its output queue (or wrote, for the last stage).
+        seconds (float):    Wall time from the stage's start to its end.
+        wait_in (float):    Seconds spent waiting for input, i.e. starved by the stage before it.
+        wait_out (float):   Seconds spent blocked on a full output queue, i.e. backpressure.
+        max_depth (int):    Largest number of items seen waiting in the output queue.
+        depth_total (int):  Sum of the output queue depths sampled at every put.
+    """
+
+    def __init__(self, name):
+        self.name        = name
+        self.items       = 0
+        self.seconds     = 0.0
+        self.wait_in     = 0.0
+        self.wait_out    = 0.0
+        self.max_depth   = 0
+        self.depth_total = 0
+
+    @property
+    def busy(self):
+        """Seconds the stage spent doing its own work."""
+        return max(self.seconds - self.wait_in - self.wait_out, 0.0)
+
+    @property
+    def mean_depth(self):
+        """Average output queue depth at the time of a put."""
+        return self.depth_total / self.items if self.items else 0.0
+
+    def as_dict(self):
+        """Returns the measurements as a plain dictionary, e.g. for JSON reports."""
+        return {"stage": self.name, "items": self.items, "seconds": self.seconds, "busy": self.busy,
+                "wait_in": self.wait_in, "wait_out": self.wait_out,
+                "max_depth": self.max_depth, "mean_depth": self.mean_depth}
+
+class _Stopped(Exception):
+    """Raised inside a stage when another stage failed and the pipeline is shutting down."""
+
+class Pipeline:
+    """
+    Runs fetch, parse, clean and write as concurrent stages joined by bounded queues.
+
+    Each stage runs in its own thread and hands its output to the next one through a queue of
+    at most `queue_size` items, so a slow stage makes the faster ones before it wait instead of
+    piling up pages in memory. While one page is being fetched, the previous ones are parsed,
+    cleaned and written, and the end-to-end time approaches that of the slowest stage rather
+    than the sum of all of them. The fetch and parse stages reuse the scraper's concurrency and
+    parse worker settings.
+
+    Entries are cleaned page by page, as in `clean_pages`, and written as soon as their page is
+    cleaned. An entry listed on several pages is therefore written once, with the values of its
+    first occurrence. This differs from `clean_data` and `clean_pages`, which keep the values of
+    its last occurrence, but a written record can't be taken back. Within a page the stages use
+    `clean_entries`, so everything else matches.
+
+    With an index and `incremental`, the run is a "since last run" crawl: survey pages list the
+    newest entries first, so no page is requested once a page whose entries are all indexed
+    has been cleaned. Only the pages already requested or queued before the clean stage at
+    that point are fetched in vain. With `append`, each run adds its records to the end of the
+    same NDJSON file instead of replacing the previous run's.
+
+    The records go to a side file that replaces (or is appended to) the output file once all
+    of them are written, and only then is the index updated. A failed run therefore leaves
+    both as they were, and the next run fetches the same entries again. For the same reason
+    an interrupted run can't be resumed: none of its entries are indexed, so the next run
+    starts over from page 1, even when it was the first crawl. A dry run goes through every
+    stage but neither writes the output nor updates the index.
+
+    Attributes:
+        scraper (GradCafeScraper): The scraper pages are fetched and parsed with.
+        filename (str):            Output file, in any format `write_data` supports.
+        queue_size (int):          Capacity of every queue between two stages.
+        index (EntryIndex):        Entries processed by earlier runs, to skip, or None.
+        canonical (Canonicalizer): Assigns university and program IDs, or None.
+        incremental (bool):        Whether fetching stops at the first fully indexed page.
+        append (bool):             Whether records are added to the end of an NDJSON output.
+        dry_run (bool):            Whether output and index are left untouched.
+        caught_up (bool):          Whether an incremental run reached the entries of earlier runs.
+        stats (list[StageStats]):  Measurements of each stage, in pipeline order.
+    """
+
+    STAGES = ('fetch', 'parse', 'clean', 'write')
+
+    def __init__(self, scraper, filename='applicant_data.ndjson', queue_size=8, index=None, canonical=None,
+                 incremental=False, append=False, dry_run=False):
+        """
+        Configures the pipeline.
+
+        Args:
+            scraper (GradCafeScraper): The scraper pages are fetched and parsed with.
+            filename (str):            Output file, in any format `write_data` supports.
+            queue_size (int):          Capacity of every queue between two stages.
+            index (EntryIndex):        Entries processed by earlier runs, to skip (optional).
+            canonical (Canonicalizer): Assigns university and program IDs (optional).
+            incremental (bool):        Stop fetching at the first page whose entries are all in
+                                       the index.
+            append (bool):             Add the records to the end of the NDJSON output file
+                                       instead of replacing it, e.g. for incremental runs.
+            dry_run (bool):            Run every stage, but write nothing and leave the index as is.
+
+        Raises:
+            ValueError: If queue_size is smaller than 1, incremental is requested without an index,
+                        append without an NDJSON output, or the scraper uses a checkpoint, which
+                        needs the pages in lockstep with their consumer (use an index instead).
+        """
+
+        if queue_size < 1:
+            raise ValueError(f"queue_size must be at least 1, got {queue_size}")
+        if scraper.checkpoint is not None:
+            raise ValueError("the pipeline does not support checkpoints - pass an EntryIndex instead")
+        if incremental and index is None:
+            raise ValueError("incremental runs require an EntryIndex")
+        if append and not is_ndjson(filename):
+            raise ValueError(f"only NDJSON output can be appended to, not {filename}")
+
+        self.scraper     = scraper
+        self.filename    = filename
+        self.queue_size  = queue_size
+        self.index       = index
+        self.canonical   = canonical
+        self.incremental = incremental
+        self.append      = append
+        self.dry_run     = dry_run
+        self.stats       = [StageStats(name) for name in self.STAGES]
+        self._queues     = [queue.Queue(maxsize=queue_size) for _ in self.STAGES[:-1]]
+        self._stop       = threading.Event()
+        self._caught_up  = threading.Event()
+        self._errors     = []
+
+    @property
+    def caught_up(self):
+        """Whether an incremental run reached a page holding only entries of earlier runs."""
+        return self._caught_up.is_set()
+
+    def queue_depths(self):
+        """Returns the number of items currently waiting between each pair of stages."""
+        return [q.qsize() for q in self._queues]
+
+    def _put(self, stats, out, item):
+        """Puts an item on a stage's output queue, blocking while it is full."""
+        start = time.perf_counter()
+        while True:
+            try:
+                out.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                if self._stop.is_set():
+                    raise _Stopped() from None
+
+        stats.wait_out += time.perf_counter() - start
+        if item is not DONE:
+            depth            = out.qsize()
+            stats.items     += 1
+            stats.max_depth  = max(stats.max_depth, depth)
+            stats.depth_total += depth
+
+    def _drain(self, stats, source):
+        """Yields the items of a stage's input queue until the previous stage is done."""
+        while True:
+            start = time.perf_counter()
+            while True:
+                try:
+                    item = source.get(timeout=0.1)
+                    break
+                except queue.Empty:
+                    if self._stop.is_set():
+                        raise _Stopped() from None
+            stats.wait_in += time.perf_counter() - start
+
+            if item is DONE:
+                # The stage before ended because another one failed, so the input is incomplete
+                if self._stop.is_set():
+                    raise _Stopped()
+                return
+            yield item
+
+    def _fetch(self, stats, pages, out):
+        """Fetch stage: downloads the survey pages, archiving them if the scraper has an archive."""
+        def page_nums():
+            for num in pages:
+                # The clean stage found a page of known entries, so older pages are known as well
+                if self._caught_up.is_set():
+                    return
+                yield num
+
+        # The scraper takes the next page number just before requesting the page
+        htmls = self.scraper.fetch_pages(page_nums())
+        if self.scraper.archive is not None:
+            htmls = self.scraper.archive_pages(pages, htmls)
+
+        for html in htmls:
+            # Pages requested before the clean stage caught up hold known entries as well
+            if self._caught_up.is_set():
+                break
+            self._put(stats, out, html)
+
+    def _parse(self, stats, source, out):
+        """Parse stage: turns each page into RowData tuples and releases its tree."""
+        for rows, _, soup in self.scraper.parse_pages(self._drain(stats, source)):
+            if soup is not None:
+                rows = [compact_row(row) for row in rows]
+                for element in list(soup.contents):
+                    element.decompose()
+            self._put(stats, out, rows)
+
+    def _clean(self, stats, source, out):
+        """Clean stage: cleans each page, leaving out entries already written or indexed."""
+        written = set()
+        for rows in self._drain(stats, source):
+            page_data = clean_entries(rows, self.scraper.base_url, canonical=self.canonical)
+            records   = [data for entry_num, data in page_data.items()
+                         if entry_num not in written and (self.index is None or entry_num not in self.index)]
+
+            # The index only holds entries of earlier runs until this run's output is written
+            if self.incremental and page_data and all(entry_num in self.index for entry_num in page_data):
+                self._caught_up.set()
+
+            written.update(page_data)
+            self._put(stats, out, records)
+
+    def _write(self, stats, source, out):
+        """Write stage: streams the records to the output file, then indexes their entries."""
+        entries = []
+
+        def records():
+            for page in self._drain(stats, source):
+                stats.items += len(page)
+                entries.extend(entry_id(record) for record in page)
+                yield from page
+
+        if self.dry_run:
+            for _ in records():
+                pass
+            return
+
+        # The indented JSON format is written in one go, the other formats as records arrive
+        data = records()
+        if str(self.filename).endswith('.json'):
+            data = list(data)
+        write_data(data, self.filename, append=self.append)
+
+        # Only entries whose records were written count as processed
+        if self.index is not None:
+            self.index.add_many(entry for entry in entries if entry is not None)
+
+    def _run_stage(self, stats, target, source, out):
+        """Runs a stage, always signalling the end of its output and recording any failure."""
+        start = time.perf_counter()
+        try:
+            target(stats, source, out)
+        except _Stopped:
+            pass
+        except Exception as e: # pylint: disable=broad-exception-caught
+            self._errors.append(e)
+            self._stop.set()
+        finally:
+            stats.seconds = time.perf_counter() - start
+
+        if out is not None:
+            try:
+                self._put(stats, out, DONE)
+            except _Stopped:
+                pass
+
+    def run(self, page_num, progress=None, interval=1.0):
+        """
+        Scrapes, cleans and writes survey pages 1 to page_num - 1.
+
+        Args:
+            page_num (int):      The number of pages to scrape (starts from page 1 up to page_num - 1).
+            progress (callable): Called with the pipeline every `interval` seconds while it runs.
+            interval (float):    Seconds between two progress calls.
+
+        Returns:
+            list[StageStats]: The measurements of each stage.
+
+        Raises:
+            PermissionError: If access to the target page is disallowed by robots.txt.
+            ConnectionError: If any page fails to load.
+            OSError:         If the output can't be written. The index is then left unchanged.
+        """
+
+        self.scraper.check_permissions()
+
+        fetched, parsed, cleaned = self._queues
+        fetch, parse, clean, write = self.stats
+        threads = [threading.Thread(target=self._run_stage, args=args, name=f'pipeline-{args[0].name}')
+                   for args in ((fetch, self._fetch, range(1, page_num), fetched),
+                                (parse, self._parse, fetched,            parsed),
+                                (clean, self._clean, parsed,             cleaned),
+                                (write, self._write, cleaned,            None))]
+
+        for thread in threads:
+            thread.start()
+
+        while threads[-1].is_alive():
+            threads[-1].join(interval)
+            if progress is not None and threads[-1].is_alive():
+                progress(self)
+
+        for thread in threads:
+            thread.join()
+
+        if self._errors:
+            raise self._errors[0]
+        return self.stats
+
+    def report(self):
+        """Formats the stage measurements as an aligned table."""
+        header = f"{'stage':<8}{'items':>8}{'busy s':>9}{'starved s':>11}{'blocked s':>11}{'max queue':>11}{'avg queue':>11}"
+        lines  = [header, "-" * len(header)]
+        for s in self.stats:
+            lines.append(f"{s.name:<8}{s.items:>8}{s.busy:>9.2f}{s.wait_in:>11.2f}{s.wait_out:>11.2f}"
+                         f"{s.max_depth:>11}{s.mean_depth:>11.1f}")
+        return "\n".join(lines)
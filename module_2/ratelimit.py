@@ -0,0 +1,55 @@
+import threading
+import time
+
+class TokenBucket:
+    """
+    A thread-safe token bucket limiting how many requests are sent per second.
+
+    Each request takes one token and tokens refill at `rate` per second, up to `capacity`.
+    Callers reserve their token under a lock and sleep outside it, so concurrent fetch
+    threads are spaced out evenly instead of waking up together.
+
+    Attributes:
+        rate (float):   Tokens added per second, or None for no limit.
+        capacity (int): Maximum number of tokens, i.e. the largest allowed burst.
+    """
+
+    def __init__(self, rate=None, capacity=1):
+        """
+        Initializes a full bucket.
+
+        Args:
+            rate (float):   Requests allowed per second, or None for no limit.
+            capacity (int): Largest burst of back-to-back requests.
+        """
+
+        self.rate      = rate
+        self.capacity  = capacity
+        self._tokens   = capacity
+        self._updated  = time.monotonic()
+        self._lock     = threading.Lock()
+
+    def acquire(self):
+        """
+        Takes one token, sleeping until it becomes available.
+
+        Returns:
+            float: The number of seconds spent waiting.
+        """
+
+        if self.rate is None:
+            return 0.0
+
+        with self._lock:
+            # Refill for the time elapsed since the last request
+            now           = time.monotonic()
+            self._tokens  = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            # Reserve a token, going into debt if none is left
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait:
+            time.sleep(wait)
+        return wait
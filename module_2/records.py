@@ -0,0 +1,134 @@
+import re
+from dataclasses import dataclass, fields
+from datetime import date, datetime
+from functools import lru_cache
+
+# Format of the 'Added On' column, e.g. 'March 31, 2025'
+DATE_ADDED_FORMAT = '%B %d, %Y'
+
+# Seasons in calendar order. A term's ordinal is year * 10 + season number, e.g. Fall 2025 -> 20254
+SEASONS = ('winter', 'spring', 'summer', 'fall')
+TERM    = re.compile(r'\b(winter|spring|summer|fall)\s+(\d{4})\b', re.IGNORECASE)
+
+# Only a few hundred distinct dates and terms appear in a crawl, so both parsers are memoized
+@lru_cache(maxsize=4096)
+def parse_date_added(text):
+    """
+    Convert the site's 'Added On' display string into a date.
+
+    Returns None if the text is not in the expected format.
+    """
+    try:
+        return datetime.strptime(text.strip(), DATE_ADDED_FORMAT).date()
+    except ValueError:
+        return None
+
+@lru_cache(maxsize=1024)
+def parse_term(text):
+    """
+    Convert a term such as 'Fall 2025' into a sortable (year, season) tuple, e.g. (2025, 4).
+
+    Seasons are numbered in calendar order from 1 (Winter) to 4 (Fall), case is ignored.
+    Returns None if the text names no season and year.
+    """
+    match = TERM.search(text)
+    if not match:
+        return None
+    return int(match.group(2)), SEASONS.index(match.group(1).lower()) + 1
+
+def term_ordinal(text):
+    """Convert a term into a single integer, year * 10 + season, so ranges are integer comparisons."""
+    term = parse_term(text) if text is not None else None
+    return term[0] * 10 + term[1] if term else None
+
+def _to_date(value):
+    """Convert an ISO or display date string to a date, leaving dates and None untouched."""
+    if value is None or isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return parse_date_added(value)
+
+# Fields whose JSON key differs from the attribute name
+JSON_KEYS = {"gpa": "GPA", "gre": "GRE", "gre_v": "GRE_V", "gre_aw": "GRE_AW"}
+
+# Conversion applied to each typed field, keyed by attribute name
+CONVERTERS = {"date_added": _to_date, "gpa": float, "gre": int, "gre_v": int, "gre_aw": float,
+              "term_ordinal": int}
+
+@dataclass(slots=True)
+class ApplicantRecord:
+    """
+    A single cleaned GradCafe applicant entry.
+
+    Scores and dates are converted once, when the entry is parsed, instead of being carried
+    around as strings. `to_dict` produces the same keys, in the same order, as the JSON files
+    written by earlier versions of the cleaner, followed by `term_ordinal` (the term as a
+    sortable integer, see `term_ordinal`) whenever a term is known. The canonical university
+    and program IDs are only set when cleaning with a Canonicalizer, and come last.
+    """
+
+    program: str
+    date_added: date | None
+    url: str
+    status: str
+    degree: str | None = None
+    term: str | None = None
+    us_or_international: str | None = None
+    gpa: float | None = None
+    gre: int | None = None
+    gre_v: int | None = None
+    gre_aw: float | None = None
+    comment: str | None = None
+    term_ordinal: int | None = None
+    university_id: str | None = None
+    program_id: str | None = None
+
+    def __post_init__(self):
+        """Convert typed fields given as strings (e.g. loaded from older JSON files)."""
+        for name, convert in CONVERTERS.items():
+            value = getattr(self, name)
+            if isinstance(value, str):
+                setattr(self, name, convert(value))
+
+        # Records saved before term ordinals existed only have the term text
+        if self.term_ordinal is None:
+            self.term_ordinal = term_ordinal(self.term)
+
+    def update(self, values):
+        """
+        Set fields from a dictionary keyed like the JSON output, converting their values.
+
+        This mirrors dict.update, so parse_detail can fill in either a dict or a record.
+        """
+        for key, value in values.items():
+            name = key.lower() if key in JSON_KEYS.values() else key
+            if name in CONVERTERS and value is not None:
+                value = CONVERTERS[name](value)
+            setattr(self, name, value)
+
+            # Keep the ordinal in step with the term text
+            if name == "term":
+                self.term_ordinal = term_ordinal(value)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from a dictionary in the JSON shape."""
+        return cls(**{field.name: data.get(JSON_KEYS.get(field.name, field.name))
+                      for field in fields(cls)})
+
+    def to_dict(self):
+        """
+        Serialize the record to the JSON shape: missing fields are left out and the date
+        is written in ISO format.
+        """
+        data = {}
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if value is None:
+                continue
+            if isinstance(value, date):
+                value = value.isoformat()
+            data[JSON_KEYS.get(field.name, field.name)] = value
+        return data
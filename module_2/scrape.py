@@ -1,7 +1,89 @@
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 import urllib3
 from urllib3.exceptions import HTTPError
 from urllib import robotparser
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.builder import builder_registry
+from clean import compact_row
+from parallel import ordered_map
+from ratelimit import TokenBucket
+
+# Parser backends selectable with GradCafeScraper(parser=...), as (tree builder, parse_only).
+# The strainer variants only build the <tr> elements, skipping the rest of the page.
+PARSERS = {
+    'html.parser':   ('html.parser', None),
+    'strainer':      ('html.parser', SoupStrainer('tr')),
+    'lxml':          ('lxml', None),
+    'lxml-strainer': ('lxml', SoupStrainer('tr')),
+}
+
+def parse_page(html, parser='html.parser'):
+    """
+    Parses a survey page with the chosen parser backend.
+
+    Every backend yields the same table rows, and therefore the same records from `clean_data`.
+
+    Args:
+        html (str):   The HTML content of a survey page.
+        parser (str): A key of PARSERS.
+
+    Returns:
+        BeautifulSoup: The parsed page (only its table rows for the strainer backends).
+    """
+
+    features, parse_only = PARSERS[parser]
+    return BeautifulSoup(html, features, parse_only=parse_only)
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Measurements of a single network request, collected in GradCafeScraper.metrics
+#   latency: seconds spent in the request, retries and backoff included
+#   wait:    seconds spent waiting for the rate limiter beforehand
+#   bytes:   size of the response body
+RequestMetrics = namedtuple('RequestMetrics', ['url', 'status', 'latency', 'wait', 'retries', 'bytes'])
+
+# Links to individual results look like '/result/986543'
+RESULT_HREF = re.compile(r'/result/(\d+)')
+
+def entry_ids(soup):
+    """
+    Collects the GradCafe entry IDs linked from a parsed page.
+
+    Args:
+        soup (BeautifulSoup): A parsed survey page.
+
+    Returns:
+        set[str]: The entry numbers of all '/result/<id>' links on the page.
+    """
+
+    ids = set()
+    for link in soup.find_all('a', href=RESULT_HREF):
+        ids.add(RESULT_HREF.search(link['href']).group(1))
+    return ids
+
+def parse_rows(html, parser='html.parser'):
+    """
+    Parses a survey page into compact, picklable rows.
+
+    This is the unit of work of the parse worker processes: the page tree never leaves the
+    worker, only plain RowData tuples and entry IDs are sent back.
+
+    Args:
+        html (str):   The HTML content of a survey page.
+        parser (str): A key of PARSERS.
+
+    Returns:
+        tuple[list[RowData], set[str]]: The page's rows and the entry IDs linked from it.
+    """
+
+    soup = parse_page(html, parser)
+    rows = [compact_row(row) for row in soup.find_all('tr')]
+    return rows, entry_ids(soup)
 
 class GradCafeScraper:
     """
@@ -11,85 +93,449 @@ class GradCafeScraper:
         base_url (str):   The root URL of the website to scrape.
         path (str):       The path on the website to the survey data.
         user_agent (str): Identifier used for checking access permissions in robots.txt.
-        http (urllib3.PoolManager): HTTP connection manager for sending requests.
+        concurrency (int): Maximum number of survey pages fetched at the same time.
+        checkpoint (ScrapeCheckpoint): Store of seen entry IDs enabling "since last run" crawls, or None.
+        cache (ResponseCache): On-disk response cache used for conditional requests, or None.
+        archive (PageArchive): Archive every fetched survey page is appended to, or None.
+        offline (bool):    Whether responses are served from the cache only, without any network access.
+        parser (str):      The parser backend used for survey pages (a key of PARSERS).
+        parse_workers (int): Number of worker processes parsing pages (0 parses in the calling thread).
+        requests_per_second (float): Configured request budget, or None for no budget of our own.
+        robots_ttl (float): Seconds a downloaded robots.txt is trusted before it is fetched again.
+        limiter (TokenBucket): Rate limiter shared by all requests, honouring robots.txt crawl delays.
+        http (urllib3.PoolManager): HTTP connection manager for sending requests, with retries and timeouts.
+        metrics (list[RequestMetrics]): One entry per network request sent so far.
     """
 
-    def __init__(self, base_url='https://www.thegradcafe.com', path='/survey', user_agent='natali'):
+    def __init__(self, base_url='https://www.thegradcafe.com', path='/survey', user_agent='natali',
+                 concurrency=1, checkpoint=None, cache=None, offline=False, parser='html.parser',
+                 parse_workers=0, requests_per_second=None, robots_ttl=3600, retries=3,
+                 backoff_factor=0.5, backoff_jitter=0.25, connect_timeout=5.0, read_timeout=30.0,
+                 pool_maxsize=None, pool_block=False, archive=None):
         """
-        Initializes the GradCafeScraper with optional base URL, path, and user-agent.
+        Initializes the GradCafeScraper with optional base URL, path, user-agent and concurrency.
   
         Args:
-            base_url (str):   Base URL of the target website.
-            path (str):       Path to the specific survey page.
-            user_agent (str): User agent string for robots.txt compliance.
+            base_url (str):    Base URL of the target website.
+            path (str):        Path to the specific survey page.
+            user_agent (str):  User agent string for robots.txt compliance.
+            concurrency (int): Number of pages requested in parallel (1 fetches pages one by one).
+            checkpoint (ScrapeCheckpoint): When given, only scrape results added since the last run
+                                           and resume interrupted crawls (see `_iter_parsed`).
+            cache (ResponseCache): When given, responses are stored on disk and re-crawls send
+                                   conditional requests (see `_get`).
+            offline (bool):    Serve every request from the cache and never touch the network.
+            parser (str):      Parser backend for survey pages: 'html.parser' (default), 'strainer'
+                               (html.parser building only table rows), 'lxml' or 'lxml-strainer'.
+            parse_workers (int): When greater than 0, pages are parsed by a pool of this many worker
+                                 processes while fetching continues, and rows come back as RowData.
+            requests_per_second (float): Upper bound on the request rate. The rate allowed by the
+                                         site's Crawl-delay / Request-rate applies when it is lower.
+            robots_ttl (float): How long, in seconds, to reuse robots.txt before downloading it again.
+            retries (int):     How many times a failed request (connection error, timeout or a
+                               429/5xx status) is retried before the crawl gives up.
+            backoff_factor (float): Base of the exponential backoff between retries, in seconds.
+            backoff_jitter (float): Maximum random delay, in seconds, added to each backoff.
+            connect_timeout (float): Seconds allowed for establishing a connection.
+            read_timeout (float): Seconds allowed between bytes of the response.
+            pool_maxsize (int): Connections kept open per host (defaults to concurrency).
+            pool_block (bool): Whether requests wait for a free pooled connection rather than
+                               opening extra, non-reused ones.
+            archive (PageArchive): When given, the raw HTML of every survey page is archived in
+                                   page order, so the crawl can later be replayed offline.
+
+        Raises:
+            ValueError: If concurrency is smaller than 1, parse_workers is negative, offline mode is
+                        requested without a cache, or the parser backend is unknown or not installed.
+        """
+
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        if parse_workers < 0:
+            raise ValueError(f"parse_workers cannot be negative, got {parse_workers}")
+        if offline and cache is None:
+            raise ValueError("offline mode requires a response cache")
+        if parser not in PARSERS:
+            raise ValueError(f"Unknown parser '{parser}', expected one of {sorted(PARSERS)}")
+        if builder_registry.lookup(PARSERS[parser][0]) is None:
+            raise ValueError(f"Parser '{parser}' is not available - install it with: pip install lxml")
+
+        self.base_url            = base_url
+        self.path                = path
+        self.user_agent          = user_agent
+        self.concurrency         = concurrency
+        self.checkpoint          = checkpoint
+        self.cache               = cache
+        self.archive             = archive
+        self.offline             = offline
+        self.parser              = parser
+        self.parse_workers       = parse_workers
+        self.requests_per_second = requests_per_second
+        self.robots_ttl          = robots_ttl
+        self.limiter             = TokenBucket(requests_per_second)
+        self.metrics             = []
+
+        # Retry transient failures with jittered exponential backoff
+        retry = urllib3.Retry(total=retries, backoff_factor=backoff_factor, backoff_jitter=backoff_jitter,
+                              status_forcelist=RETRY_STATUSES, allowed_methods={'GET'})
+
+        # By default keep one pooled connection per worker so parallel requests reuse their sockets
+        self.http = urllib3.PoolManager(maxsize=pool_maxsize or concurrency, block=pool_block, retries=retry,
+                                        timeout=urllib3.Timeout(connect=connect_timeout, read=read_timeout))
+
+        # Parsed robots.txt and the time.monotonic() after which it must be downloaded again
+        self._robots         = None
+        self._robots_expires = 0.0
+
+    def _get(self, url):
+        """
+        Requests a URL and returns the raw response body.
+
+        Without a cache this is a plain GET. With a cache, a previously stored response is
+        revalidated with If-None-Match / If-Modified-Since and reused when the server answers
+        304 Not Modified; new 200 responses are stored. In offline mode only the cache is used.
+
+        Args:
+            url (str): The URL to request.
+
+        Returns:
+            bytes: The response body.
+
+        Raises:
+            ConnectionError: If the request fails, or the URL is not cached in offline mode.
+        """
+
+        cached = self.cache.get(url) if self.cache is not None else None
+
+        if self.offline:
+            if cached is None:
+                raise ConnectionError(f"{url} is not in the response cache and the scraper is offline")
+            return cached.body
+
+        # Ask the server to skip the body if our stored copy is still current
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+
+        # Wait for our turn under the crawl-delay / request budget
+        wait  = self.limiter.acquire()
+        start = time.perf_counter()
+
+        try:
+            response = self.http.request('GET', url, headers=headers)
+
+        except HTTPError as e:
+            # Raise an error if connection fails even after retrying
+            raise ConnectionError(f"Failed to connect to {url}: {e}")
+
+        retried = len(response.retries.history) if response.retries else 0
+        self.metrics.append(RequestMetrics(url, response.status, time.perf_counter() - start,
+                                           wait, retried, len(response.data)))
+
+        if response.status == 304 and cached is not None:
+            return cached.body
+
+        if self.cache is not None and response.status == 200:
+            self.cache.put(url, response.data,
+                           response.headers.get('ETag'), response.headers.get('Last-Modified'))
+
+        return response.data
+
+    def metrics_summary(self):
+        """
+        Aggregates the per-request metrics collected so far.
+
+        Returns:
+            dict: Request count, retries, bytes received, and total / mean / max request latency
+                  and rate limiter wait, in seconds.
+        """
+
+        count   = len(self.metrics)
+        latency = [m.latency for m in self.metrics]
+
+        return {"requests":       count,
+                "retries":        sum(m.retries for m in self.metrics),
+                "bytes":          sum(m.bytes for m in self.metrics),
+                "latency_total":  sum(latency),
+                "latency_mean":   sum(latency) / count if count else 0.0,
+                "latency_max":    max(latency, default=0.0),
+                "wait_total":     sum(m.wait for m in self.metrics),
+                }
+
+    def _allowed_rate(self, parser):
+        """
+        Computes the request rate allowed by robots.txt and the configured budget.
+
+        Args:
+            parser (robotparser.RobotFileParser): The parsed robots.txt.
+
+        Returns:
+            float: The strictest of Crawl-delay, Request-rate and requests_per_second, in
+                   requests per second, or None if none of them is set.
         """
 
-        self.base_url   = base_url
-        self.path       = path
-        self.user_agent = user_agent
-        self.http       = urllib3.PoolManager()
+        rates = []
+
+        if self.requests_per_second:
+            rates.append(self.requests_per_second)
+
+        delay = parser.crawl_delay(self.user_agent)
+        if delay:
+            rates.append(1 / float(delay))
+
+        request_rate = parser.request_rate(self.user_agent)
+        if request_rate:
+            rates.append(request_rate.requests / request_rate.seconds)
+
+        return min(rates) if rates else None
 
-    def _check_permissions(self):
+    def check_permissions(self):
         """
         Checks if the scraper has permission to access the target page
         by reading and parsing the site's robots.txt file.
 
+        The parsed file is reused for `robots_ttl` seconds. Whenever it is (re)loaded, the rate
+        limiter is adjusted to the crawl delay it requests.
+
         Raises:
             ConnectionError: If the request to robots.txt fails.
             PermissionError: If the user-agent is not allowed to access the specified path.
         """
 
-        url = self.base_url + '/robots.txt'
+        if self._robots is None or time.monotonic() >= self._robots_expires:
+            url = self.base_url + '/robots.txt'
 
-        try:
             # Fetch and decode the robots.txt file from the website
-            response = self.http.request('GET', url)
-            txt      = response.data.decode('utf-8')
-
-        except HTTPError as e:
-            # Raise an error if connection fails
-            raise ConnectionError(f"Failed to connect to {url}: {e}")
+            txt = self._get(url).decode('utf-8')
         
-        # Parse robots.txt to check permissions
-        parser = robotparser.RobotFileParser()
-        parser.parse(txt.splitlines())
+            # Parse robots.txt to check permissions
+            parser = robotparser.RobotFileParser()
+            parser.parse(txt.splitlines())
+
+            self._robots         = parser
+            self._robots_expires = time.monotonic() + self.robots_ttl
+            self.limiter.rate    = self._allowed_rate(parser)
         
         # Verify that the user-agent is allowed to access the target path
-        allowed = parser.can_fetch(self.user_agent, self.base_url + self.path)
-        if not parser.can_fetch(self.user_agent, self.base_url + self.path):
+        if not self._robots.can_fetch(self.user_agent, self.base_url + self.path):
             raise PermissionError(f"Access to '{self.base_url + self.path}' is disallowed for user-agent '{self.user_agent}'.")
 
+    def _page_url(self, num):
+        """Builds the URL of the survey page with the given number."""
+        return self.base_url + self.path + '/index.php?q=&page=' + str(num)
+
+    def _fetch_page(self, num):
+        """
+        Requests a single survey page and returns its decoded HTML.
+
+        Args:
+            num (int): The survey page number.
+
+        Returns:
+            str: The HTML content of the page.
+
+        Raises:
+            ConnectionError: If the page fails to load.
+        """
+
+        # Request and decode the HTML content of the page
+        return self._get(self._page_url(num)).decode('utf-8')
+
+    def fetch_pages(self, page_nums):
+        """
+        Fetches survey pages and yields their HTML in page order.
+
+        With a concurrency of 1 the pages are requested one after another. Otherwise up to
+        `concurrency` requests are kept in flight by a thread pool, while the pages are still
+        handed out in the order they were requested.
+
+        Args:
+            page_nums (iterable[int]): The page numbers to fetch.
+
+        Yields:
+            str: The HTML content of each page.
+        """
+
+        if self.concurrency == 1:
+            for num in page_nums:
+                yield self._fetch_page(num)
+            return
+
+        yield from ordered_map(ThreadPoolExecutor(max_workers=self.concurrency), self._fetch_page,
+                               page_nums, self.concurrency)
+
+    def archive_pages(self, page_nums, htmls):
+        """
+        Passes fetched pages through, appending each one to the archive on the way.
+
+        Args:
+            page_nums (iterable[int]): The page numbers that were fetched.
+            htmls (iterable[str]):     The HTML content of each page, in page order.
+
+        Yields:
+            str: The HTML content of each page, unchanged.
+        """
+
+        for num, html in zip(page_nums, htmls):
+            self.archive.add(self._page_url(num), num, html)
+            yield html
+
+    def parse_pages(self, htmls):
+        """
+        Parses fetched pages and yields their rows in page order.
+
+        Without parse workers each page is parsed in the calling thread. Otherwise pages are
+        handed to a process pool as soon as they are fetched, so parsing runs on several cores
+        while the next requests are in flight, and up to twice as many pages as there are
+        workers are parsed ahead.
+
+        Args:
+            htmls (iterable[str]): The HTML content of each page, in page order.
+
+        Yields:
+            tuple: (rows, ids, soup) for each page, where rows are BeautifulSoup 'tr' elements
+                   and soup the page tree, or rows are RowData tuples and soup is None when
+                   parsed by the workers. ids is the set of entry IDs on the page, or None
+                   when the crawl has no checkpoint and nobody needs them.
+        """
+
+        if not self.parse_workers:
+            for html in htmls:
+                soup = parse_page(html, self.parser)
+                ids  = entry_ids(soup) if self.checkpoint is not None else None
+                yield soup.find_all('tr'), ids, soup
+            return
+
+        # Keep the workers busy, but don't let parsed pages pile up unconsumed
+        executor = ProcessPoolExecutor(max_workers=self.parse_workers)
+        for rows, ids in ordered_map(executor, partial(parse_rows, parser=self.parser), htmls,
+                                     2 * self.parse_workers):
+            yield rows, ids, None
+
+    def _iter_parsed(self, page_num):
+        """
+        Checks permissions, then fetches and parses survey pages 1 to page_num - 1 in order.
+
+        With a checkpoint, the crawl runs in "since last run" mode:
+          - it starts from the checkpoint's next page, so an interrupted crawl picks up after
+            the last page that was committed;
+          - it stops as soon as a page contains only entry IDs seen in earlier runs;
+          - each page is staged in the checkpoint as it is handed out, and only recorded once
+            the caller has saved the data and calls `checkpoint.commit()`.
+
+        Args:
+            page_num (int): The number of pages to scrape (starts from page 1 up to page_num - 1).
+
+        Yields:
+            tuple: (rows, soup) for each page, as described in `parse_pages`.
+        """
+
+        self.check_permissions()
+
+        # Pages staged by an earlier crawl that was never committed were not saved
+        if self.checkpoint is not None:
+            self.checkpoint.rollback()
+
+        start = self.checkpoint.next_page if self.checkpoint is not None else 1
+        pages = range(start, page_num)
+
+        htmls = self.fetch_pages(pages)
+        if self.archive is not None:
+            htmls = self.archive_pages(pages, htmls)
+
+        # Iterate through the specified number of pages
+        for num, (rows, ids, soup) in zip(pages, self.parse_pages(htmls)):
+            # Everything from here on was scraped by an earlier run
+            if self.checkpoint is not None and self.checkpoint.all_known(ids):
+                break
+
+            if self.checkpoint is not None:
+                self.checkpoint.stage_page(num, ids)
+
+            yield rows, soup
+
+        if self.checkpoint is not None:
+            self.checkpoint.finish()
+
+    def iter_pages(self, page_num):
+        """
+        Lazily scrapes survey pages, yielding the table rows of one page at a time.
+
+        Only a single page tree is kept alive: once the next page is requested, the previous
+        page is decomposed and its rows can no longer be used. Consumers such as `clean_data`
+        should therefore extract what they need from a page before moving on. With parse
+        workers the rows are self-contained RowData tuples instead.
+
+        Args:
+            page_num (int): The number of pages to scrape (starts from page 1 up to page_num - 1).
+
+        Yields:
+            list: The BeautifulSoup 'tr' (table row) elements, or RowData tuples, of a single page.
+
+        Raises:
+            PermissionError: If access to the target page is disallowed by robots.txt.
+            ConnectionError: If any page fails to load.
+        """
+
+        for rows, soup in self._iter_parsed(page_num):
+            yield rows
+
+            # The caller is done with this page - break the tree's parent/child
+            # reference cycles so its memory is released right away
+            if soup is not None:
+                for element in list(soup.contents):
+                    element.decompose()
+
+    def iter_rows(self, page_num):
+        """
+        Lazily scrapes survey pages, yielding table rows one at a time.
+
+        This is the streaming counterpart of `scrape_data` and can be passed straight to
+        `clean_data`. Rows are only valid until the rows of the following page are requested
+        (see `iter_pages`).
+
+        Args:
+            page_num (int): The number of pages to scrape (starts from page 1 up to page_num - 1).
+
+        Yields:
+            bs4.element.Tag: BeautifulSoup 'tr' (table row) elements, in page order (RowData
+                             tuples when parse workers are used).
+
+        Raises:
+            PermissionError: If access to the target page is disallowed by robots.txt.
+            ConnectionError: If any page fails to load.
+        """
+
+        for rows in self.iter_pages(page_num):
+            yield from rows
+
     def scrape_data(self, page_num):
         """
         Scrapes data from TheGradCafe survey pages up to the specified page number.
 
+        All rows are collected in memory, which keeps every parsed page alive. Prefer
+        `iter_rows` for large crawls. With a checkpoint, call `checkpoint.commit()` once the
+        cleaned data has been saved; until then a failed crawl or save loses no entries.
+
         Args:
             page_num (int): The number of pages to scrape (starts from page 1 up to page_num - 1).
 
         Returns:
-            list: A list of BeautifulSoup 'tr' (table row) elements containing the scraped data.
+            list: A list of BeautifulSoup 'tr' (table row) elements (RowData tuples when parse
+                  workers are used) containing the scraped data.
         
         Raises:
             PermissionError: If access to the target page is disallowed by robots.txt.
             ConnectionError: If any page fails to load.
         """
 
-        self._check_permissions()
-
         rows = []
 
-        # Iterate through the specified number of pages
-        for num in range(1, page_num):
-            url = self.base_url + self.path + '/index.php?q=&page=' + str(num)
-
-            # Request and decode the HTML content of the page
-            response = self.http.request('GET', url)
-            html     = response.data.decode('utf-8')
-
-            # Parse the HTML using BeautifulSoup
-            soup = BeautifulSoup(html, "html.parser")
-
+        for page_rows, _ in self._iter_parsed(page_num):
             # Collect all table rows - Each entry_num has 2 table rows that contain information.
-            rows.extend(soup.find_all('tr'))
+            rows.extend(page_rows)
 
-        return rows
\ No newline at end of file
+        return rows
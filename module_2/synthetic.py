@@ -0,0 +1,346 @@
+"""
+Synthetic GradCafe survey pages and applicant records for scale testing.
+
+The generator produces pages with the same markup as the live survey (see the recorded pages
+in ``Tests/fixtures``): a four-column main row per applicant with its result link, followed
+by a single-column detail row with term, origin, GPA and GRE scores, and sometimes a comment
+row. Pages are deterministic for a given seed and page number, so any page can be rebuilt
+without generating the ones before it, and `page_records` returns exactly the records
+`clean_data` extracts from `page_html`.
+
+Usage::
+
+    python synthetic.py pages --pages 500 --output synthetic_pages
+    python synthetic.py records --rows 1000000 --output synthetic.ndjson
+"""
+
+import argparse
+import random
+import shutil
+from datetime import date, timedelta
+from html import escape
+from pathlib import Path
+from clean import save_data
+from records import ApplicantRecord, term_ordinal
+
+UNIVERSITIES = [
+    "Johns Hopkins University", "JHU", "Stanford University", "Carnegie Mellon University",
+    "Massachusetts Institute of Technology (MIT)", "University of California, Berkeley (UCB)",
+    "University of Michigan - Ann Arbor", "Cornell University", "Columbia University",
+    "Princeton University", "Harvard University", "University of Washington",
+    "Georgia Institute of Technology", "University of Texas at Austin", "Duke University",
+    "University of Illinois Urbana-Champaign", "New York University", "Yale University",
+    "University of Toronto", "Northwestern University",
+]
+
+PROGRAMS = [
+    "Computer Science", "Electrical Engineering", "Mathematics", "Applied Mathematics",
+    "Statistics", "Data Science", "Machine Learning", "Physics", "Chemistry", "Economics",
+    "Mechanical Engineering", "Biomedical Engineering", "Public Health", "Psychology",
+]
+
+DECISIONS = ["Accepted", "Rejected", "Wait listed", "Interview"]
+
+COMMENTS = [
+    "Got the email this morning.", "Still waiting on funding details.", "Good luck everyone!",
+    "Decision came through the portal, no email.", "Very happy with this one.",
+    "Interview was about two weeks ago.", "Funded offer with a TA position.",
+    "Not surprised, the program is very competitive.",
+]
+
+# Markup of the survey table, copied from the live site
+PAGE_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Graduate Admissions Results | TheGradCafe</title>
+</head>
+<body>
+<div class="tw-overflow-hidden">
+<table class="tw-min-w-full tw-divide-y tw-divide-gray-300">
+<thead>
+<tr>
+<th scope="col">School</th>
+<th scope="col">Program</th>
+<th scope="col">Added On</th>
+<th scope="col">Decision</th>
+<th scope="col"><span class="tw-sr-only">Actions</span></th>
+</tr>
+</thead>
+<tbody class="tw-divide-y tw-divide-gray-200 tw-bg-white">
+"""
+
+PAGE_TAIL = """</tbody>
+</table>
+</div>
+</body>
+</html>
+"""
+
+MAIN_ROW = """<tr>
+<td class="tw-py-5 tw-pl-4 tw-pr-3 tw-text-sm sm:tw-pl-0">
+<div class="tw-flex tw-items-center">
+<div class="tw-font-medium tw-text-gray-900 tw-text-sm">{university}</div>
+</div>
+</td>
+<td class="tw-px-3 tw-py-5 tw-text-sm tw-text-gray-500">
+<div class="tw-text-gray-900">
+<span>{program}</span>
+<svg class="tw-inline tw-h-1.5 tw-w-1.5 tw-fill-current tw-mx-1" viewbox="0 0 2 2" aria-hidden="true">
+<circle cx="1" cy="1" r="1"></circle>
+</svg>
+<span class="tw-text-gray-500">{degree}</span>
+</div>
+</td>
+<td class="tw-px-3 tw-py-5 tw-text-sm tw-text-gray-500 tw-whitespace-nowrap tw-hidden md:tw-table-cell">{date_added}</td>
+<td class="tw-px-3 tw-py-5 tw-text-sm tw-text-gray-500">
+<div class="tw-inline-flex tw-items-center tw-rounded-md tw-bg-green-50 tw-px-2 tw-py-1 tw-text-xs tw-font-medium">{status}</div>
+</td>
+<td class="tw-relative tw-py-5 tw-pl-3 tw-pr-4 tw-text-right tw-text-sm tw-font-medium sm:tw-pr-0">
+<div class="tw-flex tw-gap-4 tw-justify-end">
+<a href="/result/{entry_id}" class="tw-text-gray-900 hover:tw-text-gray-600">See More</a>
+</div>
+</td>
+</tr>
+"""
+
+DETAIL_ROW = """<tr class="tw-border-none">
+<td colspan="3" class="tw-pb-5 tw-pl-4 tw-pr-3 tw-text-sm sm:tw-pl-0">
+<div class="tw-flex tw-gap-2 tw-flex-wrap">
+{badges}
+</div>
+</td>
+</tr>
+"""
+
+BADGE = '<div class="tw-inline-flex tw-items-center tw-rounded-md tw-bg-gray-100 tw-px-2 tw-py-1 tw-text-xs tw-font-medium tw-text-gray-900">{}</div>'
+
+COMMENT_ROW = """<tr class="tw-border-none">
+<td colspan="3" class="tw-pb-5 tw-pl-4 tw-pr-3 tw-text-sm sm:tw-pl-0">
+<p class="tw-text-gray-500 tw-text-sm tw-my-0">{comment}</p>
+</td>
+</tr>
+"""
+
+class SyntheticSurvey:
+    """
+    A deterministic source of synthetic survey pages and the records they clean to.
+
+    Entries are numbered across pages, newest first like the live survey: entry IDs count
+    down from `first_id` and the 'Added On' date moves one day back every `rows_per_day`
+    entries.
+
+    Attributes:
+        seed (int):          Seed of the page contents.
+        rows_per_page (int): Applicants listed per survey page.
+        rows_per_day (int):  Applicants added per day.
+        first_id (int):      Entry ID of the first applicant on page 1.
+        start_date (date):   'Added On' date of the first applicant.
+        base_url (str):      Root URL the records' result links are built on.
+    """
+
+    def __init__(self, seed=0, rows_per_page=20, rows_per_day=200, first_id=100_000_000,
+                 start_date=date(2025, 4, 1), base_url='https://www.thegradcafe.com'):
+        """
+        Configures the generator.
+
+        Args:
+            seed (int):          Seed of the page contents.
+            rows_per_page (int): Applicants listed per survey page.
+            rows_per_day (int):  Applicants added per day.
+            first_id (int):      Entry ID of the first applicant on page 1 (IDs count down).
+            start_date (date):   'Added On' date of the first applicant.
+            base_url (str):      Root URL the records' result links are built on.
+        """
+
+        self.seed          = seed
+        self.rows_per_page = rows_per_page
+        self.rows_per_day  = rows_per_day
+        self.first_id      = first_id
+        self.start_date    = start_date
+        self.base_url      = base_url
+
+    def _entries(self, page_num):
+        """
+        Draws the applicants listed on a page.
+
+        Args:
+            page_num (int): The survey page number, starting from 1.
+
+        Returns:
+            list[dict]: The fields of each applicant, as shown on the page.
+        """
+
+        rng     = random.Random(f'{self.seed}:{page_num}')
+        first   = (page_num - 1) * self.rows_per_page
+        entries = []
+
+        for index in range(first, first + self.rows_per_page):
+            added    = self.start_date - timedelta(days=index // self.rows_per_day)
+            decided  = added - timedelta(days=rng.randrange(7))
+            entry    = {"entry_id":   self.first_id - index,
+                        "university": rng.choice(UNIVERSITIES),
+                        "program":    rng.choice(PROGRAMS),
+                        "degree":     rng.choice(("Masters", "Masters", "PhD")),
+                        "date_added": added,
+                        "status":     f"{rng.choice(DECISIONS)} on {decided.day} {decided:%b}",
+                        "term":       f"{rng.choice(('Fall', 'Fall', 'Spring'))} {added.year + rng.randrange(2)}",
+                        "us_or_international": rng.choice(("International", "American"))}
+
+            # Scores and comments are optional, as on the live survey
+            if rng.random() < 0.8:
+                entry["gpa"] = f"{rng.uniform(2.8, 4.0):.2f}"
+            if rng.random() < 0.4:
+                entry["gre_v"] = rng.randrange(145, 171)
+                entry["gre"]   = entry["gre_v"] + rng.randrange(145, 171)
+                entry["gre_aw"] = rng.randrange(6, 13) / 2
+            if rng.random() < 0.3:
+                entry["comment"] = rng.choice(COMMENTS)
+            entries.append(entry)
+
+        return entries
+
+    def page_html(self, page_num):
+        """
+        Renders a survey page.
+
+        Args:
+            page_num (int): The survey page number, starting from 1.
+
+        Returns:
+            str: The HTML content of the page.
+        """
+
+        parts = [PAGE_HEAD]
+        for entry in self._entries(page_num):
+            added = entry["date_added"]
+            parts.append(MAIN_ROW.format(university = escape(entry["university"]),
+                                         program    = escape(entry["program"]),
+                                         degree     = entry["degree"],
+                                         date_added = f"{added:%B} {added.day}, {added.year}",
+                                         status     = entry["status"],
+                                         entry_id   = entry["entry_id"]))
+
+            badges = [entry["term"], entry["us_or_international"]]
+            if "gpa" in entry:
+                badges.append(f"GPA {entry['gpa']}")
+            if "gre" in entry:
+                badges += [f"GRE {entry['gre']}", f"GRE V {entry['gre_v']}", f"GRE AW {entry['gre_aw']}"]
+            parts.append(DETAIL_ROW.format(badges="\n".join(BADGE.format(badge) for badge in badges)))
+
+            if "comment" in entry:
+                parts.append(COMMENT_ROW.format(comment=escape(entry["comment"])))
+
+        parts.append(PAGE_TAIL)
+        return "".join(parts)
+
+    def page_records(self, page_num):
+        """
+        Builds the records `clean_data` extracts from a page, without rendering or parsing it.
+
+        Args:
+            page_num (int): The survey page number, starting from 1.
+
+        Returns:
+            list[ApplicantRecord]: One record per applicant on the page.
+        """
+
+        records = []
+        for entry in self._entries(page_num):
+            records.append(ApplicantRecord(
+                program             = f"{entry['program']}, {entry['university']}",
+                date_added          = entry["date_added"],
+                url                 = f"{self.base_url}/result/{entry['entry_id']}",
+                status              = entry["status"],
+                degree              = entry["degree"],
+                term                = entry["term"],
+                us_or_international = entry["us_or_international"],
+                gpa                 = float(entry["gpa"]) if "gpa" in entry else None,
+                gre                 = entry.get("gre"),
+                gre_v               = entry.get("gre_v"),
+                gre_aw              = entry.get("gre_aw"),
+                comment             = entry.get("comment"),
+                term_ordinal        = term_ordinal(entry["term"])))
+        return records
+
+    def iter_pages(self, pages):
+        """
+        Yields the HTML of survey pages 1 to `pages`.
+
+        Args:
+            pages (int): Number of pages to render.
+
+        Yields:
+            str: The HTML content of each page, in page order.
+        """
+        for page_num in range(1, pages + 1):
+            yield self.page_html(page_num)
+
+    def iter_records(self, rows):
+        """
+        Yields cleaned records, page after page, without rendering any HTML.
+
+        Args:
+            rows (int): Number of records to generate.
+
+        Yields:
+            ApplicantRecord: The records of pages 1, 2, ... up to `rows` records.
+        """
+
+        page_num = 1
+        while rows > 0:
+            records = self.page_records(page_num)[:rows]
+            yield from records
+            rows     -= len(records)
+            page_num += 1
+
+    def write_pages(self, directory, pages):
+        """
+        Writes survey pages in the layout of ``Tests/fixtures``, ready for `FixtureServer`.
+
+        Args:
+            directory (str): Destination directory; it is created if needed.
+            pages (int):     Number of pages to write.
+
+        Returns:
+            Path: The directory the pages were written to.
+        """
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        # The fixture server also answers robots.txt from the same directory
+        shutil.copy(Path(__file__).parent / 'Tests' / 'fixtures' / 'robots.txt', directory)
+
+        for page_num, html in enumerate(self.iter_pages(pages), start=1):
+            (directory / f'survey_page_{page_num}.html').write_text(html, encoding='utf-8')
+        return directory
+
+def main():
+    """Parses command-line arguments and writes the requested synthetic data."""
+    parser = argparse.ArgumentParser(description="Generate synthetic GradCafe pages or records.")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the generated contents")
+    kinds = parser.add_subparsers(dest='kind', required=True)
+
+    pages = kinds.add_parser('pages', help="Survey pages, served by Tests/fixture_server.py")
+    pages.add_argument('--pages', type=int, default=100, help="Number of survey pages")
+    pages.add_argument('--output', default='synthetic_pages', help="Directory to write the pages to")
+
+    records = kinds.add_parser('records', help="Cleaned records, in any format save_data supports")
+    records.add_argument('--rows', type=int, default=10000, help="Number of records")
+    records.add_argument('--output', default='synthetic.ndjson',
+                         help="File to write (.json, .ndjson, .ndjson.gz or a .columns directory)")
+
+    args   = parser.parse_args()
+    survey = SyntheticSurvey(seed=args.seed)
+
+    if args.kind == 'pages':
+        survey.write_pages(args.output, args.pages)
+        print(f"{args.pages} pages were written to {args.output}")
+    else:
+        data = survey.iter_records(args.rows)
+        # Only the indented JSON format needs every record in memory at once
+        save_data(data if not args.output.endswith('.json') else list(data), args.output)
+
+if __name__ == "__main__":
+    main()
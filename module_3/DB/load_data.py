@@ -2,23 +2,37 @@ import psycopg
 from psycopg import OperationalError
 from .connection import get_db_connection
 from pathlib import Path
+import gzip
 import json
 
+# File name endings of the NDJSON format (one JSON record per line), optionally gzip-compressed
+NDJSON_SUFFIXES = ('.ndjson', '.jsonl', '.ndjson.gz', '.jsonl.gz')
+
+# Table columns, and the keys of the matching applicant record fields in the same order
+COLUMN_NAMES = ("program", "comments", "date_added", "url", "status", "term",
+                "us_or_international", "gpa", "gre", "gre_v", "gre_aw", "degree")
+RECORD_KEYS = ("program", "comment", "date_added", "url", "status", "term",
+               "us_or_international", "GPA", "GRE", "GRE_V", "GRE_AW", "degree")
+
 class DataLoader:
     """
     A class to handle the process of reading applicant data from a JSON file
     and loading it into a PostgreSQL database.
     """
 
-    def __init__(self):
+    def __init__(self, json_path=None):
         """
         Initializes the class by setting up a database connection and the path to the JSON file.
+
+        Arguments:
+            json_path (str): Path to a JSON or NDJSON (.ndjson / .jsonl, optionally .gz) file.
+                             Defaults to applicant_data.json next to this module.
         """
 
         # Create a connection to the PostgreSQL database
         self.connection = get_db_connection()
         # Full path to the JSON data file
-        self.json_path = Path(__file__).parent / 'applicant_data.json'
+        self.json_path = Path(json_path) if json_path else Path(__file__).parent / 'applicant_data.json'
     
     def load_data(self):
         """Load parsed data from a JSON file.
@@ -33,6 +47,31 @@ class DataLoader:
             print(f"Error loading data: {e}")
             return None
 
+    def iter_records(self):
+        """Stream applicant records one at a time.
+
+            NDJSON files are read line by line, so only the current record is held in memory;
+            a JSON array file is loaded with load_data and then yielded record by record.
+            Errors reading an NDJSON file are raised, so a COPY consuming the records is
+            aborted instead of committing the records read before a bad line.
+
+            Yields:
+                dict: An applicant record.
+
+            Raises:
+                OSError: If the NDJSON file can't be read.
+                json.JSONDecodeError: If a line is not a valid JSON record.
+        """
+        if not self.json_path.name.endswith(NDJSON_SUFFIXES):
+            yield from self.load_data() or []
+            return
+
+        opener = gzip.open if self.json_path.suffix == '.gz' else open
+        with opener(self.json_path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
     def create_table(self):
         """Create the applicants table in the database if it does not exist."""
         # Enable autocommit to ensure changes are saved
@@ -59,6 +98,22 @@ class DataLoader:
                                 degree TEXT
                             );
                             """)
+
+                # The result URL identifies an entry, which upsert_to_table merges on.
+                # Rows loaded twice before the index existed are only reported, never deleted here.
+                cur.execute("SELECT to_regclass('applicants_url_key') IS NOT NULL;")
+                if not cur.fetchone()[0]:
+                    cur.execute("""
+                                SELECT COUNT(*) FROM applicants AS later
+                                WHERE EXISTS (SELECT 1 FROM applicants AS earlier
+                                              WHERE earlier.url = later.url AND earlier.id < later.id);
+                                """)
+                    duplicates = cur.fetchone()[0]
+                    if duplicates:
+                        print(f"{duplicates} applicants rows repeat an earlier row's URL, so upserts "
+                              "are disabled. Run the loader with dedupe=True to delete them.")
+                    else:
+                        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS applicants_url_key ON applicants (url);")
                 
                 # Commit changes
                 self.connection.commit()
@@ -69,15 +124,19 @@ class DataLoader:
     
     def insert_to_table(self, data):
         """Insert a list of applicant records into the DB table if it is currently empty.
+
+            The records are streamed to the server with a single COPY ... FROM STDIN
+            statement instead of one INSERT (and, with autocommit, one transaction) per record.
         
         Arguments:
-            data (list[dict]): A list of applicant records to insert into the DB.
+            data (iterable of dict): Applicant records to insert into the DB, e.g. a list
+                                     or the generator returned by iter_records.
         """
-        insert_query = """
-                        INSERT INTO applicants (
+        copy_query = """
+                        COPY applicants (
                         program, comments, date_added, url, status, term,
                         us_or_international, gpa, gre, gre_v, gre_aw, degree
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                        ) FROM STDIN
                         """
         
         try:
@@ -91,24 +150,10 @@ class DataLoader:
                     self.connection.close()
                     return
 
-                # Iterate over each record and insert into the table
-                for row in data:
-                    values = (
-                            row.get("program"),
-                            row.get("comment"),
-                            row.get("date_added"),
-                            row.get("url"),
-                            row.get("status"),
-                            row.get("term"),
-                            row.get("us_or_international"),
-                            row.get("GPA"),
-                            row.get("GRE"),
-                            row.get("GRE_V"),
-                            row.get("GRE_AW"),
-                            row.get("degree")
-                        )
-
-                    cur.execute(insert_query, values)
+                # Stream every record into the table, psycopg sends the rows in large chunks
+                with cur.copy(copy_query) as copy:
+                    for row in data:
+                        copy.write_row(tuple(row.get(key) for key in RECORD_KEYS))
 
             # Enable autocommit to ensure changes are saved
             self.connection.autocommit = True 
@@ -120,25 +165,125 @@ class DataLoader:
         # Close connection
         self.connection.close()
     
-def run_loader():
+    def remove_duplicate_urls(self):
+        """Delete the rows repeating an earlier row's URL, then create the unique url index.
+
+            Of the rows sharing a URL, the one with the lowest id is kept. This is the explicit
+            migration for tables loaded before the index existed, so upsert_to_table can merge.
+
+        Returns:
+            int: The number of deleted rows.
+        """
+        with self.connection.cursor() as cur:
+            cur.execute("""
+                        DELETE FROM applicants AS later USING applicants AS earlier
+                        WHERE later.url = earlier.url AND later.id > earlier.id;
+                        """)
+            deleted = cur.rowcount
+            cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS applicants_url_key ON applicants (url);")
+
+        print(f"Deleted {deleted} applicants rows with a repeated URL.")
+        return deleted
+
+    def upsert_to_table(self, data):
+        """Merge applicant records into the DB table, whether or not it already has data.
+
+            The records are copied into a temporary staging table and inserted with
+            ON CONFLICT (url) DO UPDATE: new URLs are inserted, known ones are updated only
+            if a value changed, and unchanged records are skipped. Records without a URL
+            and repeated URLs (the first record wins) are skipped as well.
+
+        Arguments:
+            data (iterable of dict): Applicant records to merge, e.g. the generator
+                                     returned by iter_records.
+
+        Returns:
+            dict: The number of records 'inserted', 'updated' and 'skipped'.
+        """
+        columns = ", ".join(COLUMN_NAMES)
+        updates = ", ".join(f"{name} = EXCLUDED.{name}" for name in COLUMN_NAMES)
+        existing_values = ", ".join(f"existing.{name}" for name in COLUMN_NAMES)
+        new_values = ", ".join(f"EXCLUDED.{name}" for name in COLUMN_NAMES)
+        counts = {"inserted": 0, "updated": 0, "skipped": 0}
+
+        try:
+            # One transaction, so the staging table is dropped on commit
+            self.connection.autocommit = False
+            with self.connection.cursor() as cur:
+                cur.execute(f"""
+                            CREATE TEMPORARY TABLE applicants_stage ON COMMIT DROP AS
+                            SELECT {columns} FROM applicants WITH NO DATA;
+                            """)
+
+                # Stage each URL once
+                urls = set()
+                staged = 0
+                with cur.copy(f"COPY applicants_stage ({columns}) FROM STDIN") as copy:
+                    for row in data:
+                        url = row.get("url")
+                        if url is None or url in urls:
+                            counts["skipped"] += 1
+                            continue
+                        urls.add(url)
+                        staged += 1
+                        copy.write_row(tuple(row.get(key) for key in RECORD_KEYS))
+
+                # Inserted rows have no deleting transaction yet (xmax = 0), updated rows do
+                cur.execute(f"""
+                            WITH merged AS (
+                                INSERT INTO applicants AS existing ({columns})
+                                SELECT {columns} FROM applicants_stage
+                                ON CONFLICT (url) DO UPDATE
+                                SET {updates}
+                                WHERE ({existing_values}) IS DISTINCT FROM ({new_values})
+                                RETURNING (existing.xmax = 0) AS inserted
+                            )
+                            SELECT COUNT(*) FILTER (WHERE inserted), COUNT(*) FILTER (WHERE NOT inserted)
+                            FROM merged;
+                            """)
+                counts["inserted"], counts["updated"] = cur.fetchone()
+            self.connection.commit()
+
+            # Staged records that neither inserted nor updated a row were unchanged
+            counts["skipped"] += staged - counts["inserted"] - counts["updated"]
+            print(f"Upserted applicants: {counts['inserted']} inserted, "
+                  f"{counts['updated']} updated, {counts['skipped']} skipped.")
+
+        except psycopg.Error as e:
+            # Print error if the merge fails
+            print(f"The error '{e}' occurred")
+            counts = {"inserted": 0, "updated": 0, "skipped": 0}
+
+        # Close connection
+        self.connection.close()
+        return counts
+    
+def run_loader(json_path=None, incremental=False, dedupe=False):
     """
     Run the full data loading process:
     - Create the applicants table (if it doesn't exist)
-    - Load data from the JSON file
-    - Insert the data into the database (if the table is empty)
+    - Delete rows repeating an earlier row's URL, if dedupe is True
+    - Load data from the JSON (or NDJSON) file
+    - Insert the data into the database (if the table is empty), or upsert it
+      on the result URL when incremental is True
     """
     
     # Instantiate the DataLoader class
-    loader = DataLoader()
+    loader = DataLoader(json_path)
 
     # Create the applicants table in the database
     loader.create_table()
+    if dedupe:
+        loader.remove_duplicate_urls()
 
-    # Load applicant data from the JSON file
-    applicants_info = loader.load_data()
+    # Stream applicant data from the JSON / NDJSON file
+    applicants_info = loader.iter_records()
 
-    # Insert the loaded data into the database table
-    loader.insert_to_table(applicants_info)
+    # Insert the loaded data into the database table, or merge it with the existing rows
+    if incremental:
+        loader.upsert_to_table(applicants_info)
+    else:
+        loader.insert_to_table(applicants_info)
 
 # Main execution block
 if __name__ == "__main__":
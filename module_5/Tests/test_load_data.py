@@ -0,0 +1,125 @@
+"""
+This module contains database tests for the DataLoader class.
+
+They load a scratch table of the configured PostgreSQL database (see db/connection.py) and
+are skipped when psycopg is not installed or the server cannot be reached.
+"""
+
+import pytest # type: ignore
+
+psycopg = pytest.importorskip("psycopg")
+
+# pylint: disable=wrong-import-position
+from psycopg import sql # type: ignore
+from db.connection import get_db_connection # type: ignore
+from db.load_data import DataLoader # type: ignore
+
+# Scratch table the tests load, so the `applicants` table is never touched
+TEST_TABLE = 'applicants_test'
+
+def record(num, status='Accepted'):
+    """Builds the cleaned applicant record of entry `num`"""
+    return {"program": "Computer Science, Johns Hopkins University", "comment": None,
+            "date_added": "2025-01-05", "url": f"https://www.thegradcafe.com/result/{num}",
+            "status": status, "term": "Fall 2025", "us_or_international": "International",
+            "GPA": 3.9, "GRE": 330.0, "GRE_V": 165.0, "GRE_AW": 5.0, "degree": "Masters",
+            "term_ordinal": 20254, "university_id": "jhu", "program_id": "computer-science"}
+
+def execute(query, params=None):
+    """Runs one statement on a fresh connection and returns its rows, if any"""
+    connection = get_db_connection()
+    with connection.cursor() as cur:
+        cur.execute(query, params)
+        rows = cur.fetchall() if cur.description else None
+    connection.commit()
+    connection.close()
+    return rows
+
+def new_loader():
+    """Creates a loader of the scratch table, with the table created"""
+    loader = DataLoader(table_name=TEST_TABLE)
+    loader.create_table()
+    return loader
+
+# --- Fixtures ---
+
+@pytest.fixture(autouse=True)
+def scratch_table():
+    """Fixture that skips without a database and drops the scratch table around each test"""
+    connection = get_db_connection()
+    if connection is None:
+        pytest.skip("PostgreSQL is not available")
+    connection.close()
+
+    drop = sql.SQL("DROP TABLE IF EXISTS {table}").format(table=sql.Identifier(TEST_TABLE))
+    execute(drop)
+    yield
+    execute(drop)
+
+
+# ----- Test: Upsert -----
+
+@pytest.mark.load
+def test_upsert_counts_inserts_updates_and_skips():
+    """A second upsert should insert new URLs, update changed rows and skip the rest"""
+    assert new_loader().upsert_to_table([record(1), record(2)]) == {"inserted": 2, "updated": 0,
+                                                                    "skipped": 0}
+
+    changes = [record(1), record(2, status='Rejected'), record(3), record(3), {"program": "no url"}]
+    assert new_loader().upsert_to_table(changes) == {"inserted": 1, "updated": 1, "skipped": 3}
+
+    rows = execute(sql.SQL("SELECT url, status FROM {table} ORDER BY url").format(
+        table=sql.Identifier(TEST_TABLE)))
+    assert [status for _, status in rows] == ['Accepted', 'Rejected', 'Accepted']
+
+
+@pytest.mark.load
+def test_duplicate_urls_are_only_deleted_explicitly():
+    """create_table should leave repeated URLs alone, remove_duplicate_urls should delete them"""
+    new_loader().close_connection()
+    execute(sql.SQL("DROP INDEX {index}").format(index=sql.Identifier(f"{TEST_TABLE}_url_key")))
+    DataLoader(table_name=TEST_TABLE).insert_to_table([record(1), record(1), record(2)])
+
+    loader = new_loader()
+    count = sql.SQL("SELECT COUNT(*) FROM {table}").format(table=sql.Identifier(TEST_TABLE))
+    assert execute(count) == [(3,)]
+
+    assert loader.remove_duplicate_urls() == 1
+    loader.close_connection()
+    assert execute(count) == [(2,)]
+    assert new_loader().upsert_to_table([record(3)])["inserted"] == 1
+
+
+# ----- Test: Reload -----
+
+@pytest.mark.load
+def test_reload_swaps_in_a_complete_table():
+    """reload_table should replace the rows and leave the indexes under the live table's names"""
+    new_loader().upsert_to_table([record(1), record(2)])
+
+    assert new_loader().reload_table([record(2, status='Rejected'), record(3), record(3)]) == 2
+
+    rows = execute(sql.SQL("SELECT url, status FROM {table} ORDER BY url").format(
+        table=sql.Identifier(TEST_TABLE)))
+    assert rows == [(record(2)["url"], 'Rejected'), (record(3)["url"], 'Accepted')]
+
+    indexes = execute("SELECT indexname FROM pg_indexes WHERE tablename = %s ORDER BY indexname",
+                      (TEST_TABLE,))
+    assert indexes == [(f"{TEST_TABLE}_pkey",), (f"{TEST_TABLE}_url_key",)]
+    assert execute("SELECT to_regclass(%s)", (f"{TEST_TABLE}_new",)) == [(None,)]
+
+    # The swapped-in table is set up for the next reload and for upserts
+    assert new_loader().reload_table([record(4)]) == 1
+    assert new_loader().upsert_to_table([record(4), record(5)])["inserted"] == 1
+
+
+@pytest.mark.load
+def test_failed_reload_keeps_the_live_table():
+    """A reload that fails while copying should leave the old rows in place"""
+    new_loader().upsert_to_table([record(1)])
+
+    assert new_loader().reload_table([record(2), dict(record(3), date_added="not a date")]) == 0
+
+    count = sql.SQL("SELECT COUNT(*) FROM {table}").format(table=sql.Identifier(TEST_TABLE))
+    assert execute(count) == [(1,)]
+    assert execute("SELECT to_regclass(%s)", (f"{TEST_TABLE}_new",)) == [(None,)]
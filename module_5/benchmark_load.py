@@ -0,0 +1,139 @@
+"""
+benchmark_load.py
+=================
+
+Benchmarks the insert methods of :class:`db.load_data.DataLoader` against each other.
+
+For every row count and method, a scratch table is dropped, recreated and loaded from scratch,
+and the rows per second are reported. The records are generated in memory (or read from a
+JSON / NDJSON data file with ``--data``), so the timings measure the database path rather than
+the scraper. Results are printed as a table and written to a JSON file.
+
+Typical usage example::
+
+    python benchmark_load.py --rows 10000 100000 1000000
+    python benchmark_load.py --rows 100000 --data ../module_2/synthetic.ndjson.gz
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import random
+import time
+from psycopg import sql
+from db.connection import get_db_connection
+from db.load_data import DataLoader, INSERT_METHODS, read_records
+
+# Scratch table the benchmark loads into, so the `applicants` table is never touched
+BENCH_TABLE = 'applicants_benchmark'
+
+def generate_records(count: int, seed: int = 0):
+    """
+    Generate applicant records with the fields and value ranges of cleaned GradCafe data.
+
+    :param count: Number of records.
+    :type count: int
+    :param seed: Seed of the random values.
+    :type seed: int
+    :returns: A generator of applicant records with unique result URLs.
+    :rtype: Iterator[dict]
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        season, year = rng.choice(['Fall', 'Spring']), rng.choice([2024, 2025, 2026])
+        yield {"program": "Computer Science, Johns Hopkins University",
+               "comment": "Synthetic benchmark record",
+               "date_added": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+               "url": f"https://www.thegradcafe.com/result/{100_000_000 + i}",
+               "status": rng.choice(['Accepted', 'Rejected', 'Wait listed', 'Interview']),
+               "term": f"{season} {year}",
+               "us_or_international": rng.choice(['American', 'International']),
+               "GPA": round(rng.uniform(2.5, 4.0), 2),
+               "GRE": float(rng.randint(290, 340)),
+               "GRE_V": float(rng.randint(140, 170)),
+               "GRE_AW": float(rng.randint(2, 6)),
+               "degree": rng.choice(['Masters', 'PhD']),
+               "term_ordinal": year * 10 + (4 if season == 'Fall' else 2),
+               "university_id": "jhu",
+               "program_id": "computer-science"}
+
+def drop_table() -> None:
+    """Drop the scratch table, if it exists."""
+    connection = get_db_connection()
+    with connection.cursor() as cur:
+        cur.execute(sql.SQL("DROP TABLE IF EXISTS {table_name}").format(
+            table_name=sql.Identifier(BENCH_TABLE)))
+    connection.commit()
+    connection.close()
+
+def time_load(records, method: str) -> dict:
+    """
+    Load records into a freshly created scratch table and time the insertion.
+
+    :param records: Applicant records to insert.
+    :type records: Iterable[dict]
+    :param method: One of `INSERT_METHODS`.
+    :type method: str
+    :returns: The method, number of inserted rows, seconds and rows per second.
+    :rtype: dict
+    """
+    drop_table()
+    loader = DataLoader(table_name=BENCH_TABLE)
+    loader.create_table()
+
+    start = time.perf_counter()
+    inserted = loader.insert_to_table(records, method)
+    seconds = time.perf_counter() - start
+
+    return {"method": method, "rows": inserted, "seconds": seconds,
+            "rows_per_sec": inserted / seconds if seconds else 0.0}
+
+def main():
+    """Parse command-line arguments, run every row count and method, and save the results."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark COPY against executemany for loading applicants.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+                        help="Row counts to load")
+    parser.add_argument('--methods', nargs='+', choices=INSERT_METHODS,
+                        default=list(INSERT_METHODS), help="Insert methods to compare")
+    parser.add_argument('--data', default=None,
+                        help="Read the records from this JSON / NDJSON file "
+                             "instead of generating them")
+    parser.add_argument('--output', default='bench_load_results.json',
+                        help="Where to write the JSON results")
+    args = parser.parse_args()
+
+    results = []
+    try:
+        for rows in args.rows:
+            for method in args.methods:
+                if args.data:
+                    records = itertools.islice(read_records(args.data), rows)
+                else:
+                    records = generate_records(rows)
+                results.append({"size": rows, **time_load(records, method)})
+    finally:
+        drop_table()
+
+    # Speedup of each method over executemany at the same row count
+    baseline = {r["size"]: r["rows_per_sec"] for r in results if r["method"] == 'executemany'}
+    header = f"{'rows':>10}  {'method':<12}{'seconds':>10}{'rows/s':>14}{'speedup':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        if baseline.get(r["size"]):
+            r["speedup"] = r["rows_per_sec"] / baseline[r["size"]]
+        speedup = f"{r['speedup']:.1f}x" if "speedup" in r else ""
+        print(f"{r['size']:>10}  {r['method']:<12}{r['seconds']:>10.2f}"
+              f"{r['rows_per_sec']:>14,.0f}{speedup:>10}")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({"timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+                   "python": platform.python_version(),
+                   "params": {"rows": args.rows, "data": args.data},
+                   "results": results}, f, indent=4)
+    print(f"Results were saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+entry_index.py
+==============
+
+This module defines the `EntryIndex` class, a persistent set of GradCafe entry IDs already
+processed by a pipeline stage. It shares its SQLite file format with the module_2 cleaner,
+with each stage ('clean', 'load', ...) kept in its own namespace.
+
+:class EntryIndex: Records processed entry IDs and answers membership tests from memory.
+:function entry_id: Extracts the numeric entry ID from an applicant record's result URL.
+"""
+from collections.abc import Iterable
+import re
+import sqlite3
+
+# Result links end with the entry ID, e.g. https://www.thegradcafe.com/result/986101
+RESULT_ID = re.compile(r'/result/(\d+)')
+
+def entry_id(record: dict) -> int | None:
+    """
+    Extract the GradCafe entry ID of an applicant record from its URL.
+
+    :param record: A dictionary representing an applicant's record.
+    :type record: dict
+    :returns: The entry ID, or None if the record has no result URL.
+    :rtype: int or None
+    """
+    match = RESULT_ID.search(record.get("url") or "")
+    return int(match.group(1)) if match else None
+
+class EntryIndex:
+    """
+    A persistent set of entry IDs processed by one pipeline stage.
+
+    The stage's IDs are read into memory when the index is opened, so membership tests are
+    set lookups rather than queries.
+
+    :ivar filename: Path of the SQLite index file.
+    :vartype filename: str
+    :ivar stage: Namespace of the IDs, e.g. 'load'.
+    :vartype stage: str
+    :ivar connection: Open connection to the index file.
+    :vartype connection: sqlite3.Connection
+    """
+
+    def __init__(self, filename: str = 'entry_index.db', stage: str = 'load'):
+        """
+        Open (or create) the index file and load the stage's IDs.
+
+        :param filename: Path of the SQLite index file.
+        :type filename: str
+        :param stage: Namespace of the IDs.
+        :type stage: str
+        """
+        self.filename = filename
+        self.stage = stage
+        self.connection = sqlite3.connect(filename)
+
+        with self.connection:
+            self.connection.execute("""
+                                    CREATE TABLE IF NOT EXISTS entries (
+                                        stage TEXT,
+                                        id INTEGER,
+                                        PRIMARY KEY (stage, id)
+                                    ) WITHOUT ROWID
+                                    """)
+
+        query = "SELECT id FROM entries WHERE stage = ?"
+        self._ids = {row[0] for row in self.connection.execute(query, (stage,))}
+
+    def __len__(self) -> int:
+        """
+        :returns: Number of entry IDs processed by this stage.
+        :rtype: int
+        """
+        return len(self._ids)
+
+    def __contains__(self, entry: int | str) -> bool:
+        """
+        Check whether an entry ID was processed by this stage.
+
+        :param entry: The entry ID, as an integer or a digit string.
+        :type entry: int or str
+        :rtype: bool
+        """
+        return int(entry) in self._ids
+
+    def add_many(self, entries: Iterable[int | str]) -> int:
+        """
+        Record entry IDs as processed and commit them.
+
+        :param entries: Entry IDs, as integers or digit strings.
+        :type entries: Iterable[int or str]
+        :returns: The number of IDs that were not in the index yet.
+        :rtype: int
+        """
+        new = {int(entry) for entry in entries} - self._ids
+
+        with self.connection:
+            self.connection.executemany("INSERT OR IGNORE INTO entries (stage, id) VALUES (?, ?)",
+                                        ((self.stage, entry) for entry in new))
+        self._ids |= new
+        return len(new)
+
+    def close(self) -> None:
+        """
+        Close the index file.
+        """
+        self.connection.close()
@@ -5,15 +5,115 @@ load_data.py
 This module defines the `DataLoader` class to manage reading applicant data from a JSON file
 and loading it into a PostgreSQL database.
 
+Besides the indented JSON array, the loader reads NDJSON files (one record per line, with the
+`.ndjson` or `.jsonl` extension, optionally gzip-compressed as `.ndjson.gz`). These are streamed
+record by record instead of being loaded into memory at once.
+
+Records are loaded with a single ``COPY ... FROM STDIN`` stream by default, which avoids the
+per-row statement round trips of ``INSERT``; the ``executemany`` path is kept for comparison
+(see ``benchmark_load.py``).
+
+Incremental loads (:meth:`DataLoader.upsert_to_table`) copy the records into a temporary
+staging table and merge it into `applicants` with ``INSERT ... ON CONFLICT (url)``, so new
+scrape results can be added to a table that already holds data. Full rebuilds
+(:meth:`DataLoader.reload_table`) load a new copy of the table next to it and swap it in
+atomically, so queries never see a partially loaded table.
+
+:function read_records: Streams the records of a data file, without a database connection.
 :class DataLoader: Handles connection, table creation, data loading, and data insertion.
 :function run_loader: Executes the full data loading process including table creation and
-                      data insertion.
+                      data insertion (or an incremental upsert, or a full reload).
 """
+from collections.abc import Iterable
+import argparse
 from pathlib import Path
+import gzip
 import json
 import psycopg
 from psycopg import sql
 from db.connection import get_db_connection
+from db.entry_index import EntryIndex, entry_id
+
+# File name endings of the NDJSON format (one JSON record per line), optionally gzip-compressed
+NDJSON_SUFFIXES = ('.ndjson', '.jsonl', '.ndjson.gz', '.jsonl.gz')
+
+# Methods of inserting records, see DataLoader.insert_to_table
+INSERT_METHODS = ('copy', 'executemany')
+
+# Table columns, with the key of the matching field in the applicant records
+COLUMNS = [
+    ('program', 'program'), ('comments', 'comment'), ('date_added', 'date_added'), ('url', 'url'),
+    ('status', 'status'), ('term', 'term'), ('us_or_international', 'us_or_international'),
+    ('gpa', 'GPA'), ('gre', 'GRE'), ('gre_v', 'GRE_V'), ('gre_aw', 'GRE_AW'), ('degree', 'degree'),
+    ('term_ordinal', 'term_ordinal'), ('university_id', 'university_id'),
+    ('program_id', 'program_id')
+]
+
+def record_values(record: dict) -> tuple:
+    """
+    Convert an applicant record into a tuple of column values, in the order of `COLUMNS`.
+
+    :param record: A dictionary representing an applicant's record.
+    :type record: dict
+    :returns: The values to insert for this record.
+    :rtype: tuple
+    """
+    return tuple(record.get(key) for _, key in COLUMNS)
+
+def load_json(json_path: Path) -> list[dict]:
+    """
+    Load the applicant records of a JSON array file.
+
+    :param json_path: Path to the JSON file.
+    :type json_path: pathlib.Path
+    :returns: A list of dictionaries representing applicant records.
+    :rtype: list[dict]
+    :raises FileNotFoundError: If the JSON file is not found.
+    :raises json.JSONDecodeError: If there is an error decoding the JSON file.
+    :raises OSError: If there is an OS-related error reading the file.
+    """
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"File not found: {json_path}") from e
+    except json.JSONDecodeError as e:
+        raise json.JSONDecodeError(
+            f"JSON decode error in file {json_path}: {e.msg}",
+            e.doc,
+            e.pos,
+        )
+    except OSError as e:
+        raise OSError(f"Error reading file {json_path}: {e.strerror}") from e
+
+def read_records(json_path):
+    """
+    Stream applicant records from a JSON or NDJSON data file, without a database connection.
+
+    NDJSON files are read one line at a time, so only the current record is held in memory.
+    A JSON array file has to be parsed as a whole and is then yielded record by record.
+
+    :param json_path: Path to the data file.
+    :type json_path: str or pathlib.Path
+    :returns: A generator of dictionaries representing applicant records.
+    :rtype: Iterator[dict]
+    :raises FileNotFoundError: If the data file is not found.
+    :raises json.JSONDecodeError: If a record cannot be decoded.
+    :raises OSError: If there is an OS-related error reading the file.
+    """
+    json_path = Path(json_path)
+    if not json_path.name.endswith(NDJSON_SUFFIXES):
+        yield from load_json(json_path)
+        return
+
+    opener = gzip.open if json_path.suffix == '.gz' else open
+    try:
+        with opener(json_path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"File not found: {json_path}") from e
 
 class DataLoader:
     """
@@ -22,23 +122,62 @@ class DataLoader:
 
     :ivar connection: Connection object to the PostgreSQL database.
     :vartype connection: psycopg.Connection
-    :ivar json_path: File path to the JSON data file.
+    :ivar json_path: File path to the JSON (or NDJSON) data file.
     :vartype json_path: pathlib.Path
+    :ivar index: Entries loaded by earlier runs, or None to only load into an empty table.
+    :vartype index: db.entry_index.EntryIndex or None
+    :ivar table_name: Name of the table the records are loaded into.
+    :vartype table_name: str
     """
 
-    def __init__(self):
+    def __init__(self, json_path=None, index_path=None, table_name='applicants'):
         """
         Initializes the class by setting up a database connection and the path to the JSON file.
+
+        :param json_path: Path to the data file; defaults to `applicant_data.json` next to
+                          this module.
+        :type json_path: str or pathlib.Path or None
+        :param index_path: Path to an entry index file (see :class:`db.entry_index.EntryIndex`).
+                           With an index, every run inserts the entries not loaded before.
+        :type index_path: str or pathlib.Path or None
+        :param table_name: Table to create and load, `applicants` unless e.g. benchmarking.
+        :type table_name: str
         """
 
         # Create a connection to the PostgreSQL database
         self.connection = get_db_connection()
         # Full path to the JSON data file
-        self.json_path = Path(__file__).parent / 'applicant_data.json'
+        self.json_path = (Path(json_path) if json_path
+                          else Path(__file__).parent / 'applicant_data.json')
+        # Persistent index of the entries already loaded, under the 'load' stage
+        self.index = EntryIndex(str(index_path), stage='load') if index_path else None
+        # Table the records are loaded into
+        self.table_name = table_name
+
+    def is_ndjson(self) -> bool:
+        """
+        Check whether the data file is in the NDJSON format, judging by its extension.
+
+        :returns: True for `.ndjson` / `.jsonl` files, optionally gzip-compressed.
+        :rtype: bool
+        """
+        return self.json_path.name.endswith(NDJSON_SUFFIXES)
+
+    def iter_records(self):
+        """
+        Stream applicant records from the data file (see :func:`read_records`).
+
+        :returns: A generator of dictionaries representing applicant records.
+        :rtype: Iterator[dict]
+        :raises FileNotFoundError: If the data file is not found.
+        :raises json.JSONDecodeError: If a record cannot be decoded.
+        :raises OSError: If there is an OS-related error reading the file.
+        """
+        yield from read_records(self.json_path)
 
     def load_data(self) -> list[dict] | None:
         """
-        Load applicant data from a JSON file.
+        Load applicant data from a JSON file (or an NDJSON file, see :meth:`iter_records`).
 
         :returns: A list of dictionaries representing applicant records, or None on failure.
         :rtype: list[dict] or None
@@ -46,24 +185,24 @@ class DataLoader:
         :raises json.JSONDecodeError: If there is an error decoding the JSON file.
         :raises OSError: If there is an OS-related error reading the file.
         """
-        try:
-            with open(self.json_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError as e:
-            raise FileNotFoundError(f"File not found: {self.json_path}") from e
-        except json.JSONDecodeError as e:
-            raise json.JSONDecodeError(
-                f"JSON decode error in file {self.json_path}: {e.msg}",
-                e.doc,
-                e.pos,
-            )
-        except OSError as e:
-            raise OSError(f"Error reading file {self.json_path}: {e.strerror}") from e
+        if self.is_ndjson():
+            return list(self.iter_records())
+        return load_json(self.json_path)
 
     def create_table(self) -> None:
         """
         Create the `applicants` table in the PostgreSQL database if it does not already exist.
 
+        Tables created before term ordinals and canonical IDs were introduced gain the
+        `term_ordinal`, `university_id` and `program_id` columns. `term_ordinal` is the term
+        as a sortable integer (year * 10 + season, e.g. 20254 for Fall 2025), so term ranges
+        are integer comparisons.
+
+        The result URL identifies an entry, and a unique index on `url` lets
+        :meth:`upsert_to_table` merge new results. The index is only created while no two
+        rows share a URL; otherwise the number of repeated rows is reported and nothing is
+        deleted, see :meth:`remove_duplicate_urls`.
+
         :raises psycopg.OperationalError: If an error occurs during table creation.
         """
         create_table_query = sql.SQL("""
@@ -80,10 +219,41 @@ class DataLoader:
                                     gre FLOAT,
                                     gre_v FLOAT,
                                     gre_aw FLOAT,
-                                    degree TEXT
+                                    degree TEXT,
+                                    term_ordinal INTEGER,
+                                    university_id TEXT,
+                                    program_id TEXT
+                                )
+                            """).format(
+                                table_name=sql.Identifier(self.table_name)
+                            )
+
+        add_columns_query = sql.SQL("""
+                                ALTER TABLE {table_name}
+                                ADD COLUMN IF NOT EXISTS {term_ordinal} INTEGER,
+                                ADD COLUMN IF NOT EXISTS {university_id} TEXT,
+                                ADD COLUMN IF NOT EXISTS {program_id} TEXT
+                            """).format(
+                                table_name=sql.Identifier(self.table_name),
+                                term_ordinal=sql.Identifier("term_ordinal"),
+                                university_id=sql.Identifier("university_id"),
+                                program_id=sql.Identifier("program_id")
+                            )
+
+        url_index_query = sql.SQL("""
+                                SELECT to_regclass({index_name}) IS NOT NULL
+                            """).format(
+                                index_name=sql.Literal(f"{self.table_name}_url_key")
+                            )
+
+        duplicates_query = sql.SQL("""
+                                SELECT COUNT(*) FROM {table_name} AS later
+                                WHERE EXISTS (
+                                    SELECT 1 FROM {table_name} AS earlier
+                                    WHERE earlier.url = later.url AND earlier.id < later.id
                                 )
                             """).format(
-                                table_name=sql.Identifier("applicants")
+                                table_name=sql.Identifier(self.table_name)
                             )
 
         try:
@@ -91,6 +261,19 @@ class DataLoader:
             with self.connection.cursor() as cur: # pylint: disable=no-member
                 # Execute table creation
                 cur.execute(create_table_query)
+                cur.execute(add_columns_query)
+
+                # Make the result URL unique, unless rows loaded before it was repeat one
+                cur.execute(url_index_query)
+                if not cur.fetchone()[0]:
+                    cur.execute(duplicates_query)
+                    duplicates = cur.fetchone()[0]
+                    if duplicates:
+                        print(f"{duplicates} rows of the {self.table_name} table repeat an "
+                              "earlier row's URL, so upserts are disabled. Run "
+                              "`python -m db.load_data --dedupe` to delete them.")
+                    else:
+                        cur.execute(self._url_index_query())
 
                 # Commit changes
                 self.connection.commit() # pylint: disable=no-member
@@ -99,75 +282,386 @@ class DataLoader:
             # Print error if something goes wrong with table creation
             print(f"The error '{e}' occurred")
 
-    def insert_to_table(self, data: list[dict]):
+    def _url_index_query(self) -> sql.Composed:
+        """
+        Build the statement creating the unique index on the table's result URLs.
+
+        :returns: The ``CREATE UNIQUE INDEX`` statement.
+        :rtype: psycopg.sql.Composed
+        """
+        return sql.SQL("""
+                    CREATE UNIQUE INDEX IF NOT EXISTS {index_name} ON {table_name} (url)
+                """).format(
+                    index_name=sql.Identifier(f"{self.table_name}_url_key"),
+                    table_name=sql.Identifier(self.table_name)
+                )
+
+    def remove_duplicate_urls(self) -> int:
+        """
+        Delete the rows repeating an earlier row's URL, then create the unique `url` index.
+
+        Of the rows sharing a URL, the one with the lowest id is kept. This is the explicit
+        migration for tables loaded before the index existed, after which
+        :meth:`upsert_to_table` can merge into them.
+
+        :returns: The number of deleted rows.
+        :rtype: int
+        :raises psycopg.OperationalError: If an error occurs during the deletion.
+        """
+        dedupe_query = sql.SQL("""
+                            DELETE FROM {table_name} AS later
+                            USING {table_name} AS earlier
+                            WHERE later.url = earlier.url AND later.id > earlier.id
+                        """).format(
+                            table_name=sql.Identifier(self.table_name)
+                        )
+
+        with self.connection.cursor() as cur: # pylint: disable=no-member
+            cur.execute(dedupe_query)
+            deleted = cur.rowcount
+            cur.execute(self._url_index_query())
+        self.connection.commit() # pylint: disable=no-member
+
+        print(f"Deleted {deleted} rows with a repeated URL from the {self.table_name} table.")
+        return deleted
+
+    def copy_rows(self, cur: psycopg.Cursor, rows: Iterable[tuple],
+                  table_name: str | None = None) -> None:
+        """
+        Stream rows into the table with ``COPY ... FROM STDIN``.
+
+        The rows are sent in text format, so the server parses each value with the column's
+        type exactly as it does for an ``INSERT`` (e.g. dates given as strings). psycopg
+        buffers the rows and sends them in large chunks, and the whole stream is a single
+        statement, however many rows it holds.
+
+        :param cur: Cursor of the transaction to copy in.
+        :type cur: psycopg.Cursor
+        :param rows: Column values in the order of `COLUMNS`, see :func:`record_values`.
+        :type rows: Iterable[tuple]
+        :param table_name: Table to copy into, the loader's table by default.
+        :type table_name: str or None
+        """
+        copy_query = sql.SQL("""
+                            COPY {table_name} ({fields}) FROM STDIN
+                        """).format(
+                            table_name = sql.Identifier(table_name or self.table_name),
+                            fields = sql.SQL(", ").join(
+                                sql.Identifier(column) for column, _ in COLUMNS)
+                        )
+
+        with cur.copy(copy_query) as copy:
+            for row in rows:
+                copy.write_row(row)
+
+    def insert_to_table(self, data: Iterable[dict], method: str = 'copy') -> int:
         """
         Insert applicant records into the database table if it is currently empty.
 
-        :param data: A list of dictionaries, each representing an applicant's record.
-        :type data: list[dict]
+        With an entry index, the table may already hold data: records whose entry was loaded
+        by an earlier run are skipped, and the new entries are added to the index once they
+        are committed.
+
+        :param data: Applicant records to insert, e.g. a list or the generator returned by
+                     :meth:`iter_records`. Records are converted to rows as they are consumed.
+        :type data: Iterable[dict]
+        :param method: 'copy' streams the rows with :meth:`copy_rows`, 'executemany' sends a
+                       parameterized ``INSERT`` per row.
+        :type method: str
+        :returns: The number of records inserted (0 if the table already had data or the
+                  insertion failed).
+        :rtype: int
+        :raises ValueError: If the method is not one of `INSERT_METHODS`.
         :raises psycopg.OperationalError: If an error occurs during insertion.
         """
+        if method not in INSERT_METHODS:
+            raise ValueError(f"Unknown insert method '{method}', expected one of {INSERT_METHODS}")
+
         count_query = sql.SQL("""
                             SELECT COUNT(*) FROM {table_name} LIMIT {limit}
                         """).format(
-                            table_name = sql.Identifier('applicants'),
+                            table_name = sql.Identifier(self.table_name),
                             limit = sql.Literal(1)
                         )
 
-        columns = [
-            'program', 'comments', 'date_added', 'url', 'status', 'term',
-            'us_or_international', 'gpa', 'gre', 'gre_v', 'gre_aw', 'degree'
-        ]
+        columns = [column for column, _ in COLUMNS]
 
         insert_query = sql.SQL("""
                             INSERT INTO {table_name} ({fields}) VALUES ({placeholders})
                         """).format(
-                            table_name = sql.Identifier("applicants"),
+                            table_name = sql.Identifier(self.table_name),
                             fields = sql.SQL(", ").join(map(sql.Identifier, columns)),
                             placeholders = sql.SQL(", ").join(sql.Placeholder() for _ in columns)
                         )
 
+        inserted = 0
+
         try:
             with self.connection.cursor() as cur: # pylint: disable=no-member
                 # Check if table already has rows
                 cur.execute(count_query)
                 count_rows = cur.fetchone()[0]
 
-                if count_rows > 0:
+                if count_rows > 0 and self.index is None:
                     # Table already includes data - close connection
                     self.connection.close()
-                    return
-
-                # Prepare values
-                values_list = []
-                for row in data:
-                    values_list.append(tuple(
-                            row.get("program"),
-                            row.get("comments"),
-                            row.get("date_added"),
-                            row.get("url"),
-                            row.get("status"),
-                            row.get("term"),
-                            row.get("us_or_international"),
-                            row.get("GPA"),
-                            row.get("GRE"),
-                            row.get("GRE_V"),
-                            row.get("GRE_AW"),
-                            row.get("degree")
-                        ))
-
-                # Batch insert for performance
-                cur.executemany(insert_query, values_list)
+                    return 0
+
+                # Prepare values lazily, counting the records as they are consumed
+                loaded = set()
+                def values():
+                    nonlocal inserted
+                    for row in data:
+                        entry = entry_id(row)
+                        if self.index is not None and entry is not None:
+                            # Skip entries loaded by an earlier run, or earlier in this file
+                            if entry in self.index or entry in loaded:
+                                continue
+                            loaded.add(entry)
+                        inserted += 1
+                        yield record_values(row)
+
+                # Bulk load for performance
+                if method == 'copy':
+                    self.copy_rows(cur, values())
+                else:
+                    cur.executemany(insert_query, values())
                 self.connection.commit()
-                print(f"Inserted {len(values_list)} records into the applicants table.")
+
+                # Only committed entries count as loaded
+                if self.index is not None:
+                    self.index.add_many(loaded)
+                print(f"Inserted {inserted} records into the {self.table_name} table.")
 
         except psycopg.Error as e:
             print(f"Database insertion error: {e}")
+            inserted = 0
 
         finally:
             # Close connection
             self.connection.close()
 
+        return inserted
+
+    def upsert_to_table(self, data: Iterable[dict]) -> dict:
+        """
+        Merge applicant records into the table, whether or not it already holds data.
+
+        The records are copied into a temporary staging table, then inserted with
+        ``ON CONFLICT (url) DO UPDATE``: a record whose URL is new is inserted, a record of a
+        known URL updates its row only if one of its values changed, and an identical record
+        is skipped without writing anything. The work is proportional to the number of
+        records given, so a daily delta file loads in a fraction of a full reload.
+
+        Records without a URL cannot be matched and are skipped, as are repeated URLs (the
+        first record wins) and, with an entry index, entries loaded by earlier runs.
+
+        :param data: Applicant records to merge, e.g. the generator returned by
+                     :meth:`iter_records`.
+        :type data: Iterable[dict]
+        :returns: The number of records 'inserted', 'updated' and 'skipped', all 0 if the
+                  load failed.
+        :rtype: dict
+        :raises psycopg.OperationalError: If an error occurs during the merge.
+        """
+        stage_name = f"{self.table_name}_stage"
+        columns = [column for column, _ in COLUMNS]
+        fields = sql.SQL(", ").join(map(sql.Identifier, columns))
+
+        stage_query = sql.SQL("""
+                            CREATE TEMPORARY TABLE {stage_name} ON COMMIT DROP AS
+                            SELECT {fields} FROM {table_name} WITH NO DATA
+                        """).format(
+                            stage_name = sql.Identifier(stage_name),
+                            fields = fields,
+                            table_name = sql.Identifier(self.table_name)
+                        )
+
+        # Inserted rows have no deleting transaction yet (xmax = 0), updated rows do
+        upsert_query = sql.SQL("""
+                            WITH merged AS (
+                                INSERT INTO {table_name} AS existing ({fields})
+                                SELECT {fields} FROM {stage_name}
+                                ON CONFLICT (url) DO UPDATE
+                                SET {updates}
+                                WHERE ({existing_fields}) IS DISTINCT FROM ({excluded_fields})
+                                RETURNING (existing.xmax = 0) AS inserted
+                            )
+                            SELECT COUNT(*) FILTER (WHERE inserted),
+                                   COUNT(*) FILTER (WHERE NOT inserted)
+                            FROM merged
+                        """).format(
+                            table_name = sql.Identifier(self.table_name),
+                            fields = fields,
+                            stage_name = sql.Identifier(stage_name),
+                            updates = sql.SQL(", ").join(
+                                sql.SQL("{column} = EXCLUDED.{column}").format(
+                                    column=sql.Identifier(column))
+                                for column in columns),
+                            existing_fields = sql.SQL(", ").join(
+                                sql.SQL("existing.{column}").format(column=sql.Identifier(column))
+                                for column in columns),
+                            excluded_fields = sql.SQL(", ").join(
+                                sql.SQL("EXCLUDED.{column}").format(column=sql.Identifier(column))
+                                for column in columns)
+                        )
+
+        counts = {"inserted": 0, "updated": 0, "skipped": 0}
+        staged = 0
+
+        try:
+            with self.connection.cursor() as cur: # pylint: disable=no-member
+                cur.execute(stage_query)
+
+                # Stage each URL once, counting what is left out
+                urls = set()
+                loaded = set()
+                def values():
+                    nonlocal staged
+                    for row in data:
+                        url = row.get("url")
+                        entry = entry_id(row)
+                        # Entries loaded by an earlier run are only known by their ID
+                        known = (self.index is not None and entry is not None
+                                 and entry in self.index)
+                        if url is None or url in urls or known:
+                            counts["skipped"] += 1
+                            continue
+                        urls.add(url)
+                        if entry is not None:
+                            loaded.add(entry)
+                        staged += 1
+                        yield record_values(row)
+
+                self.copy_rows(cur, values(), stage_name)
+
+                cur.execute(upsert_query)
+                counts["inserted"], counts["updated"] = cur.fetchone()
+                self.connection.commit()
+
+                # Staged records that neither inserted nor updated a row were unchanged
+                counts["skipped"] += staged - counts["inserted"] - counts["updated"]
+
+                # Only committed entries count as loaded
+                if self.index is not None:
+                    self.index.add_many(loaded)
+                print(f"Upserted into the {self.table_name} table: {counts['inserted']} inserted, "
+                      f"{counts['updated']} updated, {counts['skipped']} skipped.")
+
+        except psycopg.Error as e:
+            print(f"Database upsert error: {e}")
+            counts = {"inserted": 0, "updated": 0, "skipped": 0}
+
+        finally:
+            # Close connection
+            self.connection.close()
+
+        return counts
+
+    def reload_table(self, data: Iterable[dict]) -> int:
+        """
+        Replace the table's contents with the given records, without downtime.
+
+        The records are copied into a staging table next to the live one, created in the
+        same transaction. Under ``wal_level = minimal`` PostgreSQL then skips the write-ahead
+        log for the whole load and syncs the table at commit; with replication enabled the
+        rows are WAL-logged as in any load. The staging table's primary key and unique `url`
+        index are built in one pass each once the rows are in place, and it is analyzed, so
+        the planner has statistics from the first query on. Last, the live table is dropped
+        and the staging table and its indexes take over its names.
+
+        Everything runs in one transaction: queries see the complete old table until the
+        commit and the complete new table after it, and a failed load leaves the live table
+        untouched. The live table is only locked for the final drop and renames.
+
+        Repeated URLs are skipped (the first record wins). With an entry index, every loaded
+        entry is recorded, but entries of earlier loads are neither skipped nor removed.
+
+        :param data: Every applicant record the table should hold, e.g. the generator
+                     returned by :meth:`iter_records`.
+        :type data: Iterable[dict]
+        :returns: The number of records loaded, 0 if the reload failed.
+        :rtype: int
+        :raises psycopg.OperationalError: If an error occurs during the reload.
+        """
+        table = self.table_name
+        stage = f"{table}_new"
+
+        def identifiers(**names):
+            """Quote each name as an SQL identifier, for `sql.SQL.format`."""
+            return {key: sql.Identifier(name) for key, name in names.items()}
+
+        stage_queries = [
+            sql.SQL("DROP TABLE IF EXISTS {stage}").format(**identifiers(stage=stage)),
+            sql.SQL("""
+                    CREATE TABLE {stage} (LIKE {table} INCLUDING DEFAULTS INCLUDING IDENTITY)
+                """).format(**identifiers(stage=stage, table=table))
+        ]
+
+        # Indexes are built once the rows are in place, rather than updated row by row
+        build_queries = [
+            sql.SQL("ALTER TABLE {stage} ADD CONSTRAINT {pkey} PRIMARY KEY (id)").format(
+                **identifiers(stage=stage, pkey=f"{stage}_pkey")),
+            sql.SQL("CREATE UNIQUE INDEX {url_key} ON {stage} (url)").format(
+                **identifiers(url_key=f"{stage}_url_key", stage=stage)),
+            sql.SQL("ANALYZE {stage}").format(**identifiers(stage=stage))
+        ]
+
+        swap_queries = [
+            sql.SQL("DROP TABLE {table}").format(**identifiers(table=table)),
+            sql.SQL("ALTER TABLE {stage} RENAME TO {table}").format(
+                **identifiers(stage=stage, table=table)),
+            sql.SQL("ALTER TABLE {table} RENAME CONSTRAINT {stage_pkey} TO {pkey}").format(
+                **identifiers(table=table, stage_pkey=f"{stage}_pkey", pkey=f"{table}_pkey")),
+            sql.SQL("ALTER INDEX {stage_url_key} RENAME TO {url_key}").format(
+                **identifiers(stage_url_key=f"{stage}_url_key", url_key=f"{table}_url_key"))
+        ]
+
+        loaded_rows = 0
+
+        try:
+            with self.connection.cursor() as cur: # pylint: disable=no-member
+                for query in stage_queries:
+                    cur.execute(query)
+
+                # Load each URL once, remembering the entries for the index
+                urls = set()
+                loaded = set()
+                def values():
+                    nonlocal loaded_rows
+                    for row in data:
+                        url = row.get("url")
+                        if url is not None:
+                            if url in urls:
+                                continue
+                            urls.add(url)
+                        entry = entry_id(row)
+                        if entry is not None:
+                            loaded.add(entry)
+                        loaded_rows += 1
+                        yield record_values(row)
+
+                self.copy_rows(cur, values(), stage)
+
+                for query in build_queries + swap_queries:
+                    cur.execute(query)
+                self.connection.commit()
+
+                # Only committed entries count as loaded
+                if self.index is not None:
+                    self.index.add_many(loaded)
+                print(f"Reloaded the {table} table with {loaded_rows} records.")
+
+        except psycopg.Error as e:
+            print(f"Database reload error: {e}")
+            loaded_rows = 0
+
+        finally:
+            # Close connection
+            self.connection.close()
+
+        return loaded_rows
+
     def close_connection(self):
         """
         Close the database connection if it is open.
@@ -177,31 +671,67 @@ class DataLoader:
         """
         if self.connection:
             self.connection.close()
+        if self.index is not None:
+            self.index.close()
 
-def run_loader():
+def run_loader(json_path=None, index_path=None, incremental=False, reload=False, dedupe=False):
     """
     Run the full data loading process:
 
     - Create the `applicants` table in the database.
-    - Load data from the local JSON file.
-    - Insert the loaded data into the database, if the table is empty.
+    - With dedupe, delete rows repeating an earlier row's URL, so upserts can merge.
+    - Load data from the local JSON (or NDJSON) file.
+    - Insert the loaded data into the database, if the table is empty, or only the
+      entries not loaded before when an entry index file is given.
+    - In incremental mode, upsert the data instead, whatever the table holds.
+    - In reload mode, replace the table's contents with the data instead.
+
+    :param json_path: Path to the JSON / NDJSON data file (optional).
+    :type json_path: str or None
+    :param index_path: Path to the entry index file (optional).
+    :type index_path: str or None
+    :param incremental: Merge the records with :meth:`DataLoader.upsert_to_table`.
+    :type incremental: bool
+    :param reload: Swap in a table of the records with :meth:`DataLoader.reload_table`.
+    :type reload: bool
+    :param dedupe: Run :meth:`DataLoader.remove_duplicate_urls` before loading.
+    :type dedupe: bool
     """
 
     # Instantiate the DataLoader class
-    loader = DataLoader()
+    loader = DataLoader(json_path, index_path)
 
     try:
         # Create the applicants table in the database
         loader.create_table()
-
-        # Load applicant data from the JSON file
-        applicants_info = loader.load_data()
-
-        # Insert the loaded data into the database table
-        loader.insert_to_table(applicants_info)
+        if dedupe:
+            loader.remove_duplicate_urls()
+
+        # Stream applicant data from the JSON / NDJSON file
+        applicants_info = loader.iter_records()
+
+        # Insert the loaded data into the database table, merge it with the existing rows,
+        # or rebuild the table from it
+        if incremental:
+            loader.upsert_to_table(applicants_info)
+        elif reload:
+            loader.reload_table(applicants_info)
+        else:
+            loader.insert_to_table(applicants_info)
     finally:
         loader.close_connection()
 
 # Main execution block
 if __name__ == "__main__":
-    run_loader()
+    arg_parser = argparse.ArgumentParser(description="Load applicant records into PostgreSQL.")
+    arg_parser.add_argument('json_path', nargs='?', default=None, help="JSON / NDJSON data file")
+    arg_parser.add_argument('--index', default=None, help="Entry index file of earlier loads")
+    modes = arg_parser.add_mutually_exclusive_group()
+    modes.add_argument('--incremental', action='store_true',
+                       help="Upsert the records on their URL instead of loading an empty table")
+    modes.add_argument('--reload', action='store_true',
+                       help="Rebuild the table from the records and swap it in atomically")
+    arg_parser.add_argument('--dedupe', action='store_true',
+                            help="Delete rows repeating an earlier row's URL before loading")
+    args = arg_parser.parse_args()
+    run_loader(args.json_path, args.index, args.incremental, args.reload, args.dedupe)
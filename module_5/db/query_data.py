@@ -257,23 +257,31 @@ class Query:
         Count the number of applicants who applied to Johns Hopkins University
         for a Master's degree in Computer Science.
 
+        Rows with canonical IDs are matched by equality on `university_id` and `program_id`.
+        Only rows loaded before the IDs were introduced fall back to substring matching.
+
         :return: The number of such applicants.
         :rtype: int
         """
         select_stmt = sql.SQL("""
                     SELECT COUNT(*) FROM {table_name}
-                    WHERE ({field_1} LIKE %s OR LOWER({field_1}) LIKE %s)
-                    AND ({field_1} LIKE %s OR LOWER({field_1}) LIKE %s)
-                    AND {field_2} = %s
+                    WHERE {field_2} = %s
+                    AND (({field_3} = %s AND {field_4} = %s)
+                         OR ({field_3} IS NULL
+                             AND ({field_1} LIKE %s OR LOWER({field_1}) LIKE %s)
+                             AND ({field_1} LIKE %s OR LOWER({field_1}) LIKE %s)))
                     LIMIT {limit}
                 """).format(
                     field_1 = sql.Identifier('program'),
                     field_2 = sql.Identifier('degree'),
+                    field_3 = sql.Identifier('university_id'),
+                    field_4 = sql.Identifier('program_id'),
                     table_name = sql.Identifier('applicants'),
                     limit = sql.Literal(1)
                 )
 
-        params = ('%JHU%', '%johns hopkins%', '%CS%', '%computer science%', 'Masters')
+        params = ('Masters', 'jhu', 'computer-science',
+                  '%JHU%', '%johns hopkins%', '%CS%', '%computer science%')
 
         try:
             with self.connection.cursor() as cur: